@@ -1,16 +1,43 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity, get_jwt
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_mail import Mail, Message
-from datetime import datetime, timedelta
+from werkzeug.middleware.proxy_fix import ProxyFix
+from datetime import datetime, timedelta, timezone
 import re
+import json
 import secrets
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from sqlalchemy.exc import IntegrityError
+
+import similarity
+import rate_limit_storage  # Registers the sqlite:// rate limit storage scheme
+import trending
+from response_cache import SWRCache, cache_key
+from serialization import install_json_provider, compile_serializer, compile_row_serializer, COMPACT_HEADER
+from compression import compress_response
+from throttle import throttle_from_url
+from audit import AuditWriter
+from geolocation import Geolocator
+from ephemeral import store_from_url, MemoryStore
+from retention import AgePolicy, KeepLastPolicy
+from archive import Archive
+from event_store import EventStore, LOGIN_FIELDS
+from revocation import RevocationSet
+from email_filter import EmailFilter
+from login_guard import LoginGuard, Backoff
+from db_config import configure_engine, pool_options
+from db_routing import RoutingSession, ReplicaRouter
+from unit_of_work import UnitOfWork
+from sql_timing import SQLTimer
+from metrics import Metrics
 
 # Load environment variables
 load_dotenv()
@@ -18,12 +45,90 @@ load_dotenv()
 # Initialize Flask app
 app = Flask(__name__)
 
+# Reverse proxies in front of the app whose X-Forwarded-For/-Proto entries are trusted
+# (0 = none: request.remote_addr is the TCP peer). Every other forwarded value is ignored.
+app.config['TRUSTED_PROXY_HOPS'] = int(os.getenv('TRUSTED_PROXY_HOPS', 0))
+if app.config['TRUSTED_PROXY_HOPS']:
+    app.wsgi_app = ProxyFix(
+        app.wsgi_app, x_for=app.config['TRUSTED_PROXY_HOPS'], x_proto=app.config['TRUSTED_PROXY_HOPS']
+    )
+
 # Configuration
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///hackifm.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# SQLite connection profile (WAL, synchronous=NORMAL, busy wait, memory caches)
+app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+app.config['SQLITE_CACHE_SIZE_KB'] = int(os.getenv('SQLITE_CACHE_SIZE_KB', 65536))
+app.config['SQLITE_MMAP_SIZE_MB'] = int(os.getenv('SQLITE_MMAP_SIZE_MB', 256))
+# Connection pool of each engine, per worker (recycle: max connection age in seconds; size and timeout ignored for SQLite)
+DB_POOL_SETTINGS = dict(
+    pool_size=int(os.getenv('DB_POOL_SIZE', 5)),
+    max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 10)),
+    pool_timeout=int(os.getenv('DB_POOL_TIMEOUT', 30)),
+    pool_recycle=int(os.getenv('DB_POOL_RECYCLE', 1800)),
+    pre_ping=os.getenv('DB_POOL_PRE_PING', 'True') == 'True'
+)
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = pool_options(app.config['SQLALCHEMY_DATABASE_URI'], **DB_POOL_SETTINGS)
+# Optional read replica for read-only GET endpoints (e.g. a copy of hackifm.db, or a Postgres standby)
+if os.getenv('DATABASE_REPLICA_URL'):
+    app.config['SQLALCHEMY_BINDS'] = {
+        'replica': {
+            'url': os.getenv('DATABASE_REPLICA_URL'),
+            **pool_options(os.getenv('DATABASE_REPLICA_URL'), **DB_POOL_SETTINGS)
+        }
+    }
+# Seconds a user's reads stay on the primary after their own write / tolerated replica lag
+app.config['REPLICA_STICKY_SECONDS'] = int(os.getenv('REPLICA_STICKY_SECONDS', 5))
+app.config['REPLICA_MAX_LAG_SECONDS'] = float(os.getenv('REPLICA_MAX_LAG_SECONDS', 2))
+app.config['REPLICA_LAG_CHECK_SECONDS'] = int(os.getenv('REPLICA_LAG_CHECK_SECONDS', 5))
+# SQL timing: rolling window of the per-route summary, and SQL time (ms) from which a request is logged
+app.config['SQL_TIMING_WINDOW_SECONDS'] = int(os.getenv('SQL_TIMING_WINDOW_SECONDS', 900))
+app.config['SQL_TIMING_LOG_MS'] = float(os.getenv('SQL_TIMING_LOG_MS', 100))
+# Bearer token required by GET /metrics (unset = open, e.g. behind a private network)
+app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN')
 app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)
+# Seconds between each worker's pulls of sessions revoked elsewhere
+app.config['REVOCATION_SYNC_SECONDS'] = float(os.getenv('REVOCATION_SYNC_SECONDS', 1))
+# Seconds a worker trusts its cached role/ban state of a user
+app.config['USER_CACHE_SECONDS'] = int(os.getenv('USER_CACHE_SECONDS', 30))
+# Registered-email Bloom filter: pull other workers' signups / rebuild from scratch
+app.config['EMAIL_FILTER_SYNC_SECONDS'] = float(os.getenv('EMAIL_FILTER_SYNC_SECONDS', 1))
+app.config['EMAIL_FILTER_REBUILD_SECONDS'] = int(os.getenv('EMAIL_FILTER_REBUILD_SECONDS', 3600))
+# Failed logins allowed per account / per subnet before exponential backoff
+app.config['LOGIN_FREE_FAILURES_ACCOUNT'] = int(os.getenv('LOGIN_FREE_FAILURES_ACCOUNT', 5))
+app.config['LOGIN_FREE_FAILURES_SUBNET'] = int(os.getenv('LOGIN_FREE_FAILURES_SUBNET', 20))
+app.config['LOGIN_BACKOFF_CAP_SECONDS'] = int(os.getenv('LOGIN_BACKOFF_CAP_SECONDS', 900))
+app.config['SIMILAR_ITEMS_K'] = int(os.getenv('SIMILAR_ITEMS_K', 10))
+# Seconds a worker waits after a catalogue write before rebuilding neighbour lists (edits in between share it)
+app.config['SIMILAR_ITEMS_REBUILD_DELAY_SECONDS'] = float(os.getenv('SIMILAR_ITEMS_REBUILD_DELAY_SECONDS', 2))
+app.config['TRENDING_SNAPSHOT_SECONDS'] = int(os.getenv('TRENDING_SNAPSHOT_SECONDS', 60))
+# Decayed trending scores, shared by every worker process
+app.config['TRENDING_DB'] = os.getenv('TRENDING_DB', os.path.join(app.instance_path, 'trending.db'))
+
+# Response caching (stale entries are served while one background refresh runs)
+app.config['CATALOGUE_CACHE_SECONDS'] = int(os.getenv('CATALOGUE_CACHE_SECONDS', 30))
+app.config['ANALYTICS_CACHE_SECONDS'] = int(os.getenv('ANALYTICS_CACHE_SECONDS', 60))
+app.config['CACHE_STALE_SECONDS'] = int(os.getenv('CACHE_STALE_SECONDS', 300))
+
+# Response compression (gzip, or brotli when installed)
+app.config['COMPRESSION_MIN_SIZE'] = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+app.config['COMPRESSION_GZIP_LEVEL'] = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+app.config['COMPRESSION_BROTLI_QUALITY'] = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 5))
+
+# Data retention (applied by purge_logs.py)
+app.config['RETENTION_OTP_LOG_DAYS'] = int(os.getenv('RETENTION_OTP_LOG_DAYS', 30))
+app.config['RETENTION_READ_NOTIFICATION_DAYS'] = int(os.getenv('RETENTION_READ_NOTIFICATION_DAYS', 30))
+app.config['RETENTION_LOGINS_PER_USER'] = int(os.getenv('RETENTION_LOGINS_PER_USER', 50))
+
+# Cold archive of old applications and activity (moved by archive_history.py)
+app.config['ARCHIVE_DIR'] = os.getenv('ARCHIVE_DIR', os.path.join(app.instance_path, 'archive'))
+app.config['ARCHIVE_AFTER_DAYS'] = int(os.getenv('ARCHIVE_AFTER_DAYS', 365))
+
+# View and login events, one SQLite file per month (old months dropped by purge_logs.py)
+app.config['EVENT_STORE_DIR'] = os.getenv('EVENT_STORE_DIR', os.path.join(app.instance_path, 'events'))
+app.config['EVENT_RETENTION_MONTHS'] = int(os.getenv('EVENT_RETENTION_MONTHS', 24))
 
 # Email Configuration
 app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
@@ -34,18 +139,56 @@ app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
 app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_USERNAME')
 
 # Initialize extensions
-db = SQLAlchemy(app)
+replica_router = ReplicaRouter(
+    sticky_seconds=app.config['REPLICA_STICKY_SECONDS'],
+    max_lag=app.config['REPLICA_MAX_LAG_SECONDS'],
+    lag_check_seconds=app.config['REPLICA_LAG_CHECK_SECONDS']
+)
+db = SQLAlchemy(app, session_options={'class_': RoutingSession, 'router': replica_router})
+configure_engine(app, db)
+sql_timer = SQLTimer(app.config['SQL_TIMING_WINDOW_SECONDS'], app.config['SQL_TIMING_LOG_MS'])
+sql_timer.init_app(app, db)
+metrics = Metrics()
+metrics.init_app(app, db)
+unit_of_work = UnitOfWork(db)
+transactional = unit_of_work.transactional
+after_commit = unit_of_work.after_commit
 bcrypt = Bcrypt(app)
 jwt = JWTManager(app)
 mail = Mail(app)
 CORS(app)
+response_cache = SWRCache(app, on_lookup=metrics.cache_lookup)
+audit_log = AuditWriter(app, db)
+event_store = EventStore(app.config['EVENT_STORE_DIR'])
+user_cache = MemoryStore()  # Per-worker role/ban state for authorization checks
 
-# Rate limiting
+# Rate limiting (counters shared by every worker process; redis:// also works)
+app.config['RATELIMIT_ENABLED'] = os.getenv('RATELIMIT_ENABLED', 'True') == 'True'
 limiter = Limiter(
     app=app,
     key_func=get_remote_address,
     default_limits=["200 per day", "50 per hour"],
-    storage_uri="memory://"
+    storage_uri=os.getenv('RATE_LIMIT_STORAGE_URL', f"sqlite:///{os.path.join(app.instance_path, 'ratelimit.db')}"),
+    strategy=os.getenv('RATE_LIMIT_STRATEGY', 'sliding-window-counter')
+)
+
+# Per-account throttles (OTP sends, password resets, signup completion)
+throttle_store = throttle_from_url(
+    os.getenv('THROTTLE_STORAGE_URL', f"sqlite:///{os.path.join(app.instance_path, 'throttle.db')}")
+)
+
+# Short-lived auth state: signup OTPs, attempt counters, password reset tokens
+ephemeral_store = store_from_url(
+    os.getenv('EPHEMERAL_STORAGE_URL', f"sqlite:///{os.path.join(app.instance_path, 'ephemeral.db')}")
+)
+replica_reads = replica_router.replica_reads
+replica_router.init_app(app, db, ephemeral_store)
+
+# Failed-login backoff, checked before bcrypt (sqlite:///... shares it between workers)
+login_guard = LoginGuard(
+    store_from_url(os.getenv('LOGIN_GUARD_STORAGE_URL', 'memory://')),
+    account=Backoff(app.config['LOGIN_FREE_FAILURES_ACCOUNT'], cap=app.config['LOGIN_BACKOFF_CAP_SECONDS']),
+    subnet=Backoff(app.config['LOGIN_FREE_FAILURES_SUBNET'], cap=app.config['LOGIN_BACKOFF_CAP_SECONDS'])
 )
 
 # ==================== MODELS ====================
@@ -67,51 +210,6 @@ class User(db.Model):
     two_factor_secret = db.Column(db.String(100), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'email': self.email,
-            'role': self.role,
-            'verified': self.verified,
-            'phone': self.phone,
-            'bio': self.bio,
-            'profile_picture': self.profile_picture,
-            'resume_path': self.resume_path,
-            'two_factor_enabled': self.two_factor_enabled,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
-
-
-class PasswordReset(db.Model):
-    __tablename__ = 'password_resets'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    email = db.Column(db.String(120), nullable=False, index=True)
-    otp = db.Column(db.String(6), nullable=False)
-    token = db.Column(db.String(100), unique=True, nullable=False)
-    expires_at = db.Column(db.DateTime, nullable=False)
-    used = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-
-class SignupOTP(db.Model):
-    __tablename__ = 'signup_otps'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    email = db.Column(db.String(120), nullable=False, index=True)
-    otp_hash = db.Column(db.String(255), nullable=False)  # Store hashed OTP
-    expires_at = db.Column(db.DateTime, nullable=False)
-    attempts = db.Column(db.Integer, default=0)  # Failed verification attempts
-    verified = db.Column(db.Boolean, default=False)
-    locked_until = db.Column(db.DateTime, nullable=True)  # Lock after 5 failed attempts
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    # Store user data temporarily until verification
-    temp_name = db.Column(db.String(100))
-    temp_password_hash = db.Column(db.String(255))
 
 
 class OTPSendLog(db.Model):
@@ -127,7 +225,7 @@ class LoginActivity(db.Model):
     __tablename__ = 'login_activities'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     device_model = db.Column(db.String(200))
     browser = db.Column(db.String(100))
     operating_system = db.Column(db.String(100))
@@ -138,21 +236,17 @@ class LoginActivity(db.Model):
     logout_time = db.Column(db.DateTime, nullable=True)
     session_token = db.Column(db.String(100), unique=True)
     is_active = db.Column(db.Boolean, default=True)
+
+
+class SessionRevocation(db.Model):
+    """Append-only log of revoked session tokens; ids are the revocation version"""
+    __tablename__ = 'session_revocations'
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'device_model': self.device_model,
-            'browser': self.browser,
-            'operating_system': self.operating_system,
-            'ip_address': self.ip_address,
-            'city': self.city,
-            'country': self.country,
-            'login_time': self.login_time.isoformat(),
-            'logout_time': self.logout_time.isoformat() if self.logout_time else None,
-            'is_active': self.is_active,
-            'session_token': self.session_token
-        }
+    id = db.Column(db.Integer, primary_key=True)
+    session_token = db.Column(db.String(100), unique=True, nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
 
 
 class Application(db.Model):
@@ -167,18 +261,6 @@ class Application(db.Model):
     status = db.Column(db.String(50), default='pending')  # 'pending', 'accepted', 'rejected', 'withdrawn'
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'opportunity_type': self.opportunity_type,
-            'opportunity_id': self.opportunity_id,
-            'opportunity_title': self.opportunity_title,
-            'opportunity_company': self.opportunity_company,
-            'status': self.status,
-            'applied_at': self.applied_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
 
 
 class SavedItem(db.Model):
@@ -191,16 +273,6 @@ class SavedItem(db.Model):
     opportunity_title = db.Column(db.String(200), nullable=False)
     opportunity_company = db.Column(db.String(200))
     saved_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'opportunity_type': self.opportunity_type,
-            'opportunity_id': self.opportunity_id,
-            'opportunity_title': self.opportunity_title,
-            'opportunity_company': self.opportunity_company,
-            'saved_at': self.saved_at.isoformat()
-        }
 
 
 class Internship(db.Model):
@@ -252,42 +324,6 @@ class Internship(db.Model):
     submitted_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'company': self.company,
-            'company_logo': self.company_logo,
-            'company_description': self.company_description,
-            'description': self.description,
-            'work_type': self.work_type,
-            'internship_type': self.internship_type,
-            'is_paid': self.is_paid,
-            'stipend_type': self.stipend_type,
-            'stipend_min': self.stipend_min,
-            'stipend_max': self.stipend_max,
-            'duration': self.duration,
-            'location': self.location,
-            'category': self.category,
-            'skills_required': self.skills_required,
-            'experience_level': self.experience_level,
-            'tools_technologies': self.tools_technologies,
-            'eligibility': self.eligibility,
-            'responsibilities': self.responsibilities,
-            'what_you_will_learn': self.what_you_will_learn,
-            'application_deadline': self.application_deadline.isoformat() if self.application_deadline else None,
-            'apply_link': self.apply_link,
-            'apply_through_platform': self.apply_through_platform,
-            'views_count': self.views_count,
-            'clicks_count': self.clicks_count,
-            'applied_count': self.applied_count,
-            'status': self.status,
-            'is_active': self.is_active,
-            'submitted_by': self.submitted_by,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
 
 
 class Course(db.Model):
@@ -317,30 +353,6 @@ class Course(db.Model):
     submitted_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'platform': self.platform,
-            'instructor': self.instructor,
-            'description': self.description,
-            'course_link': self.course_link,
-            'thumbnail': self.thumbnail,
-            'what_you_will_learn': self.what_you_will_learn,
-            'duration': self.duration,
-            'level': self.level,
-            'category': self.category,
-            'is_paid': self.is_paid,
-            'price': self.price,
-            'views_count': self.views_count,
-            'enrolled_count': self.enrolled_count,
-            'rating': self.rating,
-            'status': self.status,
-            'submitted_by': self.submitted_by,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
 
 
 class Event(db.Model):
@@ -364,69 +376,18 @@ class Event(db.Model):
     submitted_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'organizer': self.organizer,
-            'description': self.description,
-            'event_type': self.event_type,
-            'category': self.category,
-            'start_date': self.start_date.isoformat() if self.start_date else None,
-            'end_date': self.end_date.isoformat() if self.end_date else None,
-            'location': self.location,
-            'registration_deadline': self.registration_deadline.isoformat() if self.registration_deadline else None,
-            'max_participants': self.max_participants,
-            'current_participants': self.current_participants,
-            'views_count': self.views_count,
-            'prize_pool': self.prize_pool,
-            'status': self.status,
-            'submitted_by': self.submitted_by,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
 
 
 class Notification(db.Model):
     __tablename__ = 'notifications'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     title = db.Column(db.String(200), nullable=False)
     message = db.Column(db.Text, nullable=False)
     type = db.Column(db.String(50))  # 'approval', 'completion', 'reminder', 'submission', 'report', 'error'
     is_read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'title': self.title,
-            'message': self.message,
-            'type': self.type,
-            'is_read': self.is_read,
-            'created_at': self.created_at.isoformat()
-        }
-
-
-class ViewHistory(db.Model):
-    __tablename__ = 'view_history'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    opportunity_type = db.Column(db.String(50), nullable=False)
-    opportunity_id = db.Column(db.Integer, nullable=False)
-    viewed_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'opportunity_type': self.opportunity_type,
-            'opportunity_id': self.opportunity_id,
-            'viewed_at': self.viewed_at.isoformat()
-        }
 
 
 class ReportedContent(db.Model):
@@ -441,18 +402,6 @@ class ReportedContent(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     reviewed_at = db.Column(db.DateTime)
     reviewed_by = db.Column(db.Integer, db.ForeignKey('users.id'))
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'reported_by': self.reported_by,
-            'content_type': self.content_type,
-            'content_id': self.content_id,
-            'reason': self.reason,
-            'status': self.status,
-            'created_at': self.created_at.isoformat(),
-            'reviewed_at': self.reviewed_at.isoformat() if self.reviewed_at else None
-        }
 
 
 class UserPreferences(db.Model):
@@ -466,18 +415,77 @@ class UserPreferences(db.Model):
     interests = db.Column(db.Text)  # JSON string
     preferred_locations = db.Column(db.Text)  # JSON string
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SimilarItem(db.Model):
+    __tablename__ = 'similar_items'
+    __table_args__ = (
+        db.UniqueConstraint('opportunity_type', 'opportunity_id', name='uq_similar_items_opportunity'),
+    )
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'dark_mode': self.dark_mode,
-            'notification_enabled': self.notification_enabled,
-            'email_notifications': self.email_notifications,
-            'interests': self.interests,
-            'preferred_locations': self.preferred_locations,
-            'updated_at': self.updated_at.isoformat()
-        }
+    id = db.Column(db.Integer, primary_key=True)
+    opportunity_type = db.Column(db.String(50), nullable=False)  # 'internship', 'course', 'event'
+    opportunity_id = db.Column(db.Integer, nullable=False)
+    neighbours = db.Column(db.Text, nullable=False)  # JSON array of [id, score], most similar first
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def neighbour_list(self):
+        return json.loads(self.neighbours) if self.neighbours else []
+
+
+# ==================== SERIALIZERS ====================
+
+# to_dict() is generated once per model from its column metadata; listings
+# use the row serializers to skip ORM object hydration
+NATIVE_DATETIMES = install_json_provider(app)
+ROW_SERIALIZERS = {}
+
+for model, exclude in (
+    (User, ('password_hash', 'two_factor_secret')),
+    (LoginActivity, ('user_id',)),
+    (Application, ('user_id',)),
+    (SavedItem, ('user_id',)),
+    (Internship, ()),
+    (Course, ()),
+    (Event, ()),
+    (Notification, ()),
+    (ReportedContent, ('reviewed_by',)),
+    (UserPreferences, ())
+):
+    model.to_dict = compile_serializer(model, exclude=exclude, native_datetimes=NATIVE_DATETIMES)
+    ROW_SERIALIZERS[model] = compile_row_serializer(model, exclude=exclude, native_datetimes=NATIVE_DATETIMES)
+
+
+def fetch_dicts(query, model):
+    """Run a read-only query as plain row tuples mapped straight to the wire format"""
+    columns, row_to_dict = ROW_SERIALIZERS[model]
+    return [row_to_dict(row) for row in query.with_entities(*columns)]
+
+
+# ==================== RESPONSE COMPRESSION ====================
+
+def cached(key, compute, ttl, stale_ttl=0):
+    """
+    Read a value through the response cache and remember its entry
+
+    The entry holds this response's compressed bodies, so a hot listing is
+    compressed once per cached version rather than on every request.
+    """
+    entry = response_cache.get_entry(key, compute, ttl, stale_ttl)
+    g.cache_entry = entry
+    return entry.value
+
+
+@app.after_request
+def compress_responses(response):
+    """Compress responses according to Accept-Encoding"""
+    entry = g.pop('cache_entry', None)
+    if entry is None or response.status_code != 200:
+        return compress_response(response, request.accept_encodings, app.config)
+
+    # The body is fully determined by the cached value and the negotiated format
+    variant_key = (request.endpoint, response.mimetype, request.headers.get(COMPACT_HEADER, '').lower())
+    return compress_response(response, request.accept_encodings, app.config, entry.variants, variant_key)
 
 
 # ==================== HELPER FUNCTIONS ====================
@@ -514,6 +522,60 @@ def validate_password_strength(password):
     return True, "Password is strong"
 
 
+def user_access(user_id):
+    """Role and ban state of a user, cached per worker for USER_CACHE_SECONDS"""
+    key = f'user:{user_id}'
+    access = user_cache.get(key)
+    if access is None:
+        row = db.session.query(User.role, User.verified).filter(User.id == int(user_id)).first()
+        access = {'role': row.role, 'banned': not row.verified} if row else {'role': None, 'banned': True}
+        user_cache.set(key, access, app.config['USER_CACHE_SECONDS'])
+    return access
+
+
+@db.event.listens_for(User, 'after_update')
+@db.event.listens_for(User, 'after_delete')
+def invalidate_user_access(mapper, connection, target):
+    """Role and ban changes apply at once in this worker (others within USER_CACHE_SECONDS)"""
+    user_cache.delete(f'user:{target.id}')
+
+
+def _load_registered_emails():
+    max_id = db.session.query(db.func.max(User.id)).scalar() or 0
+    # Email-only select is answered from the users email index
+    return max_id, [email for (email,) in db.session.query(User.email)]
+
+
+def _load_emails_since(last_id):
+    return db.session.query(User.id, User.email).filter(User.id > last_id).all()
+
+
+registered_emails = EmailFilter(
+    _load_registered_emails,
+    _load_emails_since,
+    sync_seconds=app.config['EMAIL_FILTER_SYNC_SECONDS'],
+    rebuild_seconds=app.config['EMAIL_FILTER_REBUILD_SECONDS']
+)
+
+
+def email_registered(email):
+    """Whether a user has this email; definite misses skip the database"""
+    return registered_emails.exists(
+        email,
+        lambda email: db.session.query(User.id).filter_by(email=email).first() is not None
+    )
+
+
+@db.event.listens_for(User, 'after_insert')
+def add_registered_email(mapper, connection, target):
+    registered_emails.add(target.id, target.email)
+
+
+@db.event.listens_for(User, 'after_delete')
+def remove_registered_email(mapper, connection, target):
+    registered_emails.remove(target.email)
+
+
 def admin_required():
     """Decorator to require admin role"""
     from functools import wraps
@@ -521,10 +583,11 @@ def admin_required():
         @wraps(f)
         @jwt_required()
         def decorated_function(*args, **kwargs):
-            current_user_id = get_jwt_identity()
-            user = User.query.get(current_user_id)
+            # The role claim is signed at login; the cached lookup catches later demotions and bans
+            is_admin_claim = get_jwt().get('role') == 'admin'
+            access = user_access(get_jwt_identity()) if is_admin_claim else None
             
-            if not user or user.role != 'admin':
+            if not access or access['role'] != 'admin' or access['banned']:
                 return jsonify({
                     'success': False,
                     'message': 'Admin access required'
@@ -614,6 +677,34 @@ def get_location_from_ip(ip_address):
     return {'city': 'Unknown', 'country': 'Unknown'}
 
 
+geolocator = Geolocator(app, get_location_from_ip)
+
+
+def record_login_history(login_activity):
+    """Append a committed login to the event store (login history; login_activities tracks sessions)"""
+    event_store.record_login(
+        login_activity.user_id,
+        at=_utc_timestamp(login_activity.login_time),
+        **{field: getattr(login_activity, field) for field in LOGIN_FIELDS}
+    )
+
+
+def locate_login(login_id, location_info):
+    """Geolocator callback: fill in the location of a login already in history"""
+    login_activity = db.session.get(LoginActivity, login_id)
+    if not login_activity:
+        return
+    login_activity.city = location_info['city']
+    login_activity.country = location_info['country']
+    db.session.commit()
+    event_store.set_login_location(
+        login_activity.session_token,
+        _utc_timestamp(login_activity.login_time),
+        login_activity.city,
+        login_activity.country
+    )
+
+
 def generate_otp():
     """Generate 6-digit OTP"""
     return str(secrets.randbelow(900000) + 100000)
@@ -624,6 +715,35 @@ def generate_reset_token():
     return secrets.token_urlsafe(32)
 
 
+def record_view(user_id, opportunity_type, opportunity_id):
+    """Count a view in the event store (one upsert per user and item per month)"""
+    event_store.record_view(int(user_id), opportunity_type, opportunity_id)
+
+
+def event_time(at):
+    """Event store timestamp as a naive UTC ISO 8601 string (like the model serializers)"""
+    return datetime.fromtimestamp(at, timezone.utc).replace(tzinfo=None).isoformat()
+
+
+# (max hits, window in seconds) per email address
+THROTTLES = {
+    'signup_otp': (3, 3600),
+    'password_reset': (3, 3600),
+    'complete_signup': (5, 3600)
+}
+
+
+def throttle(action, email):
+    """Record an action for an email; returns 0, or seconds until it is allowed again"""
+    limit, window = THROTTLES[action]
+    return throttle_store.hit(f'{action}:{email}', limit, window)
+
+
+OTP_TTL = 600  # Signup OTPs and password reset OTPs are valid for 10 minutes
+OTP_MAX_ATTEMPTS = 5
+OTP_LOCK_SECONDS = 900
+
+
 def send_signup_otp_email(name, email, otp):
     """Send OTP for signup email verification"""
     try:
@@ -680,10 +800,12 @@ def send_signup_otp_email(name, email, otp):
         """
         
         mail.send(msg)
+        metrics.otp_email('signup', True)
         print(f"✅ Signup OTP email sent successfully to {email}")
         return True
         
     except Exception as e:
+        metrics.otp_email('signup', False)
         print(f"❌ Failed to send signup OTP email: {str(e)}")
         return False
 
@@ -744,14 +866,44 @@ def send_otp_email(name, email, otp):
         """
         
         mail.send(msg)
+        metrics.otp_email('password_reset', True)
         print(f"✅ OTP email sent successfully to {email}")
         return True
         
     except Exception as e:
+        metrics.otp_email('password_reset', False)
         print(f"❌ Failed to send OTP email to {email}: {str(e)}")
         raise e
 
 
+def hash_password(value):
+    """bcrypt hash of a password or OTP, as text"""
+    started = time.perf_counter()
+    hashed = bcrypt.generate_password_hash(value).decode('utf-8')
+    metrics.bcrypt_time('hash', time.perf_counter() - started)
+    return hashed
+
+
+def check_password(hashed, value):
+    """Whether value matches a bcrypt hash"""
+    started = time.perf_counter()
+    matches = bcrypt.check_password_hash(hashed, value)
+    metrics.bcrypt_time('check', time.perf_counter() - started)
+    return matches
+
+
+def notify(user_ids, title, message, type):
+    """Queue notifications; the audit writer inserts them in batches"""
+    for user_id in user_ids:
+        audit_log.add(Notification, user_id=user_id, title=title, message=message, type=type)
+
+
+def notify_admins(title, message, type):
+    """Queue a notification for every admin"""
+    admin_ids = [user_id for (user_id,) in db.session.query(User.id).filter_by(role='admin')]
+    notify(admin_ids, title, message, type)
+
+
 # ==================== AUTHENTICATION ENDPOINTS ====================
 
 # -------------------- NEW SIGNUP FLOW --------------------
@@ -786,9 +938,7 @@ def check_email():
             }), 400
         
         # Check if user exists
-        existing_user = User.query.filter_by(email=email).first()
-        
-        if existing_user:
+        if email_registered(email):
             return jsonify({
                 'success': False,
                 'email_available': False,
@@ -841,21 +991,14 @@ def send_signup_otp():
             }), 400
         
         # Check if email already registered
-        existing_user = User.query.filter_by(email=email).first()
-        if existing_user:
+        if email_registered(email):
             return jsonify({
                 'success': False,
                 'message': 'Email already registered'
             }), 409
         
-        # Rate limiting: Check OTP send logs (max 3 per hour)
-        one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-        recent_otps = OTPSendLog.query.filter(
-            OTPSendLog.email == email,
-            OTPSendLog.sent_at > one_hour_ago
-        ).count()
-        
-        if recent_otps >= 3:
+        # Rate limiting: max 3 OTPs per email per hour
+        if throttle('signup_otp', email):
             return jsonify({
                 'success': False,
                 'message': 'Too many OTP requests. Please try again after 1 hour.'
@@ -863,27 +1006,20 @@ def send_signup_otp():
         
         # Generate OTP
         otp = generate_otp()
-        otp_hash = bcrypt.generate_password_hash(otp).decode('utf-8')
-        
-        # Delete any existing OTP for this email
-        SignupOTP.query.filter_by(email=email).delete()
-        
-        # Create new OTP record
-        signup_otp = SignupOTP(
-            email=email,
-            otp_hash=otp_hash,
-            expires_at=datetime.utcnow() + timedelta(minutes=10),
-            temp_name=name
-        )
-        
-        db.session.add(signup_otp)
+        otp_hash = hash_password(otp)
         
-        # Log OTP send
-        ip_address = request.remote_addr or 'unknown'
-        log_entry = OTPSendLog(email=email, ip_address=ip_address)
-        db.session.add(log_entry)
+        # Replaces any existing OTP for this email and restarts its attempt count
+        ephemeral_store.set(f'signup_otp:{email}', {
+            'otp_hash': otp_hash,
+            'name': name,
+            'verified': False,
+            'expires_at': time.time() + OTP_TTL
+        }, OTP_TTL)
+        ephemeral_store.delete(f'signup_otp_attempts:{email}')
+        ephemeral_store.delete(f'signup_otp_lock:{email}')
         
-        db.session.commit()
+        # Log OTP send (written in the background)
+        audit_log.add(OTPSendLog, email=email, ip_address=request.remote_addr or 'unknown', sent_at=datetime.utcnow())
         
         # Send OTP email
         email_sent = send_signup_otp_email(name, email, otp)
@@ -897,11 +1033,10 @@ def send_signup_otp():
         return jsonify({
             'success': True,
             'message': 'OTP sent to your email',
-            'expires_in': 600  # 10 minutes in seconds
+            'expires_in': OTP_TTL
         }), 200
         
     except Exception as e:
-        db.session.rollback()
         print(f"❌ Error in send_signup_otp: {str(e)}")
         return jsonify({
             'success': False,
@@ -933,34 +1068,28 @@ def verify_signup_otp():
         email = data['email'].strip().lower()
         otp = data['otp'].strip()
         
-        # Find OTP record
-        otp_record = SignupOTP.query.filter_by(email=email).first()
-        
-        if not otp_record:
-            return jsonify({
-                'success': False,
-                'message': 'No OTP found. Please request a new one.'
-            }), 404
-        
         # Check if OTP is locked (5 failed attempts)
-        if otp_record.locked_until and otp_record.locked_until > datetime.utcnow():
-            remaining = int((otp_record.locked_until - datetime.utcnow()).total_seconds() / 60)
+        locked_until = ephemeral_store.get(f'signup_otp_lock:{email}')
+        if locked_until:
+            remaining = int((locked_until - time.time()) / 60)
             return jsonify({
                 'success': False,
                 'message': f'Too many failed attempts. Try again in {remaining} minutes.',
                 'locked': True
             }), 429
         
-        # Check if OTP expired
-        if otp_record.expires_at < datetime.utcnow():
+        # Find OTP record (gone once it expires)
+        otp_record = ephemeral_store.get(f'signup_otp:{email}')
+        
+        if not otp_record:
             return jsonify({
                 'success': False,
-                'message': 'OTP has expired. Please request a new one.',
+                'message': 'No OTP found or it has expired. Please request a new one.',
                 'expired': True
-            }), 400
+            }), 404
         
         # Check if already verified
-        if otp_record.verified:
+        if otp_record['verified']:
             return jsonify({
                 'success': True,
                 'message': 'Email already verified. Please set your password.',
@@ -968,14 +1097,14 @@ def verify_signup_otp():
             }), 200
         
         # Verify OTP
-        if not bcrypt.check_password_hash(otp_record.otp_hash, otp):
-            # Increment failed attempts
-            otp_record.attempts += 1
+        if not check_password(otp_record['otp_hash'], otp):
+            # Count the failed attempt atomically, so parallel guesses cannot exceed the limit
+            attempts = ephemeral_store.incr(f'signup_otp_attempts:{email}', OTP_TTL)
             
             # Lock after 5 failed attempts
-            if otp_record.attempts >= 5:
-                otp_record.locked_until = datetime.utcnow() + timedelta(minutes=15)
-                db.session.commit()
+            if attempts >= OTP_MAX_ATTEMPTS:
+                ephemeral_store.set(f'signup_otp_lock:{email}', time.time() + OTP_LOCK_SECONDS, OTP_LOCK_SECONDS)
+                ephemeral_store.delete(f'signup_otp_attempts:{email}')
                 return jsonify({
                     'success': False,
                     'message': 'Too many failed attempts. OTP locked for 15 minutes.',
@@ -983,20 +1112,19 @@ def verify_signup_otp():
                     'attempts_remaining': 0
                 }), 429
             
-            db.session.commit()
-            attempts_remaining = 5 - otp_record.attempts
+            attempts_remaining = OTP_MAX_ATTEMPTS - attempts
             return jsonify({
                 'success': False,
                 'message': f'Invalid OTP. {attempts_remaining} attempts remaining.',
                 'attempts_remaining': attempts_remaining
             }), 400
         
-        # OTP is valid - mark as verified
-        otp_record.verified = True
-        otp_record.attempts = 0
-        db.session.commit()
+        # OTP is valid - mark as verified (keeps the original expiry)
+        otp_record['verified'] = True
+        ephemeral_store.set(f'signup_otp:{email}', otp_record, max(otp_record['expires_at'] - time.time(), 1))
+        ephemeral_store.delete(f'signup_otp_attempts:{email}')
         
-        print(f"✅ OTP verified successfully for {email}. Verified status: {otp_record.verified}")
+        print(f"✅ OTP verified successfully for {email}")
         
         return jsonify({
             'success': True,
@@ -1005,7 +1133,6 @@ def verify_signup_otp():
         }), 200
         
     except Exception as e:
-        db.session.rollback()
         print(f"❌ Error in verify_signup_otp: {str(e)}")
         return jsonify({
             'success': False,
@@ -1039,40 +1166,32 @@ def complete_signup():
         
         print(f"🔍 Complete signup request for email: {email}")
         
-        # Find OTP record for this email (with fresh query)
-        db.session.expire_all()  # Clear session cache
-        otp_record = SignupOTP.query.filter_by(email=email).first()
+        if throttle('complete_signup', email):
+            return jsonify({
+                'success': False,
+                'message': 'Too many signup attempts. Please try again later.'
+            }), 429
+        
+        # Find OTP record for this email (gone once the verification expires)
+        otp_record = ephemeral_store.get(f'signup_otp:{email}')
         
         if not otp_record:
             print(f"❌ No OTP record found for {email}")
             return jsonify({
                 'success': False,
-                'message': 'No verification record found. Please start signup again.'
+                'message': 'No verification record found or it has expired. Please start signup again.'
             }), 400
         
-        print(f"✅ OTP record found. Verified: {otp_record.verified}, Expires: {otp_record.expires_at}")
-        
         # Check if verified
-        if not otp_record.verified:
+        if not otp_record['verified']:
             print(f"❌ OTP not verified for {email}")
             return jsonify({
                 'success': False,
                 'message': 'Email not verified. Please verify your email first.'
             }), 400
         
-        # Check if OTP expired
-        if otp_record.expires_at < datetime.utcnow():
-            print(f"❌ OTP expired for {email}")
-            db.session.delete(otp_record)
-            db.session.commit()
-            return jsonify({
-                'success': False,
-                'message': 'Verification expired. Please start signup again.'
-            }), 400
-        
         # Check if user already exists
-        existing_user = User.query.filter_by(email=email).first()
-        if existing_user:
+        if email_registered(email):
             return jsonify({
                 'success': False,
                 'message': 'Email already registered'
@@ -1087,11 +1206,11 @@ def complete_signup():
             }), 400
         
         # Hash password
-        password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        password_hash = hash_password(password)
         
         # Create new user
         new_user = User(
-            name=otp_record.temp_name,
+            name=otp_record['name'],
             email=email,
             password_hash=password_hash,
             role='user',
@@ -1099,11 +1218,18 @@ def complete_signup():
         )
         
         db.session.add(new_user)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Registered on another worker since its email filter last synced
+            db.session.rollback()
+            return jsonify({
+                'success': False,
+                'message': 'Email already registered'
+            }), 409
         
-        # Delete OTP record
-        db.session.delete(otp_record)
-        
-        db.session.commit()
+        # Verification is single-use
+        ephemeral_store.delete(f'signup_otp:{email}')
         
         # Generate JWT token
         token = create_access_token(identity=str(new_user.id))
@@ -1168,8 +1294,7 @@ def signup():
             }), 400
         
         # Check if user already exists
-        existing_user = User.query.filter_by(email=email).first()
-        if existing_user:
+        if email_registered(email):
             return jsonify({
                 'success': False,
                 'message': 'Email already registered'
@@ -1184,7 +1309,7 @@ def signup():
             }), 400
         
         # Hash password
-        password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        password_hash = hash_password(password)
         
         # Create new user
         new_user = User(
@@ -1195,7 +1320,15 @@ def signup():
         )
         
         db.session.add(new_user)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Registered on another worker since its email filter last synced
+            db.session.rollback()
+            return jsonify({
+                'success': False,
+                'message': 'Email already registered'
+            }), 409
         
         return jsonify({
             'success': True,
@@ -1236,22 +1369,37 @@ def login():
         email = data['email'].strip().lower()
         password = data['password']
         
-        # Find user by email
-        user = User.query.filter_by(email=email).first()
+        # Client address as seen by the trusted proxies (see TRUSTED_PROXY_HOPS): backoff is keyed on it
+        client_ip = request.remote_addr
         
-        if not user:
-            return jsonify({
+        # Raw X-Forwarded-For is client-controlled: only shown in the session list
+        ip_address = request.headers.get('X-Forwarded-For', client_ip)
+        if ip_address and ',' in ip_address:
+            ip_address = ip_address.split(',')[0].strip()
+        
+        # Backoff after repeated failures, before any lookup or hashing
+        retry_after = login_guard.check(email, client_ip)
+        if retry_after:
+            response = jsonify({
                 'success': False,
-                'message': 'Invalid email or password'
-            }), 401
+                'message': f'Too many failed login attempts. Try again in {int(retry_after) + 1} seconds.'
+            })
+            response.headers['Retry-After'] = str(int(retry_after) + 1)
+            return response, 429
+        
+        # Find user by email
+        user = User.query.filter_by(email=email).first()
         
         # Verify password
-        if not bcrypt.check_password_hash(user.password_hash, password):
+        if not user or not check_password(user.password_hash, password):
+            login_guard.failure(email, client_ip)
             return jsonify({
                 'success': False,
                 'message': 'Invalid email or password'
             }), 401
         
+        login_guard.success(email)
+        
         # Generate JWT token with session tracking
         session_token = secrets.token_urlsafe(32)
         access_token = create_access_token(
@@ -1263,29 +1411,24 @@ def login():
             }
         )
         
-        # Capture device and location information
-        user_agent_string = request.headers.get('User-Agent', '')
-        ip_address = request.headers.get('X-Forwarded-For', request.remote_addr)
-        if ip_address and ',' in ip_address:
-            ip_address = ip_address.split(',')[0].strip()
+        # Capture device information; location is looked up in the background
+        device_info = parse_user_agent(request.headers.get('User-Agent', ''))
         
-        device_info = parse_user_agent(user_agent_string)
-        location_info = get_location_from_ip(ip_address)
-        
-        # Store login activity
+        # Store login activity now: revoke-all and password changes must see every session
         login_activity = LoginActivity(
             user_id=user.id,
             device_model=device_info['device_model'],
             browser=device_info['browser'],
             operating_system=device_info['operating_system'],
             ip_address=ip_address,
-            city=location_info['city'],
-            country=location_info['country'],
             session_token=session_token,
             is_active=True
         )
         db.session.add(login_activity)
         db.session.commit()
+        record_login_history(login_activity)
+        login_id = login_activity.id
+        geolocator.locate(ip_address, lambda location_info: locate_login(login_id, location_info))
         
         return jsonify({
             'success': True,
@@ -1329,6 +1472,13 @@ def forgot_password():
         
         email = data['email'].strip().lower()
         
+        # Max 3 reset OTPs per email per hour
+        if throttle('password_reset', email):
+            return jsonify({
+                'success': False,
+                'message': 'Too many password reset requests. Please try again after 1 hour.'
+            }), 429
+        
         # Check if user exists
         user = User.query.filter_by(email=email).first()
         
@@ -1341,21 +1491,9 @@ def forgot_password():
         # Generate OTP and reset token
         otp = generate_otp()
         reset_token = generate_reset_token()
-        expires_at = datetime.utcnow() + timedelta(minutes=10)
-        
-        # Invalidate any existing reset requests for this email
-        PasswordReset.query.filter_by(email=email, used=False).update({'used': True})
         
-        # Create new password reset entry
-        password_reset = PasswordReset(
-            email=email,
-            otp=otp,
-            token=reset_token,
-            expires_at=expires_at
-        )
-        
-        db.session.add(password_reset)
-        db.session.commit()
+        # Replaces (invalidates) any existing reset request for this email
+        ephemeral_store.set(f'password_reset:{email}', {'otp': otp, 'token': reset_token}, OTP_TTL)
         
         # Send OTP via email
         try:
@@ -1413,29 +1551,19 @@ def reset_password():
         reset_token = data['reset_token']
         new_password = data['new_password']
         
-        # Find valid reset request
-        reset_request = PasswordReset.query.filter_by(
-            email=email,
-            otp=otp,
-            token=reset_token,
-            used=False
-        ).first()
+        # Find valid reset request (gone once it expires)
+        reset_request = ephemeral_store.get(f'password_reset:{email}')
         
-        if not reset_request:
+        if (
+            not reset_request
+            or not secrets.compare_digest(reset_request['otp'], str(otp))
+            or not secrets.compare_digest(reset_request['token'], str(reset_token))
+        ):
             return jsonify({
                 'success': False,
                 'message': 'Invalid or expired reset request'
             }), 400
         
-        # Check if expired
-        if datetime.utcnow() > reset_request.expires_at:
-            reset_request.used = True
-            db.session.commit()
-            return jsonify({
-                'success': False,
-                'message': 'OTP has expired'
-            }), 400
-        
         # Validate new password strength
         is_strong, message = validate_password_strength(new_password)
         if not is_strong:
@@ -1453,15 +1581,19 @@ def reset_password():
             }), 404
         
         # Hash new password
-        new_password_hash = bcrypt.generate_password_hash(new_password).decode('utf-8')
+        new_password_hash = hash_password(new_password)
+        
+        # Mark reset request as used (only one concurrent request can consume it)
+        if not ephemeral_store.delete(f'password_reset:{email}'):
+            return jsonify({
+                'success': False,
+                'message': 'Invalid or expired reset request'
+            }), 400
         
         # Update password
         user.password_hash = new_password_hash
         user.updated_at = datetime.utcnow()
         
-        # Mark reset request as used
-        reset_request.used = True
-        
         db.session.commit()
         
         return jsonify({
@@ -1540,16 +1672,36 @@ def get_login_activity():
     try:
         current_user_id = get_jwt_identity()
         
-        # Get last 10 login activities for the current user
-        activities = LoginActivity.query.filter_by(
-            user_id=current_user_id
-        ).order_by(
-            LoginActivity.login_time.desc()
-        ).limit(10).all()
+        # Get last 10 logins for the current user
+        logins = event_store.logins(int(current_user_id), limit=10)
+        
+        # Session state (active / logged out) comes from login_activities
+        tokens = [login['session_token'] for login in logins if login['session_token']]
+        sessions = {
+            session.session_token: session
+            for session in LoginActivity.query.filter(LoginActivity.session_token.in_(tokens))
+        } if tokens else {}
+        
+        activities = []
+        for login in logins:
+            session = sessions.get(login['session_token'])
+            activities.append({
+                'id': login['id'],
+                'device_model': login['device_model'],
+                'browser': login['browser'],
+                'operating_system': login['operating_system'],
+                'ip_address': login['ip_address'],
+                'city': login['city'],
+                'country': login['country'],
+                'login_time': event_time(login['at']),
+                'logout_time': session.logout_time.isoformat() if session and session.logout_time else None,
+                'session_token': login['session_token'],
+                'is_active': bool(session and session.is_active)
+            })
         
         return jsonify({
             'success': True,
-            'activities': [activity.to_dict() for activity in activities]
+            'activities': activities
         }), 200
         
     except Exception as e:
@@ -1561,6 +1713,7 @@ def get_login_activity():
 
 @app.route('/api/auth/logout-all', methods=['POST'])
 @jwt_required()
+@transactional
 def logout_all_devices():
     """
     Logout from all devices by deactivating all sessions
@@ -1573,22 +1726,15 @@ def logout_all_devices():
         current_jwt = get_jwt()
         current_session = current_jwt.get('session')
         
+        sessions = LoginActivity.query.filter_by(
+            user_id=current_user_id,
+            is_active=True
+        )
         if current_session:
             # Deactivate all sessions except current
-            LoginActivity.query.filter_by(
-                user_id=current_user_id,
-                is_active=True
-            ).filter(
-                LoginActivity.session_token != current_session
-            ).update({'is_active': False})
-        else:
-            # Deactivate all sessions
-            LoginActivity.query.filter_by(
-                user_id=current_user_id,
-                is_active=True
-            ).update({'is_active': False})
+            sessions = sessions.filter(LoginActivity.session_token != current_session)
         
-        db.session.commit()
+        revoke_sessions(sessions.all())
         
         return jsonify({
             'success': True,
@@ -1604,38 +1750,10 @@ def logout_all_devices():
 
 # ==================== ROLE-BASED ACCESS ====================
 
-def admin_required():
-    """Decorator to check if user is admin"""
-    def wrapper(fn):
-        @jwt_required()
-        def decorator(*args, **kwargs):
-            current_user_id = get_jwt_identity()
-            user = User.query.get(current_user_id)
-            
-            if not user or user.role != 'admin':
-                return jsonify({
-                    'success': False,
-                    'message': 'Admin access required'
-                }), 403
-            
-            return fn(*args, **kwargs)
-        return decorator
-    return wrapper
-
-
 @app.route('/api/admin/dashboard', methods=['GET'])
-@jwt_required()
+@admin_required()
 def admin_dashboard():
     """Admin dashboard - requires admin role"""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    
-    if not user or user.role != 'admin':
-        return jsonify({
-            'success': False,
-            'message': 'Admin access required'
-        }), 403
-    
     # Get statistics
     total_users = User.query.count()
     admin_count = User.query.filter_by(role='admin').count()
@@ -1708,6 +1826,7 @@ def update_profile():
 
 @app.route('/api/profile/change-password', methods=['POST'])
 @jwt_required()
+@transactional
 def change_password():
     """
     Change user password
@@ -1737,7 +1856,7 @@ def change_password():
             }), 400
         
         # Verify current password
-        if not bcrypt.check_password_hash(user.password_hash, data['current_password']):
+        if not check_password(user.password_hash, data['current_password']):
             return jsonify({
                 'success': False,
                 'message': 'Current password is incorrect'
@@ -1752,16 +1871,17 @@ def change_password():
             }), 400
         
         # Update password
-        user.password_hash = bcrypt.generate_password_hash(data['new_password']).decode('utf-8')
+        user.password_hash = hash_password(data['new_password'])
         user.updated_at = datetime.utcnow()
         
-        # Deactivate all other sessions for security
-        LoginActivity.query.filter_by(
+        # Deactivate all other sessions for security; the current one stays valid.
+        # The new hash and the revocations commit together in @transactional.
+        revoke_sessions(LoginActivity.query.filter_by(
             user_id=user.id,
             is_active=True
-        ).update({'is_active': False})
-        
-        db.session.commit()
+        ).filter(
+            LoginActivity.session_token != get_jwt().get('session')
+        ).all())
         
         return jsonify({
             'success': True,
@@ -1995,6 +2115,13 @@ def manage_applications():
             db.session.add(application)
             db.session.commit()
             
+            if application.opportunity_type in APPLICATION_WEIGHTS:
+                record_engagement(
+                    application.opportunity_type,
+                    application.opportunity_id,
+                    APPLICATION_WEIGHTS[application.opportunity_type]
+                )
+            
             return jsonify({
                 'success': True,
                 'message': 'Application submitted successfully',
@@ -2011,6 +2138,7 @@ def manage_applications():
 
 @app.route('/api/applications/<int:application_id>', methods=['DELETE'])
 @jwt_required()
+@transactional
 def withdraw_application(application_id):
     """Withdraw an application"""
     try:
@@ -2029,7 +2157,6 @@ def withdraw_application(application_id):
         
         application.status = 'withdrawn'
         application.updated_at = datetime.utcnow()
-        db.session.commit()
         
         return jsonify({
             'success': True,
@@ -2048,6 +2175,7 @@ def withdraw_application(application_id):
 
 @app.route('/api/saved-items', methods=['GET', 'POST'])
 @jwt_required()
+@transactional
 def manage_saved_items():
     """Get saved items or add new saved item"""
     try:
@@ -2097,7 +2225,7 @@ def manage_saved_items():
             )
             
             db.session.add(saved_item)
-            db.session.commit()
+            db.session.flush()  # Assign the id for the response
             
             return jsonify({
                 'success': True,
@@ -2115,6 +2243,7 @@ def manage_saved_items():
 
 @app.route('/api/saved-items/<int:item_id>', methods=['DELETE'])
 @jwt_required()
+@transactional
 def remove_saved_item(item_id):
     """Remove a saved item"""
     try:
@@ -2132,7 +2261,6 @@ def remove_saved_item(item_id):
             }), 404
         
         db.session.delete(saved_item)
-        db.session.commit()
         
         return jsonify({
             'success': True,
@@ -2147,18 +2275,77 @@ def remove_saved_item(item_id):
         }), 500
 
 
-# ==================== SESSION MANAGEMENT ====================
+# ==================== SESSION REVOCATION ====================
 
-@app.route('/api/sessions/active', methods=['GET'])
-@jwt_required()
-def get_active_sessions():
-    """Get all active sessions for current user"""
-    try:
-        current_user_id = get_jwt_identity()
-        
-        sessions = LoginActivity.query.filter_by(
-            user_id=current_user_id,
-            is_active=True
+def fetch_revocations(since):
+    """Unexpired revocation log entries newer than version `since`"""
+    now = datetime.utcnow()
+    rows = db.session.query(
+        SessionRevocation.id, SessionRevocation.session_token, SessionRevocation.expires_at
+    ).filter(
+        SessionRevocation.id > since,
+        SessionRevocation.expires_at > now
+    ).order_by(SessionRevocation.id).all()
+    entries = [(row.id, row.session_token, _utc_timestamp(row.expires_at)) for row in rows]
+    
+    if since == 0:
+        # Sessions deactivated before the log existed, while their tokens are still valid
+        lifetime = app.config['JWT_ACCESS_TOKEN_EXPIRES']
+        legacy = db.session.query(LoginActivity.session_token, LoginActivity.login_time).filter(
+            LoginActivity.is_active.is_(False),
+            LoginActivity.session_token.isnot(None),
+            LoginActivity.login_time > now - lifetime
+        ).all()
+        entries += [(0, row.session_token, _utc_timestamp(row.login_time + lifetime)) for row in legacy]
+    return entries
+
+
+revoked_sessions = RevocationSet(fetch_revocations, sync_seconds=app.config['REVOCATION_SYNC_SECONDS'])
+
+
+@jwt.token_in_blocklist_loader
+def is_session_revoked(jwt_header, jwt_payload):
+    """Reject tokens whose login session has been revoked"""
+    session_token = jwt_payload.get('session')
+    return bool(session_token) and revoked_sessions.is_revoked(session_token)
+
+
+def revoke_sessions(sessions):
+    """
+    Deactivate login sessions and revoke their tokens on every worker
+    
+    Changes are staged for the caller's @transactional commit; this worker's
+    revocation set is updated once that commit succeeds.
+    """
+    now = datetime.utcnow()
+    lifetime = app.config['JWT_ACCESS_TOKEN_EXPIRES']
+    for session in sessions:
+        was_active = session.is_active
+        session.is_active = False
+        session.logout_time = now
+        if was_active and session.session_token:
+            expires_at = (session.login_time or now) + lifetime
+            db.session.add(SessionRevocation(
+                session_token=session.session_token,
+                user_id=session.user_id,
+                expires_at=expires_at
+            ))
+            after_commit(revoked_sessions.add, session.session_token, _utc_timestamp(expires_at))
+    return len(sessions)
+
+
+# ==================== SESSION MANAGEMENT ====================
+
+@app.route('/api/sessions/active', methods=['GET'])
+@jwt_required()
+def get_active_sessions():
+    """Get all active sessions for current user"""
+    try:
+        current_user_id = get_jwt_identity()
+        
+        sessions = LoginActivity.query.filter_by(
+            user_id=current_user_id,
+            is_active=True
         ).order_by(LoginActivity.login_time.desc()).all()
         
         # Mark current session
@@ -2186,6 +2373,7 @@ def get_active_sessions():
 
 @app.route('/api/sessions/<int:session_id>/revoke', methods=['POST'])
 @jwt_required()
+@transactional
 def revoke_session(session_id):
     """Revoke a specific session"""
     try:
@@ -2202,9 +2390,7 @@ def revoke_session(session_id):
                 'message': 'Session not found'
             }), 404
         
-        session.is_active = False
-        session.logout_time = datetime.utcnow()
-        db.session.commit()
+        revoke_sessions([session])
         
         return jsonify({
             'success': True,
@@ -2221,6 +2407,7 @@ def revoke_session(session_id):
 
 @app.route('/api/sessions/revoke-all', methods=['POST'])
 @jwt_required()
+@transactional
 def revoke_all_sessions():
     """Revoke all sessions except current one"""
     try:
@@ -2238,11 +2425,7 @@ def revoke_all_sessions():
             LoginActivity.session_token != current_session_token
         ).all()
         
-        for session in sessions:
-            session.is_active = False
-            session.logout_time = datetime.utcnow()
-        
-        db.session.commit()
+        revoke_sessions(sessions)
         
         return jsonify({
             'success': True,
@@ -2269,64 +2452,92 @@ def health_check():
     }), 200
 
 
+@app.route('/metrics', methods=['GET'])
+@limiter.exempt
+def prometheus_metrics():
+    """Prometheus scrape endpoint (all workers; Bearer METRICS_TOKEN when set)"""
+    if not metrics.enabled:
+        return jsonify({'success': False, 'message': 'Metrics require prometheus_client'}), 404
+    
+    token = app.config['METRICS_TOKEN']
+    if token and not secrets.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+    
+    body, content_type = metrics.export()
+    return body, 200, {'Content-Type': content_type}
+
+
 # ==================== ERROR HANDLERS ====================
 
 # ==================== INTERNSHIP APIs ====================
 
+def list_internships(args):
+    """Filtered internship listing (serialized)"""
+    # Get filters from query params
+    work_type = args.get('work_type')
+    is_paid = args.get('is_paid')
+    duration = args.get('duration')
+    stipend_min = args.get('stipend_min', type=int)
+    stipend_max = args.get('stipend_max', type=int)
+    skills = args.get('skills')
+    company = args.get('company')
+    date_posted = args.get('date_posted')  # '24h', '7d', '30d'
+    status = args.get('status', 'approved')
+    
+    query = Internship.query
+    
+    # Apply filters
+    if status:
+        query = query.filter_by(status=status)
+    if work_type:
+        query = query.filter_by(work_type=work_type)
+    if is_paid is not None:
+        query = query.filter_by(is_paid=is_paid.lower() == 'true')
+    if duration:
+        query = query.filter_by(duration=duration)
+    if stipend_min is not None:
+        query = query.filter(Internship.stipend_min >= stipend_min)
+    if stipend_max is not None:
+        query = query.filter(Internship.stipend_max <= stipend_max)
+    if company:
+        query = query.filter(Internship.company.ilike(f'%{company}%'))
+    if skills:
+        query = query.filter(Internship.skills_required.ilike(f'%{skills}%'))
+    
+    # Date filter
+    if date_posted:
+        now = datetime.utcnow()
+        if date_posted == '24h':
+            cutoff = now - timedelta(hours=24)
+        elif date_posted == '7d':
+            cutoff = now - timedelta(days=7)
+        elif date_posted == '30d':
+            cutoff = now - timedelta(days=30)
+        else:
+            cutoff = now - timedelta(days=30)
+        query = query.filter(Internship.created_at >= cutoff)
+    
+    return fetch_dicts(query.order_by(Internship.created_at.desc()), Internship)
+
+
 @app.route('/api/internships', methods=['GET', 'POST'])
+@replica_reads
+@transactional
 def manage_internships():
     """Get all internships or create new (user submission)"""
     try:
         if request.method == 'GET':
-            # Get filters from query params
-            work_type = request.args.get('work_type')
-            is_paid = request.args.get('is_paid')
-            duration = request.args.get('duration')
-            stipend_min = request.args.get('stipend_min', type=int)
-            stipend_max = request.args.get('stipend_max', type=int)
-            skills = request.args.get('skills')
-            company = request.args.get('company')
-            date_posted = request.args.get('date_posted')  # '24h', '7d', '30d'
-            status = request.args.get('status', 'approved')
-            
-            query = Internship.query
-            
-            # Apply filters
-            if status:
-                query = query.filter_by(status=status)
-            if work_type:
-                query = query.filter_by(work_type=work_type)
-            if is_paid is not None:
-                query = query.filter_by(is_paid=is_paid.lower() == 'true')
-            if duration:
-                query = query.filter_by(duration=duration)
-            if stipend_min is not None:
-                query = query.filter(Internship.stipend_min >= stipend_min)
-            if stipend_max is not None:
-                query = query.filter(Internship.stipend_max <= stipend_max)
-            if company:
-                query = query.filter(Internship.company.ilike(f'%{company}%'))
-            if skills:
-                query = query.filter(Internship.skills_required.ilike(f'%{skills}%'))
-            
-            # Date filter
-            if date_posted:
-                now = datetime.utcnow()
-                if date_posted == '24h':
-                    cutoff = now - timedelta(hours=24)
-                elif date_posted == '7d':
-                    cutoff = now - timedelta(days=7)
-                elif date_posted == '30d':
-                    cutoff = now - timedelta(days=30)
-                else:
-                    cutoff = now - timedelta(days=30)
-                query = query.filter(Internship.created_at >= cutoff)
-            
-            internships = query.order_by(Internship.created_at.desc()).all()
+            args = request.args.copy()
+            internships = cached(
+                cache_key('internships', args),
+                lambda: list_internships(args),
+                app.config['CATALOGUE_CACHE_SECONDS'],
+                app.config['CACHE_STALE_SECONDS']
+            )
             
             return jsonify({
                 'success': True,
-                'internships': [i.to_dict() for i in internships]
+                'internships': internships
             }), 200
         
         elif request.method == 'POST':
@@ -2350,19 +2561,16 @@ def manage_internships():
             )
             
             db.session.add(new_internship)
-            db.session.commit()
+            db.session.flush()
             
-            # Notify admins
-            admins = User.query.filter_by(role='admin').all()
-            for admin in admins:
-                notification = Notification(
-                    user_id=admin.id,
-                    title='New Internship Submission',
-                    message=f'New internship "{new_internship.title}" submitted for review',
-                    type='submission'
-                )
-                db.session.add(notification)
-            db.session.commit()
+            # Committed by @transactional; admins hear about it only once it is
+            after_commit(
+                notify_admins,
+                'New Internship Submission',
+                f'New internship "{new_internship.title}" submitted for review',
+                'submission'
+            )
+            after_commit(invalidate_catalogue, 'internship')
             
             return jsonify({
                 'success': True,
@@ -2376,6 +2584,7 @@ def manage_internships():
 
 
 @app.route('/api/internships/<int:id>', methods=['GET', 'PUT', 'DELETE'])
+@transactional
 def internship_detail(id):
     """Get, update, or delete specific internship"""
     try:
@@ -2384,7 +2593,7 @@ def internship_detail(id):
         if request.method == 'GET':
             # Increment view count
             internship.views_count += 1
-            db.session.commit()
+            after_commit(record_engagement, 'internship', id)
             
             # Track view history if user is logged in
             auth_header = request.headers.get('Authorization')
@@ -2395,13 +2604,7 @@ def internship_detail(id):
                     decoded = decode_token(token)
                     user_id = decoded['sub']
                     
-                    view_history = ViewHistory(
-                        user_id=user_id,
-                        opportunity_type='internship',
-                        opportunity_id=id
-                    )
-                    db.session.add(view_history)
-                    db.session.commit()
+                    record_view(user_id, 'internship', id)
                 except:
                     pass
             
@@ -2419,7 +2622,7 @@ def internship_detail(id):
                     setattr(internship, key, value)
             
             internship.updated_at = datetime.utcnow()
-            db.session.commit()
+            after_commit(content_changed, 'internship', id)
             
             return jsonify({
                 'success': True,
@@ -2430,7 +2633,7 @@ def internship_detail(id):
         elif request.method == 'DELETE':
             # Delete internship (admin only)
             db.session.delete(internship)
-            db.session.commit()
+            after_commit(content_changed, 'internship', id)
             
             return jsonify({
                 'success': True,
@@ -2444,6 +2647,7 @@ def internship_detail(id):
 
 @app.route('/api/internships/<int:id>/apply', methods=['POST'])
 @jwt_required()
+@transactional
 def apply_internship(id):
     """Apply to internship"""
     try:
@@ -2477,7 +2681,8 @@ def apply_internship(id):
         internship.applied_count += 1
         
         db.session.add(application)
-        db.session.commit()
+        db.session.flush()
+        after_commit(record_engagement, 'internship', id, APPLICATION_WEIGHTS['internship'])
         
         return jsonify({
             'success': True,
@@ -2492,6 +2697,7 @@ def apply_internship(id):
 
 @app.route('/api/internships/<int:id>/report', methods=['POST'])
 @jwt_required()
+@transactional
 def report_internship(id):
     """Report an internship"""
     try:
@@ -2506,19 +2712,7 @@ def report_internship(id):
         )
         
         db.session.add(report)
-        db.session.commit()
-        
-        # Notify admins
-        admins = User.query.filter_by(role='admin').all()
-        for admin in admins:
-            notification = Notification(
-                user_id=admin.id,
-                title='Content Reported',
-                message=f'Internship ID {id} has been reported',
-                type='report'
-            )
-            db.session.add(notification)
-        db.session.commit()
+        after_commit(notify_admins, 'Content Reported', f'Internship ID {id} has been reported', 'report')
         
         return jsonify({
             'success': True,
@@ -2532,32 +2726,45 @@ def report_internship(id):
 
 # ==================== COURSE APIs ====================
 
+def list_courses(args):
+    """Filtered course listing (serialized)"""
+    level = args.get('level')
+    is_paid = args.get('is_paid')
+    category = args.get('category')
+    status = args.get('status', 'approved')
+    
+    query = Course.query
+    
+    if status:
+        query = query.filter_by(status=status)
+    if level:
+        query = query.filter_by(level=level)
+    if is_paid is not None:
+        query = query.filter_by(is_paid=is_paid.lower() == 'true')
+    if category:
+        query = query.filter_by(category=category)
+    
+    return fetch_dicts(query.order_by(Course.rating.desc()), Course)
+
+
 @app.route('/api/courses', methods=['GET', 'POST'])
+@replica_reads
+@transactional
 def manage_courses():
     """Get all courses or create new"""
     try:
         if request.method == 'GET':
-            level = request.args.get('level')
-            is_paid = request.args.get('is_paid')
-            category = request.args.get('category')
-            status = request.args.get('status', 'approved')
-            
-            query = Course.query
-            
-            if status:
-                query = query.filter_by(status=status)
-            if level:
-                query = query.filter_by(level=level)
-            if is_paid is not None:
-                query = query.filter_by(is_paid=is_paid.lower() == 'true')
-            if category:
-                query = query.filter_by(category=category)
-            
-            courses = query.order_by(Course.rating.desc()).all()
+            args = request.args.copy()
+            courses = cached(
+                cache_key('courses', args),
+                lambda: list_courses(args),
+                app.config['CATALOGUE_CACHE_SECONDS'],
+                app.config['CACHE_STALE_SECONDS']
+            )
             
             return jsonify({
                 'success': True,
-                'courses': [c.to_dict() for c in courses]
+                'courses': courses
             }), 200
         
         elif request.method == 'POST':
@@ -2577,19 +2784,16 @@ def manage_courses():
             )
             
             db.session.add(new_course)
-            db.session.commit()
+            db.session.flush()
             
-            # Notify admins
-            admins = User.query.filter_by(role='admin').all()
-            for admin in admins:
-                notification = Notification(
-                    user_id=admin.id,
-                    title='New Course Submission',
-                    message=f'New course "{new_course.title}" submitted for review',
-                    type='submission'
-                )
-                db.session.add(notification)
-            db.session.commit()
+            # Committed by @transactional; admins hear about it only once it is
+            after_commit(
+                notify_admins,
+                'New Course Submission',
+                f'New course "{new_course.title}" submitted for review',
+                'submission'
+            )
+            after_commit(invalidate_catalogue, 'course')
             
             return jsonify({
                 'success': True,
@@ -2603,6 +2807,7 @@ def manage_courses():
 
 
 @app.route('/api/courses/<int:id>', methods=['GET', 'PUT', 'DELETE'])
+@transactional
 def course_detail(id):
     """Get, update, or delete specific course"""
     try:
@@ -2610,7 +2815,7 @@ def course_detail(id):
         
         if request.method == 'GET':
             course.views_count += 1
-            db.session.commit()
+            after_commit(record_engagement, 'course', id)
             
             # Track view history
             auth_header = request.headers.get('Authorization')
@@ -2621,13 +2826,7 @@ def course_detail(id):
                     decoded = decode_token(token)
                     user_id = decoded['sub']
                     
-                    view_history = ViewHistory(
-                        user_id=user_id,
-                        opportunity_type='course',
-                        opportunity_id=id
-                    )
-                    db.session.add(view_history)
-                    db.session.commit()
+                    record_view(user_id, 'course', id)
                 except:
                     pass
             
@@ -2644,7 +2843,7 @@ def course_detail(id):
                     setattr(course, key, value)
             
             course.updated_at = datetime.utcnow()
-            db.session.commit()
+            after_commit(content_changed, 'course', id)
             
             return jsonify({
                 'success': True,
@@ -2654,7 +2853,7 @@ def course_detail(id):
         
         elif request.method == 'DELETE':
             db.session.delete(course)
-            db.session.commit()
+            after_commit(content_changed, 'course', id)
             
             return jsonify({
                 'success': True,
@@ -2668,29 +2867,42 @@ def course_detail(id):
 
 # ==================== EVENT APIs ====================
 
+def list_events(args):
+    """Filtered event listing (serialized)"""
+    event_type = args.get('event_type')
+    category = args.get('category')
+    status = args.get('status', 'approved')
+    
+    query = Event.query
+    
+    if status:
+        query = query.filter_by(status=status)
+    if event_type:
+        query = query.filter_by(event_type=event_type)
+    if category:
+        query = query.filter_by(category=category)
+    
+    return fetch_dicts(query.order_by(Event.start_date.desc()), Event)
+
+
 @app.route('/api/events', methods=['GET', 'POST'])
+@replica_reads
+@transactional
 def manage_events():
     """Get all events or create new"""
     try:
         if request.method == 'GET':
-            event_type = request.args.get('event_type')
-            category = request.args.get('category')
-            status = request.args.get('status', 'approved')
-            
-            query = Event.query
-            
-            if status:
-                query = query.filter_by(status=status)
-            if event_type:
-                query = query.filter_by(event_type=event_type)
-            if category:
-                query = query.filter_by(category=category)
-            
-            events = query.order_by(Event.start_date.desc()).all()
+            args = request.args.copy()
+            events = cached(
+                cache_key('events', args),
+                lambda: list_events(args),
+                app.config['CATALOGUE_CACHE_SECONDS'],
+                app.config['CACHE_STALE_SECONDS']
+            )
             
             return jsonify({
                 'success': True,
-                'events': [e.to_dict() for e in events]
+                'events': events
             }), 200
         
         elif request.method == 'POST':
@@ -2713,19 +2925,16 @@ def manage_events():
             )
             
             db.session.add(new_event)
-            db.session.commit()
+            db.session.flush()
             
-            # Notify admins
-            admins = User.query.filter_by(role='admin').all()
-            for admin in admins:
-                notification = Notification(
-                    user_id=admin.id,
-                    title='New Event Submission',
-                    message=f'New event "{new_event.title}" submitted for review',
-                    type='submission'
-                )
-                db.session.add(notification)
-            db.session.commit()
+            # Committed by @transactional; admins hear about it only once it is
+            after_commit(
+                notify_admins,
+                'New Event Submission',
+                f'New event "{new_event.title}" submitted for review',
+                'submission'
+            )
+            after_commit(invalidate_catalogue, 'event')
             
             return jsonify({
                 'success': True,
@@ -2739,6 +2948,7 @@ def manage_events():
 
 
 @app.route('/api/events/<int:id>', methods=['GET', 'PUT', 'DELETE'])
+@transactional
 def event_detail(id):
     """Get, update, or delete specific event"""
     try:
@@ -2746,7 +2956,7 @@ def event_detail(id):
         
         if request.method == 'GET':
             event.views_count += 1
-            db.session.commit()
+            after_commit(record_engagement, 'event', id)
             
             # Track view history
             auth_header = request.headers.get('Authorization')
@@ -2757,13 +2967,7 @@ def event_detail(id):
                     decoded = decode_token(token)
                     user_id = decoded['sub']
                     
-                    view_history = ViewHistory(
-                        user_id=user_id,
-                        opportunity_type='event',
-                        opportunity_id=id
-                    )
-                    db.session.add(view_history)
-                    db.session.commit()
+                    record_view(user_id, 'event', id)
                 except:
                     pass
             
@@ -2787,7 +2991,7 @@ def event_detail(id):
                 event.registration_deadline = datetime.fromisoformat(data['registration_deadline'])
             
             event.updated_at = datetime.utcnow()
-            db.session.commit()
+            after_commit(content_changed, 'event', id)
             
             return jsonify({
                 'success': True,
@@ -2797,7 +3001,7 @@ def event_detail(id):
         
         elif request.method == 'DELETE':
             db.session.delete(event)
-            db.session.commit()
+            after_commit(content_changed, 'event', id)
             
             return jsonify({
                 'success': True,
@@ -2858,54 +3062,56 @@ def mark_notification_read(id):
 
 # ==================== RECOMMENDATIONS & TRENDING ====================
 
+def _recommendations_payload():
+    """Recommendation lists shared by all users"""
+    # Simple recommendation: get similar categories/types
+    recommendations = {
+        'internships': [],
+        'courses': [],
+        'events': []
+    }
+    
+    # Get trending internships (high views + applications)
+    trending_internships = Internship.query.filter_by(
+        status='approved'
+    ).order_by(
+        (Internship.views_count + Internship.applied_count * 2).desc()
+    ).limit(10).all()
+    
+    recommendations['internships'] = [i.to_dict() for i in trending_internships]
+    
+    # Get top-rated courses
+    trending_courses = Course.query.filter_by(
+        status='approved'
+    ).order_by(Course.rating.desc()).limit(10).all()
+    
+    recommendations['courses'] = [c.to_dict() for c in trending_courses]
+    
+    # Get upcoming events
+    upcoming_events = Event.query.filter_by(
+        status='approved'
+    ).filter(
+        Event.start_date >= datetime.utcnow()
+    ).order_by(Event.start_date.asc()).limit(10).all()
+    
+    recommendations['events'] = [e.to_dict() for e in upcoming_events]
+    
+    return recommendations
+
+
 @app.route('/api/recommendations', methods=['GET'])
 @jwt_required()
+@replica_reads
 def get_recommendations():
     """Get personalized recommendations based on user activity"""
     try:
-        current_user_id = get_jwt_identity()
-        
-        # Get user's view history
-        recent_views = ViewHistory.query.filter_by(
-            user_id=current_user_id
-        ).order_by(ViewHistory.viewed_at.desc()).limit(20).all()
-        
-        # Get user's applications
-        applications = Application.query.filter_by(
-            user_id=current_user_id
-        ).all()
-        
-        # Simple recommendation: get similar categories/types
-        recommendations = {
-            'internships': [],
-            'courses': [],
-            'events': []
-        }
-        
-        # Get trending internships (high views + applications)
-        trending_internships = Internship.query.filter_by(
-            status='approved'
-        ).order_by(
-            (Internship.views_count + Internship.applied_count * 2).desc()
-        ).limit(10).all()
-        
-        recommendations['internships'] = [i.to_dict() for i in trending_internships]
-        
-        # Get top-rated courses
-        trending_courses = Course.query.filter_by(
-            status='approved'
-        ).order_by(Course.rating.desc()).limit(10).all()
-        
-        recommendations['courses'] = [c.to_dict() for c in trending_courses]
-        
-        # Get upcoming events
-        upcoming_events = Event.query.filter_by(
-            status='approved'
-        ).filter(
-            Event.start_date >= datetime.utcnow()
-        ).order_by(Event.start_date.asc()).limit(10).all()
-        
-        recommendations['events'] = [e.to_dict() for e in upcoming_events]
+        # Lists do not depend on the user yet, so every request shares one cache entry
+        recommendations = cached(
+            'recommendations',
+            _recommendations_payload,
+            app.config['CATALOGUE_CACHE_SECONDS'],
+            app.config['CACHE_STALE_SECONDS']
+        )
         
         return jsonify({
             'success': True,
@@ -2924,25 +3130,30 @@ def get_recently_viewed():
         current_user_id = get_jwt_identity()
         limit = request.args.get('limit', 10, type=int)
         
-        recent_views = ViewHistory.query.filter_by(
-            user_id=current_user_id
-        ).order_by(ViewHistory.viewed_at.desc()).limit(limit).all()
+        recent_views = event_store.recent_views(int(current_user_id), limit=limit)
         
         items = []
         for view in recent_views:
-            item_data = view.to_dict()
+            item_data = {
+                'opportunity_type': view['opportunity_type'],
+                'opportunity_id': view['opportunity_id'],
+                'first_viewed_at': event_time(view['viewed_at']),
+                'viewed_at': event_time(view['last_viewed_at']),  # Clients show viewed_at as the latest view
+                'last_viewed_at': event_time(view['last_viewed_at']),
+                'view_count': view['view_count']
+            }
             
             # Fetch actual item details
-            if view.opportunity_type == 'internship':
-                item = Internship.query.get(view.opportunity_id)
+            if view['opportunity_type'] == 'internship':
+                item = Internship.query.get(view['opportunity_id'])
                 if item:
                     item_data['details'] = item.to_dict()
-            elif view.opportunity_type == 'course':
-                item = Course.query.get(view.opportunity_id)
+            elif view['opportunity_type'] == 'course':
+                item = Course.query.get(view['opportunity_id'])
                 if item:
                     item_data['details'] = item.to_dict()
-            elif view.opportunity_type == 'event':
-                item = Event.query.get(view.opportunity_id)
+            elif view['opportunity_type'] == 'event':
+                item = Event.query.get(view['opportunity_id'])
                 if item:
                     item_data['details'] = item.to_dict()
             
@@ -2957,62 +3168,275 @@ def get_recently_viewed():
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+# -------------------- TRENDING ENGINE --------------------
+
+# Decayed engagement scores per period (half-life in seconds); a shorter half-life reacts faster
+trending_engine = trending.TrendingEngine(
+    app.config['TRENDING_DB'],
+    {'daily': 6 * 3600, 'weekly': 36 * 3600}
+)
+TRENDING_LOOKBACK = timedelta(days=14)  # Events loaded into a new, empty trending store
+TRENDING_LIMIT = 10
+
+# Engagement weight of an application/enrollment relative to a view
+APPLICATION_WEIGHTS = {'internship': 3, 'course': 2, 'event': 2}
+
+_trending_lock = threading.Lock()
+_trending_state = {'bootstrapped': False}
+
+
+def _utc_timestamp(value):
+    """Convert a naive UTC datetime to a unix timestamp"""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def record_engagement(item_type, item_id, weight=1, at=None):
+    """Feed a view/application event into the shared trending scores"""
+    ensure_trending_bootstrapped()
+    trending_engine.record(item_type, item_id, weight, at=at)
+
+
+def _trending_history():
+    """Recent view and Application events as (item_type, item_id, weight, at)"""
+    cutoff = datetime.utcnow() - TRENDING_LOOKBACK
+    
+    # Views come summed per item and hour, each counted at its latest view
+    for item_type, item_id, view_count, viewed_at in event_store.scan_views(start=_utc_timestamp(cutoff)):
+        yield item_type, item_id, view_count, viewed_at
+    
+    applications = db.session.query(
+        Application.opportunity_type, Application.opportunity_id, Application.applied_at
+    ).filter(
+        Application.applied_at >= cutoff,
+        Application.opportunity_type.in_(list(APPLICATION_WEIGHTS))
+    ).yield_per(1000)
+    for item_type, item_id, applied_at in applications:
+        yield item_type, item_id, APPLICATION_WEIGHTS[item_type], _utc_timestamp(applied_at)
+
+
+def _build_trending_payload(period):
+    """Resolve the engine's top items into serialized approved items"""
+    top = trending_engine.snapshot(period, limit=TRENDING_LIMIT * 2)
+    
+    sources = {
+        'internships': ('internship', Internship, Internship.views_count + Internship.applied_count * 3),
+        'courses': ('course', Course, Course.views_count + Course.enrolled_count * 2),
+        'events': ('event', Event, Event.views_count + Event.current_participants * 2)
+    }
+    
+    payload = {}
+    for key, (item_type, model, popularity) in sources.items():
+        ranked = [item_id for item_id, _ in top.get(item_type, [])]
+        items = {}
+        if ranked:
+            items = {
+                item.id: item
+                for item in model.query.filter(model.id.in_(ranked), model.status == 'approved').all()
+            }
+        results = [items[item_id] for item_id in ranked if item_id in items][:TRENDING_LIMIT]
+        
+        # Top up with lifetime popularity so a quiet catalogue still shows something
+        if len(results) < TRENDING_LIMIT:
+            filler = model.query.filter_by(status='approved').filter(
+                model.id.notin_([item.id for item in results])
+            ).order_by(popularity.desc()).limit(TRENDING_LIMIT - len(results)).all()
+            results.extend(filler)
+        
+        payload[key] = [item.to_dict() for item in results]
+    
+    return payload
+
+
+def ensure_trending_bootstrapped():
+    """Load recent events into a new trending store (checked once per process)"""
+    if not _trending_state['bootstrapped']:
+        with _trending_lock:
+            if not _trending_state['bootstrapped']:
+                with app.app_context():
+                    trending_engine.bootstrap(_trending_history)
+                _trending_state['bootstrapped'] = True
+
+
+def trending_snapshot(period):
+    """Latest top-k snapshot for a period, rebuilt every TRENDING_SNAPSHOT_SECONDS"""
+    ensure_trending_bootstrapped()
+    
+    # Stale snapshots keep being served while one background rebuild runs
+    return cached(
+        f'trending?period={period}',
+        lambda: _build_trending_payload(period),
+        app.config['TRENDING_SNAPSHOT_SECONDS'],
+        app.config['CACHE_STALE_SECONDS']
+    )
+
+
 @app.route('/api/trending', methods=['GET'])
+@replica_reads
 def get_trending():
     """Get trending opportunities (daily/weekly)"""
     try:
         period = request.args.get('period', 'weekly')  # 'daily' or 'weekly'
-        
-        now = datetime.utcnow()
-        if period == 'daily':
-            cutoff = now - timedelta(days=1)
-        else:
-            cutoff = now - timedelta(days=7)
-        
-        # Trending internships
-        trending_internships = Internship.query.filter_by(
-            status='approved'
-        ).filter(
-            Internship.created_at >= cutoff
-        ).order_by(
-            (Internship.views_count + Internship.applied_count * 3).desc()
-        ).limit(10).all()
-        
-        # Trending courses
-        trending_courses = Course.query.filter_by(
-            status='approved'
-        ).filter(
-            Course.created_at >= cutoff
-        ).order_by(
-            (Course.views_count + Course.enrolled_count * 2).desc()
-        ).limit(10).all()
-        
-        # Trending events
-        trending_events = Event.query.filter_by(
-            status='approved'
-        ).filter(
-            Event.created_at >= cutoff
-        ).order_by(
-            (Event.views_count + Event.current_participants * 2).desc()
-        ).limit(10).all()
+        if period not in trending_engine.periods:
+            period = 'weekly'
         
         return jsonify({
             'success': True,
             'period': period,
-            'trending': {
-                'internships': [i.to_dict() for i in trending_internships],
-                'courses': [c.to_dict() for c in trending_courses],
-                'events': [e.to_dict() for e in trending_events]
-            }
+            'trending': trending_snapshot(period)
         }), 200
     
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+# ==================== SIMILAR ITEMS ====================
+
+# Text fields (with weights) used to compare items of each content type
+SIMILARITY_FIELDS = {
+    'internship': (Internship, (('title', 3), ('skills_required', 2), ('company', 1), ('description', 1))),
+    'course': (Course, (('title', 3), ('category', 2), ('platform', 1), ('instructor', 1), ('description', 1))),
+    'event': (Event, (('title', 3), ('category', 2), ('organizer', 1), ('description', 1)))
+}
+
+
+def _similarity_matrix(content_type):
+    """Load approved items of a type and vectorize them"""
+    model, fields = SIMILARITY_FIELDS[content_type]
+    rows = model.query.filter_by(status='approved').with_entities(
+        model.id, *[getattr(model, name) for name, _ in fields]
+    ).order_by(model.id).all()
+    
+    ids = [row[0] for row in rows]
+    documents = [
+        similarity.weighted_terms(zip(row[1:], [weight for _, weight in fields]))
+        for row in rows
+    ]
+    return ids, similarity.build_matrix(documents)
+
+
+def _store_neighbours(content_type, neighbours, existing):
+    """Upsert neighbour lists into similar_items"""
+    now = datetime.utcnow()
+    for item_id, items in neighbours.items():
+        record = existing.get(item_id)
+        if record is None:
+            record = SimilarItem(opportunity_type=content_type, opportunity_id=item_id)
+            db.session.add(record)
+        record.neighbours = json.dumps(items)
+        record.computed_at = now
+
+
+def rebuild_similar_items(content_type):
+    """Batch job: recompute neighbour lists for the whole catalogue of a type"""
+    ids, matrix = _similarity_matrix(content_type)
+    neighbours = similarity.compute_neighbours(ids, matrix, app.config['SIMILAR_ITEMS_K'])
+    
+    existing = {
+        record.opportunity_id: record
+        for record in SimilarItem.query.filter_by(opportunity_type=content_type).all()
+    }
+    _store_neighbours(content_type, neighbours, existing)
+    
+    # Drop lists for items that are no longer approved
+    for item_id, record in existing.items():
+        if item_id not in neighbours:
+            db.session.delete(record)
+    
+    db.session.commit()
+    return len(neighbours)
+
+
+# Neighbour scores are only comparable within one build, so writes schedule a full rebuild
+similar_items_rebuilds = similarity.RebuildQueue(
+    app, rebuild_similar_items, delay=app.config['SIMILAR_ITEMS_REBUILD_DELAY_SECONDS']
+)
+
+
+CATALOGUE_CACHE_KEYS = {'internship': 'internships', 'course': 'courses', 'event': 'events'}
+
+
+def invalidate_catalogue(content_type):
+    """Drop this worker's cached responses derived from a content type (other workers expire theirs by TTL)"""
+    for prefix in (CATALOGUE_CACHE_KEYS[content_type], 'recommendations', 'trending', 'admin_analytics'):
+        response_cache.invalidate(prefix)
+
+
+def content_changed(content_type, content_id):
+    """Invalidate caches and update derived data after a catalogue write"""
+    invalidate_catalogue(content_type)
+    similar_items_rebuilds.request(content_type)
+    
+    # Deleted or unapproved items leave trending at once instead of holding top-N slots
+    model, _ = SIMILARITY_FIELDS[content_type]
+    if not db.session.query(model.query.filter_by(id=content_id, status='approved').exists()).scalar():
+        trending_engine.remove(content_type, content_id)
+
+
+def similar_items_response(content_type, content_id):
+    """Serve precomputed neighbours for an item"""
+    model, _ = SIMILARITY_FIELDS[content_type]
+    limit = request.args.get('limit', app.config['SIMILAR_ITEMS_K'], type=int)
+    
+    record = SimilarItem.query.filter_by(
+        opportunity_type=content_type,
+        opportunity_id=content_id
+    ).first()
+    neighbours = record.neighbour_list()[:limit] if record else []
+    
+    items = {}
+    if neighbours:
+        items = {
+            item.id: item
+            for item in model.query.filter(
+                model.id.in_([item_id for item_id, _ in neighbours]),
+                model.status == 'approved'
+            ).all()
+        }
+    
+    similar = []
+    for item_id, score in neighbours:
+        if item_id in items:
+            item_data = items[item_id].to_dict()
+            item_data['similarity'] = score
+            similar.append(item_data)
+    
+    return jsonify({
+        'success': True,
+        'similar': similar
+    }), 200
+
+
+@app.route('/api/internships/<int:id>/similar', methods=['GET'])
+def similar_internships(id):
+    """Get internships similar to this one"""
+    try:
+        return similar_items_response('internship', id)
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@app.route('/api/courses/<int:id>/similar', methods=['GET'])
+def similar_courses(id):
+    """Get courses similar to this one"""
+    try:
+        return similar_items_response('course', id)
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@app.route('/api/events/<int:id>/similar', methods=['GET'])
+def similar_events(id):
+    """Get events similar to this one"""
+    try:
+        return similar_items_response('event', id)
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
 # ==================== SEARCH APIs ====================
 
 @app.route('/api/search', methods=['GET'])
+@replica_reads
 def global_search():
     """Search across all content types"""
     try:
@@ -3035,8 +3459,8 @@ def global_search():
                     Internship.description.ilike(f'%{query}%'),
                     Internship.skills_required.ilike(f'%{query}%')
                 )
-            ).limit(20).all()
-            results['internships'] = [i.to_dict() for i in internships]
+            ).limit(20)
+            results['internships'] = fetch_dicts(internships, Internship)
         
         if not content_type or content_type == 'course':
             courses = Course.query.filter_by(status='approved').filter(
@@ -3045,8 +3469,8 @@ def global_search():
                     Course.instructor.ilike(f'%{query}%'),
                     Course.description.ilike(f'%{query}%')
                 )
-            ).limit(20).all()
-            results['courses'] = [c.to_dict() for c in courses]
+            ).limit(20)
+            results['courses'] = fetch_dicts(courses, Course)
         
         if not content_type or content_type == 'event':
             events = Event.query.filter_by(status='approved').filter(
@@ -3055,8 +3479,8 @@ def global_search():
                     Event.organizer.ilike(f'%{query}%'),
                     Event.description.ilike(f'%{query}%')
                 )
-            ).limit(20).all()
-            results['events'] = [e.to_dict() for e in events]
+            ).limit(20)
+            results['events'] = fetch_dicts(events, Event)
         
         return jsonify({
             'success': True,
@@ -3126,71 +3550,109 @@ def manage_preferences():
 
 # ==================== ADMIN APIs ====================
 
+def _admin_analytics_payload():
+    """Aggregate platform statistics for the admin dashboard"""
+    # User stats
+    total_users = User.query.count()
+    active_users = LoginActivity.query.filter_by(is_active=True).distinct(LoginActivity.user_id).count()
+    
+    # Registration stats (last 7 days)
+    seven_days_ago = datetime.utcnow() - timedelta(days=7)
+    new_registrations = User.query.filter(User.created_at >= seven_days_ago).count()
+    
+    # Login and view activity (last 7 days) from the event store
+    logins_7d, active_users_7d = event_store.count_logins(start=_utc_timestamp(seven_days_ago))
+    views_7d = event_store.count_views(start=_utc_timestamp(seven_days_ago))
+    
+    # Content stats
+    total_internships = Internship.query.filter_by(status='approved').count()
+    total_courses = Course.query.filter_by(status='approved').count()
+    total_events = Event.query.filter_by(status='approved').count()
+    
+    pending_internships = Internship.query.filter_by(status='pending').count()
+    pending_courses = Course.query.filter_by(status='pending').count()
+    pending_events = Event.query.filter_by(status='pending').count()
+    
+    # Engagement stats
+    total_views = Internship.query.with_entities(db.func.sum(Internship.views_count)).scalar() or 0
+    total_views += Course.query.with_entities(db.func.sum(Course.views_count)).scalar() or 0
+    total_views += Event.query.with_entities(db.func.sum(Event.views_count)).scalar() or 0
+    
+    total_applications = Application.query.count()
+    course_enrollments = Course.query.with_entities(db.func.sum(Course.enrolled_count)).scalar() or 0
+    event_registrations = Event.query.with_entities(db.func.sum(Event.current_participants)).scalar() or 0
+    
+    return {
+        'users': {
+            'total': total_users,
+            'active': active_users,
+            'active_7d': active_users_7d,
+            'logins_7d': logins_7d,
+            'new_registrations_7d': new_registrations
+        },
+        'content': {
+            'internships': {
+                'approved': total_internships,
+                'pending': pending_internships
+            },
+            'courses': {
+                'approved': total_courses,
+                'pending': pending_courses
+            },
+            'events': {
+                'approved': total_events,
+                'pending': pending_events
+            }
+        },
+        'engagement': {
+            'total_views': total_views,
+            'views_7d': views_7d,
+            'internship_applications': total_applications,
+            'course_enrollments': course_enrollments,
+            'event_registrations': event_registrations
+        }
+    }
+
+
 @app.route('/api/admin/analytics', methods=['GET'])
-@jwt_required()
+@admin_required()
+@replica_reads
 def admin_analytics():
     """Get comprehensive admin analytics"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if user.role != 'admin':
-            return jsonify({'success': False, 'message': 'Unauthorized'}), 403
-        
-        # User stats
-        total_users = User.query.count()
-        active_users = LoginActivity.query.filter_by(is_active=True).distinct(LoginActivity.user_id).count()
-        
-        # Registration stats (last 7 days)
-        seven_days_ago = datetime.utcnow() - timedelta(days=7)
-        new_registrations = User.query.filter(User.created_at >= seven_days_ago).count()
-        
-        # Content stats
-        total_internships = Internship.query.filter_by(status='approved').count()
-        total_courses = Course.query.filter_by(status='approved').count()
-        total_events = Event.query.filter_by(status='approved').count()
-        
-        pending_internships = Internship.query.filter_by(status='pending').count()
-        pending_courses = Course.query.filter_by(status='pending').count()
-        pending_events = Event.query.filter_by(status='pending').count()
-        
-        # Engagement stats
-        total_views = Internship.query.with_entities(db.func.sum(Internship.views_count)).scalar() or 0
-        total_views += Course.query.with_entities(db.func.sum(Course.views_count)).scalar() or 0
-        total_views += Event.query.with_entities(db.func.sum(Event.views_count)).scalar() or 0
-        
-        total_applications = Application.query.count()
-        course_enrollments = Course.query.with_entities(db.func.sum(Course.enrolled_count)).scalar() or 0
-        event_registrations = Event.query.with_entities(db.func.sum(Event.current_participants)).scalar() or 0
+        analytics = cached(
+            'admin_analytics',
+            _admin_analytics_payload,
+            app.config['ANALYTICS_CACHE_SECONDS'],
+            app.config['CACHE_STALE_SECONDS']
+        )
         
         return jsonify({
             'success': True,
-            'analytics': {
-                'users': {
-                    'total': total_users,
-                    'active': active_users,
-                    'new_registrations_7d': new_registrations
-                },
-                'content': {
-                    'internships': {
-                        'approved': total_internships,
-                        'pending': pending_internships
-                    },
-                    'courses': {
-                        'approved': total_courses,
-                        'pending': pending_courses
-                    },
-                    'events': {
-                        'approved': total_events,
-                        'pending': pending_events
-                    }
-                },
-                'engagement': {
-                    'total_views': total_views,
-                    'internship_applications': total_applications,
-                    'course_enrollments': course_enrollments,
-                    'event_registrations': event_registrations
-                }
+            'analytics': analytics
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+@app.route('/api/admin/performance', methods=['GET'])
+@admin_required()
+def admin_performance_stats():
+    """Get cache and request-coalescing statistics for this worker"""
+    try:
+        return jsonify({
+            'success': True,
+            'performance': {
+                'response_cache': response_cache.stats(),
+                'email_filter': registered_emails.stats(),
+                'login_guard': login_guard.stats(),
+                'audit_log': audit_log.stats(),
+                'geolocation': geolocator.stats(),
+                'session_revocation': revoked_sessions.stats(),
+                'replica': replica_router.stats(),
+                'unit_of_work': unit_of_work.stats(),
+                'similar_items_rebuilds': similar_items_rebuilds.stats()
             }
         }), 200
     
@@ -3198,22 +3660,31 @@ def admin_analytics():
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+@app.route('/api/admin/sql-stats', methods=['GET'])
+@admin_required()
+def admin_sql_stats():
+    """Routes by SQL time over the rolling window, for this worker"""
+    try:
+        limit = request.args.get('limit', 10, type=int)
+        
+        return jsonify({
+            'success': True,
+            'window_seconds': sql_timer.window_seconds,
+            'routes': sql_timer.top(limit)
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
 @app.route('/api/admin/users', methods=['GET'])
-@jwt_required()
+@admin_required()
 def admin_get_users():
     """Get all users (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if user.role != 'admin':
-            return jsonify({'success': False, 'message': 'Unauthorized'}), 403
-        
-        users = User.query.all()
-        
         return jsonify({
             'success': True,
-            'users': [u.to_dict() for u in users]
+            'users': fetch_dicts(User.query, User)
         }), 200
     
     except Exception as e:
@@ -3221,22 +3692,18 @@ def admin_get_users():
 
 
 @app.route('/api/admin/users/<int:user_id>/ban', methods=['POST'])
-@jwt_required()
+@admin_required()
+@transactional
 def admin_ban_user(user_id):
     """Ban/unban a user (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        admin = User.query.get(current_user_id)
-        
-        if admin.role != 'admin':
-            return jsonify({'success': False, 'message': 'Unauthorized'}), 403
-        
-        user = User.query.get_or_404(user_id)
+        user = db.session.get(User, user_id)
+        if not user:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
         data = request.get_json()
         
         # Add banned field to User model or use verified field
         user.verified = not data.get('ban', True)
-        db.session.commit()
         
         return jsonify({
             'success': True,
@@ -3249,16 +3716,11 @@ def admin_ban_user(user_id):
 
 
 @app.route('/api/admin/content/<content_type>/<int:content_id>/approve', methods=['POST'])
-@jwt_required()
+@admin_required()
+@transactional
 def admin_approve_content(content_type, content_id):
     """Approve or reject submitted content (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        admin = User.query.get(current_user_id)
-        
-        if admin.role != 'admin':
-            return jsonify({'success': False, 'message': 'Unauthorized'}), 403
-        
         data = request.get_json()
         action = data.get('action', 'approved')  # 'approved' or 'rejected'
         
@@ -3273,18 +3735,17 @@ def admin_approve_content(content_type, content_id):
             return jsonify({'success': False, 'message': 'Invalid content type'}), 400
         
         content.status = action
-        db.session.commit()
+        after_commit(content_changed, content_type, content_id)
         
         # Notify submitter
         if content.submitted_by:
-            notification = Notification(
-                user_id=content.submitted_by,
-                title=f'{content_type.capitalize()} {action.capitalize()}',
-                message=f'Your {content_type} "{content.title}" has been {action}',
-                type='approval'
+            after_commit(
+                notify,
+                [content.submitted_by],
+                f'{content_type.capitalize()} {action.capitalize()}',
+                f'Your {content_type} "{content.title}" has been {action}',
+                'approval'
             )
-            db.session.add(notification)
-            db.session.commit()
         
         return jsonify({
             'success': True,
@@ -3297,43 +3758,161 @@ def admin_approve_content(content_type, content_id):
 
 
 @app.route('/api/admin/reports', methods=['GET'])
-@jwt_required()
+@admin_required()
 def admin_get_reports():
     """Get all reported content (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        admin = User.query.get(current_user_id)
-        
-        if admin.role != 'admin':
-            return jsonify({'success': False, 'message': 'Unauthorized'}), 403
-        
         status = request.args.get('status', 'pending')
         
         reports = ReportedContent.query.filter_by(status=status).order_by(
             ReportedContent.created_at.desc()
-        ).all()
+        )
+        
+        return jsonify({
+            'success': True,
+            'reports': fetch_dicts(reports, ReportedContent)
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+# ==================== COLD ARCHIVE ====================
+
+archive = Archive(app.config['ARCHIVE_DIR'])
+
+
+# Applications the user can no longer change, on opportunities that no longer exist
+FINAL_APPLICATION_STATUSES = ('accepted', 'rejected', 'withdrawn')
+
+
+def _application_closed():
+    """
+    Archivable applications: final status and the opportunity deleted
+    
+    "My applications" and the duplicate-apply checks only read the hot table,
+    so an application stays there while its opportunity can still be applied to.
+    """
+    opportunity_gone = [
+        db.and_(
+            Application.opportunity_type == opportunity_type,
+            ~db.select(model.id).where(model.id == Application.opportunity_id).exists()
+        )
+        for opportunity_type, model in (('internship', Internship), ('course', Course), ('event', Event))
+    ]
+    return db.and_(Application.status.in_(FINAL_APPLICATION_STATUSES), db.or_(*opportunity_gone))
+
+
+def archived_tables():
+    """Archivable models: {table: (model, time column, extra condition)}"""
+    return {
+        'applications': (Application, Application.updated_at, _application_closed()),
+        # Active sessions stay in the hot table however old they are
+        'login_activities': (LoginActivity, LoginActivity.login_time, LoginActivity.is_active.is_(False))
+    }
+
+
+def _archive_value(column, value):
+    """Convert a query string value to the archived representation of column"""
+    if isinstance(column.type, db.Integer):
+        return int(value)
+    if isinstance(column.type, db.DateTime):
+        return datetime.fromisoformat(value).isoformat()
+    if isinstance(column.type, db.Boolean):
+        return value.lower() in ('1', 'true')
+    return value
+
+
+def _archive_upper_bound(column, value):
+    """`to` filter value: a bare date (YYYY-MM-DD) includes that whole day"""
+    if isinstance(column.type, db.DateTime) and len(value) == 10:
+        return (datetime.fromisoformat(value) + timedelta(days=1, microseconds=-1)).isoformat()
+    return _archive_value(column, value)
+
+
+@app.route('/api/admin/archive', methods=['GET'])
+@admin_required()
+def admin_archive_summary():
+    """List archived tables with their partitions"""
+    try:
+        tables = {}
+        for table in archive.tables():
+            parts = archive.manifest(table)
+            months = sorted({part['month'] for part in parts})
+            tables[table] = {
+                'parts': len(parts),
+                'rows': sum(part['rows'] for part in parts),
+                'bytes': sum(part['bytes'] for part in parts),
+                'months': months
+            }
         
         return jsonify({
             'success': True,
-            'reports': [r.to_dict() for r in reports]
+            'archive': tables
         }), 200
     
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+@app.route('/api/admin/archive/<table>', methods=['GET'])
+@admin_required()
+def admin_query_archive(table):
+    """
+    Query archived rows
+    
+    Query params: any column for equality (e.g. user_id=5, status=accepted),
+    `from`/`to` (ISO dates, `to` inclusive of the whole day) on the table's
+    time column, `limit` (default 100).
+    Partitions whose statistics exclude the filters are not read.
+    """
+    try:
+        tables = archived_tables()
+        if table not in tables:
+            return jsonify({'success': False, 'message': 'Unknown archive table'}), 404
+        
+        model, time_column, _ = tables[table]
+        columns = model.__table__.columns
+        limit = min(request.args.get('limit', 100, type=int), 1000)
+        
+        equals, ranges = {}, {}
+        for key, value in request.args.items():
+            if key in ('from', 'to', 'limit'):
+                continue
+            if key not in columns:
+                return jsonify({'success': False, 'message': f'Unknown column: {key}'}), 400
+            equals[key] = _archive_value(columns[key], value)
+        
+        if request.args.get('from') or request.args.get('to'):
+            ranges[time_column.key] = (
+                _archive_value(time_column, request.args['from']) if request.args.get('from') else None,
+                _archive_upper_bound(time_column, request.args['to']) if request.args.get('to') else None
+            )
+        
+        rows, stats = archive.scan(table, equals=equals, ranges=ranges, limit=limit)
+        
+        return jsonify({
+            'success': True,
+            'rows': rows,
+            'count': len(rows),
+            'scan': stats
+        }), 200
+    
+    except ValueError as e:
+        return jsonify({'success': False, 'message': f'Invalid filter: {str(e)}'}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
 # ==================== ADMIN CONTENT MANAGEMENT ====================
 
 @app.route('/api/admin/courses/add', methods=['POST'])
-@jwt_required()
+@admin_required()
+@transactional
 def admin_add_course():
     """Admin adds a new course directly (auto-approved)"""
     try:
         current_user_id = get_jwt_identity()
-        admin = User.query.get(current_user_id)
-        
-        if admin.role != 'admin':
-            return jsonify({'success': False, 'message': 'Admin access required'}), 403
         
         data = request.get_json()
         
@@ -3355,7 +3934,8 @@ def admin_add_course():
         )
         
         db.session.add(new_course)
-        db.session.commit()
+        db.session.flush()  # Assign the id for content_changed and the response
+        after_commit(content_changed, 'course', new_course.id)
         
         return jsonify({
             'success': True,
@@ -3369,16 +3949,11 @@ def admin_add_course():
 
 
 @app.route('/api/admin/courses/<int:id>', methods=['PUT', 'DELETE'])
-@jwt_required()
+@admin_required()
+@transactional
 def admin_manage_course(id):
     """Admin updates or deletes a course"""
     try:
-        current_user_id = get_jwt_identity()
-        admin = User.query.get(current_user_id)
-        
-        if admin.role != 'admin':
-            return jsonify({'success': False, 'message': 'Admin access required'}), 403
-        
         course = Course.query.get_or_404(id)
         
         if request.method == 'PUT':
@@ -3390,7 +3965,7 @@ def admin_manage_course(id):
                     setattr(course, key, value)
             
             course.updated_at = datetime.utcnow()
-            db.session.commit()
+            after_commit(content_changed, 'course', id)
             
             return jsonify({
                 'success': True,
@@ -3400,7 +3975,7 @@ def admin_manage_course(id):
         
         elif request.method == 'DELETE':
             db.session.delete(course)
-            db.session.commit()
+            after_commit(content_changed, 'course', id)
             
             return jsonify({
                 'success': True,
@@ -3413,15 +3988,12 @@ def admin_manage_course(id):
 
 
 @app.route('/api/admin/internships/add', methods=['POST'])
-@jwt_required()
+@admin_required()
+@transactional
 def admin_add_internship():
     """Admin adds a new internship directly (auto-approved)"""
     try:
         current_user_id = get_jwt_identity()
-        admin = User.query.get(current_user_id)
-        
-        if admin.role != 'admin':
-            return jsonify({'success': False, 'message': 'Admin access required'}), 403
         
         data = request.get_json()
         
@@ -3442,7 +4014,8 @@ def admin_add_internship():
         )
         
         db.session.add(new_internship)
-        db.session.commit()
+        db.session.flush()  # Assign the id for content_changed and the response
+        after_commit(content_changed, 'internship', new_internship.id)
         
         return jsonify({
             'success': True,
@@ -3456,16 +4029,11 @@ def admin_add_internship():
 
 
 @app.route('/api/admin/internships/<int:id>', methods=['PUT', 'DELETE'])
-@jwt_required()
+@admin_required()
+@transactional
 def admin_manage_internship(id):
     """Admin updates or deletes an internship"""
     try:
-        current_user_id = get_jwt_identity()
-        admin = User.query.get(current_user_id)
-        
-        if admin.role != 'admin':
-            return jsonify({'success': False, 'message': 'Admin access required'}), 403
-        
         internship = Internship.query.get_or_404(id)
         
         if request.method == 'PUT':
@@ -3476,7 +4044,7 @@ def admin_manage_internship(id):
                     setattr(internship, key, value)
             
             internship.updated_at = datetime.utcnow()
-            db.session.commit()
+            after_commit(content_changed, 'internship', id)
             
             return jsonify({
                 'success': True,
@@ -3486,7 +4054,7 @@ def admin_manage_internship(id):
         
         elif request.method == 'DELETE':
             db.session.delete(internship)
-            db.session.commit()
+            after_commit(content_changed, 'internship', id)
             
             return jsonify({
                 'success': True,
@@ -3499,15 +4067,12 @@ def admin_manage_internship(id):
 
 
 @app.route('/api/admin/events/add', methods=['POST'])
-@jwt_required()
+@admin_required()
+@transactional
 def admin_add_event():
     """Admin adds a new event/hackathon directly (auto-approved)"""
     try:
         current_user_id = get_jwt_identity()
-        admin = User.query.get(current_user_id)
-        
-        if admin.role != 'admin':
-            return jsonify({'success': False, 'message': 'Admin access required'}), 403
         
         data = request.get_json()
         
@@ -3528,7 +4093,8 @@ def admin_add_event():
         )
         
         db.session.add(new_event)
-        db.session.commit()
+        db.session.flush()  # Assign the id for content_changed and the response
+        after_commit(content_changed, 'event', new_event.id)
         
         return jsonify({
             'success': True,
@@ -3542,16 +4108,11 @@ def admin_add_event():
 
 
 @app.route('/api/admin/events/<int:id>', methods=['PUT', 'DELETE'])
-@jwt_required()
+@admin_required()
+@transactional
 def admin_manage_event(id):
     """Admin updates or deletes an event"""
     try:
-        current_user_id = get_jwt_identity()
-        admin = User.query.get(current_user_id)
-        
-        if admin.role != 'admin':
-            return jsonify({'success': False, 'message': 'Admin access required'}), 403
-        
         event = Event.query.get_or_404(id)
         
         if request.method == 'PUT':
@@ -3569,7 +4130,7 @@ def admin_manage_event(id):
                 event.registration_deadline = datetime.fromisoformat(data['registration_deadline'])
             
             event.updated_at = datetime.utcnow()
-            db.session.commit()
+            after_commit(content_changed, 'event', id)
             
             return jsonify({
                 'success': True,
@@ -3579,7 +4140,7 @@ def admin_manage_event(id):
         
         elif request.method == 'DELETE':
             db.session.delete(event)
-            db.session.commit()
+            after_commit(content_changed, 'event', id)
             
             return jsonify({
                 'success': True,
@@ -3592,26 +4153,16 @@ def admin_manage_event(id):
 
 
 @app.route('/api/admin/submissions/pending', methods=['GET'])
-@jwt_required()
+@admin_required()
 def admin_get_pending_submissions():
     """Get all pending submissions from students"""
     try:
-        current_user_id = get_jwt_identity()
-        admin = User.query.get(current_user_id)
-        
-        if admin.role != 'admin':
-            return jsonify({'success': False, 'message': 'Admin access required'}), 403
-        
-        pending_internships = Internship.query.filter_by(status='pending').all()
-        pending_courses = Course.query.filter_by(status='pending').all()
-        pending_events = Event.query.filter_by(status='pending').all()
-        
         return jsonify({
             'success': True,
             'submissions': {
-                'internships': [i.to_dict() for i in pending_internships],
-                'courses': [c.to_dict() for c in pending_courses],
-                'events': [e.to_dict() for e in pending_events]
+                'internships': fetch_dicts(Internship.query.filter_by(status='pending'), Internship),
+                'courses': fetch_dicts(Course.query.filter_by(status='pending'), Course),
+                'events': fetch_dicts(Event.query.filter_by(status='pending'), Event)
             }
         }), 200
     
@@ -3620,26 +4171,22 @@ def admin_get_pending_submissions():
 
 
 @app.route('/api/admin/view-applications', methods=['GET'])
-@jwt_required()
+@admin_required()
 def admin_view_all_applications():
     """Admin views all student applications"""
     try:
-        current_user_id = get_jwt_identity()
-        admin = User.query.get(current_user_id)
-        
-        if admin.role != 'admin':
-            return jsonify({'success': False, 'message': 'Admin access required'}), 403
-        
-        applications = Application.query.order_by(Application.applied_at.desc()).all()
+        # Enrich with user details in the same query (one round trip instead of one per row)
+        columns, row_to_dict = ROW_SERIALIZERS[Application]
+        rows = db.session.query(*columns, User.name, User.email).outerjoin(
+            User, User.id == Application.user_id
+        ).order_by(Application.applied_at.desc())
         
-        # Enrich with user details
         application_list = []
-        for app in applications:
-            app_dict = app.to_dict()
-            user = User.query.get(app.user_id)
-            if user:
-                app_dict['user_name'] = user.name
-                app_dict['user_email'] = user.email
+        for row in rows:
+            app_dict = row_to_dict(row)
+            if row.name is not None:
+                app_dict['user_name'] = row.name
+                app_dict['user_email'] = row.email
             application_list.append(app_dict)
         
         return jsonify({
@@ -3655,6 +4202,7 @@ def admin_view_all_applications():
 
 @app.route('/api/courses/<int:id>/enroll', methods=['POST'])
 @jwt_required()
+@transactional
 def enroll_course(id):
     """Student clicks 'Start Learning' - increment enrolled_count"""
     try:
@@ -3663,7 +4211,7 @@ def enroll_course(id):
         
         # Increment enrolled count (applied metric)
         course.enrolled_count += 1
-        db.session.commit()
+        after_commit(record_engagement, 'course', id, APPLICATION_WEIGHTS['course'])
         
         # Track application
         existing = Application.query.filter_by(
@@ -3682,7 +4230,6 @@ def enroll_course(id):
                 status='enrolled'
             )
             db.session.add(application)
-            db.session.commit()
         
         return jsonify({
             'success': True,
@@ -3696,23 +4243,18 @@ def enroll_course(id):
 
 
 @app.route('/api/admin/reports/<int:report_id>/resolve', methods=['POST'])
-@jwt_required()
+@admin_required()
+@transactional
 def admin_resolve_report(report_id):
     """Resolve a report (admin only)"""
     try:
         current_user_id = get_jwt_identity()
-        admin = User.query.get(current_user_id)
-        
-        if admin.role != 'admin':
-            return jsonify({'success': False, 'message': 'Unauthorized'}), 403
         
         report = ReportedContent.query.get_or_404(report_id)
         report.status = 'resolved'
         report.reviewed_at = datetime.utcnow()
         report.reviewed_by = current_user_id
         
-        db.session.commit()
-        
         return jsonify({
             'success': True,
             'message': 'Report resolved successfully'
@@ -3750,7 +4292,7 @@ def create_tables():
         # Create default admin if not exists
         admin = User.query.filter_by(email='admin@hackifm.com').first()
         if not admin:
-            admin_password_hash = bcrypt.generate_password_hash('Admin@123').decode('utf-8')
+            admin_password_hash = hash_password('Admin@123')
             admin_user = User(
                 name='HackIFM Admin',
                 email='admin@hackifm.com',
@@ -3763,6 +4305,44 @@ def create_tables():
             print("Default admin created: admin@hackifm.com / Admin@123")
 
 
+def warm_up():
+    """
+    Build in-memory state ahead of serving (called by a preloading server's
+    master before it forks, so workers inherit it copy-on-write)
+    """
+    create_tables()
+    with app.app_context():
+        registered_emails.rebuild()
+        revoked_sessions.sync()
+        ensure_trending_bootstrapped()
+        db.session.remove()
+        # Forked workers must not share the master's pooled connections
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+# ==================== DATA RETENTION ====================
+
+def retention_policies():
+    """Retention policy per append-only table (see purge_logs.py)"""
+    config = app.config
+    return [
+        AgePolicy(OTPSendLog, OTPSendLog.sent_at, timedelta(days=config['RETENTION_OTP_LOG_DAYS'])),
+        AgePolicy(
+            Notification, Notification.created_at,
+            timedelta(days=config['RETENTION_READ_NOTIFICATION_DAYS']),
+            where=Notification.is_read.is_(True)
+        ),
+        # Active sessions are never purged
+        KeepLastPolicy(
+            LoginActivity, LoginActivity.user_id, config['RETENTION_LOGINS_PER_USER'],
+            where=LoginActivity.is_active.is_(False)
+        ),
+        # Revocations are only needed until the token itself expires
+        AgePolicy(SessionRevocation, SessionRevocation.expires_at, timedelta(0))
+    ]
+
+
 # ==================== RUN APP ====================
 
 if __name__ == '__main__':
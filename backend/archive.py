@@ -0,0 +1,212 @@
+"""
+Cold archive for historical rows
+Old rows are moved out of the hot tables into compressed NDJSON files, one
+directory per table and month:
+
+    <root>/<table>/<YYYY-MM>/part-<timestamp>.ndjson.zst   (.gz without zstandard)
+
+Each table has a manifest.json recording every part with its row count and
+min/max statistics per column, so queries skip parts that cannot match
+(predicate pushdown) and only decompress the rest.
+"""
+
+import gzip
+import io
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, delete, select
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, archives are gzip compressed
+    zstandard = None
+
+BATCH_SIZE = 5000
+MANIFEST = 'manifest.json'
+
+_manifest_lock = threading.Lock()
+
+
+def _open_part(path):
+    """Text stream over a compressed part"""
+    if path.endswith('.zst'):
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True), encoding='utf-8')
+    return gzip.open(path, 'rt', encoding='utf-8')
+
+
+def _compress(data):
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(data), '.ndjson.zst'
+    return gzip.compress(data, compresslevel=9, mtime=0), '.ndjson.gz'
+
+
+class Archive:
+    """Month-partitioned, compressed NDJSON archive rooted at a directory"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _manifest_path(self, table):
+        return os.path.join(self.root, table, MANIFEST)
+
+    def manifest(self, table):
+        """Parts recorded for a table (oldest first)"""
+        path = self._manifest_path(table)
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)['parts']
+
+    def tables(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.exists(self._manifest_path(name))
+        )
+
+    def write(self, table, month, rows, stat_columns):
+        """
+        Write rows as a new part of table/month and record it in the manifest
+
+        The part file is complete on disk before the manifest references it.
+        """
+        directory = os.path.join(self.root, table, month)
+        os.makedirs(directory, exist_ok=True)
+
+        body = ''.join(json.dumps(row, separators=(',', ':')) + '\n' for row in rows).encode('utf-8')
+        data, suffix = _compress(body)
+        name = f'part-{time.time_ns()}{suffix}'
+        path = os.path.join(directory, name)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + '.tmp', path)
+
+        stats = {}
+        for column in stat_columns:
+            values = [row[column] for row in rows if row.get(column) is not None]
+            if values:
+                stats[column] = [min(values), max(values)]
+
+        part = {
+            'path': os.path.relpath(path, os.path.join(self.root, table)),
+            'month': month,
+            'rows': len(rows),
+            'bytes': len(data),
+            'stats': stats
+        }
+        with _manifest_lock:
+            parts = self.manifest(table)
+            parts.append(part)
+            manifest_path = self._manifest_path(table)
+            with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump({'table': table, 'parts': parts}, f, indent=1)
+            os.replace(manifest_path + '.tmp', manifest_path)
+        return part
+
+    def scan(self, table, equals=None, ranges=None, limit=1000):
+        """
+        Yield archived rows matching every predicate
+
+        equals: {column: value}
+        ranges: {column: (low, high)} inclusive, either bound may be None
+        Datetimes are compared as ISO 8601 strings. Returns (rows, scan stats).
+        """
+        equals = equals or {}
+        ranges = ranges or {}
+        predicates = [(column, value, value) for column, value in equals.items()]
+        predicates += [(column, low, high) for column, (low, high) in ranges.items()]
+
+        rows, seen = [], set()
+        scanned = skipped = 0
+        for part in reversed(self.manifest(table)):
+            if len(rows) >= limit:
+                break
+            if not _part_may_match(part, predicates):
+                skipped += 1
+                continue
+            scanned += 1
+            with _open_part(os.path.join(self.root, table, part['path'])) as lines:
+                for line in lines:
+                    row = json.loads(line)
+                    # A crash between archiving and deleting can archive a row twice
+                    if row['id'] in seen or not _row_matches(row, predicates):
+                        continue
+                    seen.add(row['id'])
+                    rows.append(row)
+                    if len(rows) >= limit:
+                        break
+
+        return rows, {'parts_scanned': scanned, 'parts_skipped': skipped}
+
+
+def _part_may_match(part, predicates):
+    stats = part['stats']
+    for column, low, high in predicates:
+        if column not in stats:
+            continue
+        minimum, maximum = stats[column]
+        if (low is not None and maximum < low) or (high is not None and minimum > high):
+            return False
+    return True
+
+
+def _row_matches(row, predicates):
+    for column, low, high in predicates:
+        value = row.get(column)
+        if value is None:
+            return False
+        if (low is not None and value < low) or (high is not None and value > high):
+            return False
+    return True
+
+
+def _row_to_dict(row, columns):
+    result = {}
+    for column, value in zip(columns, row):
+        result[column.key] = value.isoformat() if isinstance(value, datetime) else value
+    return result
+
+
+def archive_table(session, archive, model, time_column, cutoff, where=None, batch_size=BATCH_SIZE):
+    """
+    Move rows of model older than cutoff into the archive
+
+    Each batch is written (and fsynced) before its rows are deleted, one short
+    transaction per batch. Returns the number of rows moved.
+    """
+    columns = list(model.__table__.columns)
+    stat_columns = [
+        column.key for column in columns
+        if isinstance(column.type, (Integer, DateTime))
+    ]
+    conditions = [time_column < cutoff]
+    if where is not None:
+        conditions.append(where)
+
+    moved, last_id = 0, 0
+    while True:
+        rows = session.execute(
+            select(*columns).where(model.id > last_id, *conditions).order_by(model.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return moved
+        last_id = rows[-1].id
+
+        by_month = {}
+        for row in rows:
+            record = _row_to_dict(row, columns)
+            month = record[time_column.key][:7] if record[time_column.key] else 'unknown'
+            by_month.setdefault(month, []).append(record)
+        for month, records in by_month.items():
+            archive.write(model.__tablename__, month, records, stat_columns)
+
+        session.execute(delete(model).where(model.id.in_([row.id for row in rows])))
+        session.commit()
+        moved += len(rows)
@@ -0,0 +1,38 @@
+"""
+Batch job: move old applications and activity into the cold archive
+Run periodically (e.g. monthly cron). Rows older than ARCHIVE_AFTER_DAYS are
+written to compressed, month-partitioned files under ARCHIVE_DIR and then
+deleted from the hot tables. Query them via GET /api/admin/archive/<table>.
+
+Usage: python archive_history.py [days]
+"""
+
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db, archive, archived_tables
+from archive import archive_table
+
+
+def archive_history(days=None):
+    """Archive rows older than the cutoff for every archivable table"""
+    with app.app_context():
+        db.create_all()
+        days = days or app.config['ARCHIVE_AFTER_DAYS']
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        print(f"📦 Archiving rows older than {cutoff:%Y-%m-%d} to {archive.root}...")
+        
+        for table, (model, time_column, where) in archived_tables().items():
+            started = time.perf_counter()
+            moved = archive_table(db.session, archive, model, time_column, cutoff, where=where)
+            elapsed = time.perf_counter() - started
+            print(f"  ✅ {table}: {moved} rows in {elapsed:.2f}s")
+        
+        print("\n✅ Archive complete!")
+
+
+if __name__ == '__main__':
+    archive_history(int(sys.argv[1]) if len(sys.argv) > 1 else None)
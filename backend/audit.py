@@ -0,0 +1,108 @@
+"""
+Asynchronous audit log writer
+Request handlers enqueue rows and return; a background thread inserts them in
+batches. The thread starts lazily and is restarted in forked worker processes.
+Only rows nothing else reads back at once belong here (notifications, OTP
+send logs): the queue is per worker, so other workers cannot see or flush it.
+Each model's rows are committed separately, and a batch that fails is retried
+row by row, so one bad row loses only itself.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+
+from sqlalchemy import insert
+
+FLUSH_INTERVAL = 1.0  # Seconds a row may wait before its batch is written
+BATCH_SIZE = 200
+FLUSH = object()  # Queue marker: write the current batch now
+
+
+class AuditWriter:
+    """Queue of (model, row) pairs written in batches by one background thread"""
+
+    def __init__(self, app, db, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.app = app
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.pid = None
+        self.queue = None
+        self.written = 0
+        self.failed = 0
+        atexit.register(self.flush)
+
+    def _ensure_started(self):
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid != os.getpid():
+                # Threads do not survive fork; each worker owns its queue and writer
+                self.queue = queue.Queue()
+                threading.Thread(target=self._run, args=(self.queue,), daemon=True).start()
+                self.pid = os.getpid()
+
+    def add(self, model, **fields):
+        """Enqueue one audit row"""
+        self._ensure_started()
+        self.queue.put((model, fields))
+
+    def _run(self, rows):
+        while True:
+            batch = [rows.get()]
+            deadline = time.monotonic() + self.flush_interval
+            try:
+                while len(batch) < self.batch_size and batch[-1] is not FLUSH:
+                    batch.append(rows.get(timeout=max(0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+            entries = [entry for entry in batch if entry is not FLUSH]
+            if entries:
+                self._write(entries)
+            for _ in batch:
+                rows.task_done()
+
+    def _write(self, batch):
+        by_model = {}
+        for model, fields in batch:
+            by_model.setdefault(model, []).append(fields)
+        with self.app.app_context():
+            for model, rows in by_model.items():
+                try:
+                    self._insert(model, rows)
+                    self.written += len(rows)
+                except Exception as e:
+                    self.db.session.rollback()
+                    print(f"⚠️  Audit batch of {len(rows)} {model.__tablename__} rows failed, retrying one by one: {str(e)}")
+                    self._write_each(model, rows)
+
+    def _write_each(self, model, rows):
+        for fields in rows:
+            try:
+                self._insert(model, [fields])
+                self.written += 1
+            except Exception as e:
+                self.db.session.rollback()
+                self.failed += 1
+                print(f"❌ Audit write failed ({model.__tablename__}): {str(e)}")
+
+    def _insert(self, model, rows):
+        self.db.session.execute(insert(model), rows)
+        self.db.session.commit()
+
+    def flush(self):
+        """Write every queued row now and block until done"""
+        if self.pid == os.getpid() and self.queue is not None:
+            self.queue.put(FLUSH)
+            self.queue.join()
+
+    def stats(self):
+        return {
+            'queued': self.queue.qsize() if self.pid == os.getpid() else 0,
+            'written': self.written,
+            'failed': self.failed
+        }
@@ -0,0 +1,87 @@
+"""
+Benchmark: ORM hydration vs plain-row read path for bulk listings
+Loads N internships into a throwaway SQLite database and compares
+Model.query.all() + to_dict() with fetch_dicts() (with_entities row tuples).
+
+Usage: python benchmarks/bench_listing.py [rows]
+"""
+
+import sys
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Use a throwaway database before the app reads DATABASE_URL
+DB_DIR = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db, Internship, fetch_dicts
+
+REPEATS = 5
+
+
+def seed(count):
+    """Bulk insert approved internships"""
+    now = datetime.utcnow()
+    db.session.execute(db.insert(Internship), [
+        {
+            'title': f'Software Engineering Intern {i}', 'company': 'Example Corp',
+            'description': 'Work on interesting problems with a great team. ' * 6,
+            'work_type': 'Remote', 'is_paid': True, 'stipend_min': 20000, 'stipend_max': 40000,
+            'duration': '3 months', 'location': 'Remote', 'category': 'Software Development',
+            'skills_required': 'Python, Flask, SQL, React', 'status': 'approved',
+            'application_deadline': now + timedelta(days=30), 'created_at': now, 'updated_at': now,
+            'views_count': 0, 'clicks_count': 0, 'applied_count': 0
+        }
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def orm_path():
+    internships = Internship.query.filter_by(status='approved').order_by(Internship.created_at.desc()).all()
+    return [i.to_dict() for i in internships]
+
+
+def row_path():
+    query = Internship.query.filter_by(status='approved').order_by(Internship.created_at.desc())
+    return fetch_dicts(query, Internship)
+
+
+def measure(label, fn):
+    """Best-of-N latency and peak allocation for one listing"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        db.session.remove()  # Start with an empty identity map like a fresh request
+        started = time.perf_counter()
+        rows = fn()
+        best = min(best, time.perf_counter() - started)
+
+    db.session.remove()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  {label:<28} {best * 1000:8.1f} ms  peak {peak / 1024 / 1024:7.1f} MB  ({len(rows):,} rows)")
+    return best, peak
+
+
+def run(count):
+    with app.app_context():
+        db.create_all()
+        seed(count)
+        print(f"🔬 Listing {count:,} internships (best of {REPEATS})\n")
+
+        orm_time, orm_peak = measure('ORM objects + to_dict()', orm_path)
+        row_time, row_peak = measure('with_entities row tuples', row_path)
+
+        assert orm_path() == row_path(), "read paths must produce identical payloads"
+        print(f"\n✅ Latency {orm_time / row_time:.1f}x faster, peak memory {orm_peak / row_peak:.1f}x lower")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,89 @@
+"""
+Benchmark: per-request cost of the Prometheus request metrics
+Times the metrics middleware around a stub WSGI app (minus the stub alone)
+plus the route-recording before_request hook, once with in-process values
+and once in multiprocess mode (PROMETHEUS_MULTIPROC_DIR, as under
+gunicorn.conf.py). The flush into the collectors runs on a background thread
+and is reported separately. Needs prometheus_client.
+
+Usage: python benchmarks/bench_metrics.py [requests]
+"""
+
+import sys
+import os
+import subprocess
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROUTES = ['/api/internships', '/api/courses', '/api/events', '/api/trending']
+
+
+def best_of(runs, requests, call):
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        for _ in range(requests):
+            call()
+        elapsed = (time.perf_counter() - started) / requests
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1_000_000
+
+
+def measure(requests):
+    from flask import Flask
+    from flask_sqlalchemy import SQLAlchemy
+
+    from metrics import Metrics, ROUTE_KEY
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    for route in ROUTES:
+        app.add_url_rule(route, route, lambda: 'ok')
+    metrics = Metrics(flush_seconds=3600)  # Flushed explicitly below
+    assert metrics.enabled, 'prometheus_client is not installed'
+    metrics.init_app(app, SQLAlchemy(app))
+    rules = list(app.url_map.iter_rules())
+
+    def stub_app(environ, start_response):
+        environ[ROUTE_KEY] = rules[0]
+        start_response('200 OK', [])
+        return [b'ok']
+
+    timed_app = metrics.middleware(stub_app)
+    environ = {'REQUEST_METHOD': 'GET'}
+    start_response = lambda status, headers, exc_info=None: None
+    stub = best_of(3, requests, lambda: stub_app(environ, start_response))
+    wrapped = best_of(3, requests, lambda: timed_app(environ, start_response))
+    with app.test_request_context(ROUTES[0]):
+        hook = best_of(3, requests, metrics._remember_route)
+
+    started = time.perf_counter()
+    metrics.flush()
+    flush_ms = (time.perf_counter() - started) * 1000
+    return wrapped - stub + hook, flush_ms
+
+
+def run(requests):
+    print(f"🔬 {requests:,} requests, best of 3\n")
+    report('in-process values', requests, *measure(requests))
+
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=tempfile.mkdtemp())
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), str(requests), '--child'],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout.split()
+    report('multiprocess (mmap)', requests, float(output[0]), float(output[1]))
+
+
+def report(label, requests, per_request_us, flush_ms):
+    print(f"  {label:<22} {per_request_us:6.2f} µs/request   "
+          f"(background flush of the {requests * 3:,} recorded requests: {flush_ms:.2f} ms)")
+
+
+if __name__ == '__main__':
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    if '--child' in sys.argv:
+        print(*measure(requests))
+    else:
+        run(requests)
@@ -0,0 +1,114 @@
+"""
+Micro-benchmark: serializing a 10k-row internship listing
+Compares the previous path (hand-written to_dict + stdlib json via jsonify)
+with generated serializers + the orjson provider.
+
+Usage: python benchmarks/bench_serialization.py [rows]
+"""
+
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import app, Internship
+from serialization import OrjsonProvider, compile_serializer, orjson
+
+REPEATS = 5
+
+
+def legacy_to_dict(self):
+    """The hand-written Internship.to_dict() this benchmark replaces"""
+    return {
+        'id': self.id,
+        'title': self.title,
+        'company': self.company,
+        'company_logo': self.company_logo,
+        'company_description': self.company_description,
+        'description': self.description,
+        'work_type': self.work_type,
+        'internship_type': self.internship_type,
+        'is_paid': self.is_paid,
+        'stipend_type': self.stipend_type,
+        'stipend_min': self.stipend_min,
+        'stipend_max': self.stipend_max,
+        'duration': self.duration,
+        'location': self.location,
+        'category': self.category,
+        'skills_required': self.skills_required,
+        'experience_level': self.experience_level,
+        'tools_technologies': self.tools_technologies,
+        'eligibility': self.eligibility,
+        'responsibilities': self.responsibilities,
+        'what_you_will_learn': self.what_you_will_learn,
+        'application_deadline': self.application_deadline.isoformat() if self.application_deadline else None,
+        'apply_link': self.apply_link,
+        'apply_through_platform': self.apply_through_platform,
+        'views_count': self.views_count,
+        'clicks_count': self.clicks_count,
+        'applied_count': self.applied_count,
+        'status': self.status,
+        'is_active': self.is_active,
+        'submitted_by': self.submitted_by,
+        'created_at': self.created_at.isoformat(),
+        'updated_at': self.updated_at.isoformat()
+    }
+
+
+def make_rows(count):
+    """Transient Internship objects with realistic field sizes"""
+    now = datetime.utcnow()
+    return [
+        Internship(
+            id=i, title=f'Software Engineering Intern {i}', company='Example Corp',
+            company_logo='https://example.com/logo.png', company_description='A company ' * 10,
+            description='Work on interesting problems with a great team. ' * 6,
+            work_type='Remote', internship_type='Full-time', is_paid=True, stipend_type='Fixed',
+            stipend_min=20000, stipend_max=40000, duration='3 months', location='Remote',
+            category='Software Development', skills_required='Python, Flask, SQL, React',
+            experience_level='Beginner', tools_technologies='Git, Docker',
+            eligibility='Students', responsibilities='Build features, write tests',
+            what_you_will_learn='Backend development', application_deadline=now + timedelta(days=30),
+            apply_link='https://example.com/apply', apply_through_platform=True,
+            views_count=i, clicks_count=0, applied_count=0, status='approved', is_active=True,
+            submitted_by=1, created_at=now, updated_at=now
+        )
+        for i in range(count)
+    ]
+
+
+def measure(label, rows, to_dict, provider):
+    """Best-of-N rows/sec for serializing rows and building the response"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        response = provider.response({'success': True, 'internships': [to_dict(row) for row in rows]})
+        best = min(best, time.perf_counter() - started)
+    size = len(response.get_data())
+    print(f"  {label:<40} {len(rows) / best:>12,.0f} rows/s  {best * 1000:8.1f} ms  {size / 1024:8.0f} KB")
+    return best
+
+
+def run(count):
+    with app.app_context():
+        rows = make_rows(count)
+        print(f"🔬 Serializing {count:,} internships (best of {REPEATS})\n")
+
+        legacy = measure('hand-written to_dict + stdlib json', rows, legacy_to_dict, DefaultJSONProvider(app))
+        generated = compile_serializer(Internship)
+        measure('generated to_dict + stdlib json', rows, generated, DefaultJSONProvider(app))
+
+        if orjson is None:
+            print("\n⚠️  orjson is not installed; skipping the orjson provider")
+            return
+
+        native = compile_serializer(Internship, native_datetimes=True)
+        fast = measure('generated to_dict + orjson (native dt)', rows, native, OrjsonProvider(app))
+        print(f"\n✅ Speed-up: {legacy / fast:.1f}x")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,136 @@
+"""
+Benchmark: write contention on the main SQLite database across processes
+Several forked workers commit view-count increments (read the row, write it
+back, commit - the detail endpoints' pattern) while others run catalogue
+listing queries, first with SQLite's defaults (rollback journal) and then
+with the db_config profile (WAL, synchronous=NORMAL, busy_timeout, caches).
+
+Usage: python benchmarks/bench_sqlite_contention.py [seconds] [writers] [readers]
+"""
+
+import sys
+import os
+import time
+import tempfile
+import multiprocessing
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from db_config import apply_pragmas, sqlite_pragmas
+
+ITEMS = 1000
+
+
+def make_engine(path, tuned):
+    engine = create_engine(f'sqlite:///{path}')
+    if tuned:
+        apply_pragmas(engine, sqlite_pragmas())
+    return engine
+
+
+def setup(path, tuned):
+    engine = make_engine(path, tuned)
+    with engine.begin() as connection:
+        connection.execute(text(
+            'CREATE TABLE items (id INTEGER PRIMARY KEY, title TEXT, description TEXT, views_count INTEGER)'
+        ))
+        connection.execute(
+            text('INSERT INTO items (title, description, views_count) VALUES (:title, :description, 0)'),
+            [{'title': f'Item {i}', 'description': 'x' * 500} for i in range(ITEMS)]
+        )
+    engine.dispose()
+
+
+def writer(path, tuned, seconds, seed, results):
+    engine = make_engine(path, tuned)
+    committed = locked = 0
+    latencies = []
+    deadline = time.monotonic() + seconds
+    item_id = seed
+    while time.monotonic() < deadline:
+        item_id = (item_id * 7919 + 1) % ITEMS + 1
+        started = time.perf_counter()
+        try:
+            with engine.begin() as connection:
+                views = connection.execute(
+                    text('SELECT views_count FROM items WHERE id = :id'), {'id': item_id}
+                ).scalar()
+                connection.execute(
+                    text('UPDATE items SET views_count = :views WHERE id = :id'),
+                    {'views': views + 1, 'id': item_id}
+                )
+            committed += 1
+        except OperationalError as e:
+            if 'locked' not in str(e):
+                raise
+            locked += 1
+        latencies.append(time.perf_counter() - started)
+    results.put(('write', committed, locked, latencies))
+
+
+def reader(path, tuned, seconds, results):
+    engine = make_engine(path, tuned)
+    queries = locked = 0
+    latencies = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            with engine.connect() as connection:
+                connection.execute(text(
+                    'SELECT id, title, description, views_count FROM items ORDER BY views_count DESC LIMIT 50'
+                )).all()
+            queries += 1
+        except OperationalError as e:
+            if 'locked' not in str(e):
+                raise
+            locked += 1
+        latencies.append(time.perf_counter() - started)
+    results.put(('read', queries, locked, latencies))
+
+
+def p99(latencies):
+    latencies.sort()
+    return latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0
+
+
+def run_profile(label, tuned, seconds, writers, readers):
+    path = os.path.join(tempfile.mkdtemp(), 'contention.db')
+    setup(path, tuned)
+
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    processes = [context.Process(target=writer, args=(path, tuned, seconds, seed, results)) for seed in range(writers)]
+    processes += [context.Process(target=reader, args=(path, tuned, seconds, results)) for _ in range(readers)]
+    for process in processes:
+        process.start()
+    totals = {'write': [0, 0, []], 'read': [0, 0, []]}
+    for _ in processes:
+        kind, done, locked, latencies = results.get()
+        totals[kind][0] += done
+        totals[kind][1] += locked
+        totals[kind][2].extend(latencies)
+    for process in processes:
+        process.join()
+
+    writes, write_errors, write_latencies = totals['write']
+    reads, read_errors, read_latencies = totals['read']
+    print(f"  {label:<22} {writes / seconds:8.0f} commits/s  p99 {p99(write_latencies):7.1f} ms  "
+          f"locked {write_errors:4}   |  {reads / seconds:8.0f} listings/s  p99 {p99(read_latencies):7.1f} ms  "
+          f"locked {read_errors}")
+
+
+def run(seconds, writers, readers):
+    print(f"🔬 {writers} writer + {readers} reader processes for {seconds}s each\n")
+    run_profile('defaults (journal)', False, seconds, writers, readers)
+    run_profile('db_config (WAL)', True, seconds, writers, readers)
+
+
+if __name__ == '__main__':
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    )
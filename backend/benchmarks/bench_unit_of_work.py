@@ -0,0 +1,141 @@
+"""
+Benchmark: commits and fsyncs per request with one transaction per request
+Part 1 drives the write endpoints through the app on a scratch database and
+counts the commits each request makes on the request thread, plus the
+background commits that follow (audit writer notification batches and
+similar-items rebuilds, amortized).
+Part 2 prices a commit: the same rows written with one commit per request vs
+the two commits per request the handlers used to make (item, then its
+notifications), under synchronous=FULL (one WAL fsync per commit) and
+synchronous=NORMAL (fsync only at checkpoints).
+
+Usage: python benchmarks/bench_unit_of_work.py [requests]
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCRATCH = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(SCRATCH, 'uow.db')}"
+os.environ['EVENT_STORE_DIR'] = os.path.join(SCRATCH, 'events')
+os.environ['RATELIMIT_ENABLED'] = 'False'
+os.environ['LOGIN_GUARD_STORAGE_URL'] = 'memory://'
+
+from sqlalchemy import create_engine, event, text
+
+from db_config import apply_pragmas, sqlite_pragmas
+
+ADMINS = 3
+
+
+def endpoint_commits(requests):
+    from app import app, db, audit_log, similar_items_rebuilds, create_tables, User, Course
+
+    create_tables()
+    client = app.test_client()
+    response = client.post('/api/auth/login', json={'email': 'admin@hackifm.com', 'password': 'Admin@123'})
+    headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    commits = {'request': 0, 'writer': 0}
+
+    def on_commit(connection):
+        # The test client runs requests on this thread; the audit writer has its own
+        commits['request' if threading.current_thread() is threading.main_thread() else 'writer'] += 1
+
+    with app.app_context():
+        event.listen(db.engine, 'commit', on_commit)
+        course = Course(title='Benchmark course', status='approved')
+        db.session.add(course)
+        db.session.commit()
+        course_id = course.id
+        admins = User.query.filter_by(role='admin').count()
+
+    def measure(label, call):
+        audit_log.flush()
+        similar_items_rebuilds.flush()
+        commits['request'] = commits['writer'] = 0
+        for index in range(requests):
+            response = call(index)
+            assert response.status_code < 400, response.get_json()
+        audit_log.flush()
+        similar_items_rebuilds.flush()
+        print(f"  {label:<26} {commits['request'] / requests:5.2f} commits/request   "
+              f"+ {commits['writer'] / requests:5.3f} background commits/request")
+
+    print(f"🔬 Part 1: {requests} requests per endpoint ({admins} admin(s) notified per submission)\n")
+    item_ids = []
+
+    def submit(index):
+        response = client.post('/api/internships', json={'title': f'Internship {index}', 'company': 'Acme', 'user_id': 1})
+        item_ids.append(response.get_json()['internship']['id'])
+        return response
+
+    measure('submit internship', submit)
+    measure('approve submission', lambda index: client.post(
+        f'/api/admin/content/internship/{item_ids[index]}/approve', headers=headers, json={'action': 'approved'}
+    ))
+    measure('apply to internship', lambda index: client.post(
+        f'/api/internships/{item_ids[index]}/apply', headers=headers
+    ))
+    measure('enroll in course', lambda index: client.post(f'/api/courses/{course_id}/enroll', headers=headers))
+    measure('report internship', lambda index: client.post(
+        f'/api/internships/{item_ids[index]}/report', headers=headers, json={'reason': 'spam'}
+    ))
+
+
+def commit_cost(requests, synchronous):
+    path = os.path.join(SCRATCH, f'cost-{synchronous}.db')
+    engine = create_engine(f'sqlite:///{path}')
+    apply_pragmas(engine, [pragma for pragma in sqlite_pragmas() if 'synchronous' not in pragma]
+                  + [f'PRAGMA synchronous={synchronous}'])
+    with engine.begin() as connection:
+        connection.execute(text('CREATE TABLE items (id INTEGER PRIMARY KEY, title TEXT)'))
+        connection.execute(text('CREATE TABLE notifications (id INTEGER PRIMARY KEY, user_id INTEGER, message TEXT)'))
+
+    def submit(connection, index):
+        connection.execute(text('INSERT INTO items (title) VALUES (:title)'), {'title': f'Item {index}'})
+
+    def notify(connection, index):
+        connection.execute(
+            text('INSERT INTO notifications (user_id, message) VALUES (:user_id, :message)'),
+            [{'user_id': admin, 'message': f'Item {index} submitted'} for admin in range(ADMINS)]
+        )
+
+    results = {}
+    with engine.connect() as connection:
+        started = time.perf_counter()
+        for index in range(requests):
+            submit(connection, index)
+            connection.commit()
+            notify(connection, index)
+            connection.commit()
+        results['two commits'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for index in range(requests):
+            submit(connection, index)
+            notify(connection, index)
+            connection.commit()
+        results['one commit'] = time.perf_counter() - started
+    engine.dispose()
+    return results
+
+
+def run(requests):
+    endpoint_commits(requests)
+
+    print(f"\n🔬 Part 2: {requests} submissions ({ADMINS} notifications each), WAL mode\n")
+    for synchronous, fsyncs_per_commit in (('FULL', 1), ('NORMAL', 0)):
+        results = commit_cost(requests, synchronous)
+        for label, commits in (('two commits', 2), ('one commit', 1)):
+            elapsed = results[label]
+            print(f"  synchronous={synchronous:<6} {label:<12} {requests / elapsed:8.0f} req/s   "
+                  f"{elapsed / requests * 1000:6.2f} ms/request   {commits * fsyncs_per_commit} fsyncs/request")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
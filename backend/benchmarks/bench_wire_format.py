@@ -0,0 +1,86 @@
+"""
+Benchmark: response size and encode/decode time per wire format
+Compares the jsonify() output (stdlib and orjson) with MessagePack and the
+null-omitting compact mode on an N-row internship listing.
+
+Usage: python benchmarks/bench_wire_format.py [rows]
+"""
+
+import sys
+import os
+import json
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from serialization import orjson, msgpack, pack, strip_nulls
+
+REPEATS = 5
+
+
+def make_payload(count):
+    """Listing payload shaped like GET /api/internships (half the rows sparsely filled)"""
+    now = datetime.utcnow().isoformat()
+    rows = []
+    for i in range(count):
+        full = i % 2 == 0
+        rows.append({
+            'id': i, 'title': f'Software Engineering Intern {i}', 'company': 'Example Corp',
+            'company_logo': 'https://example.com/logo.png' if full else None,
+            'company_description': 'A company building things.' if full else None,
+            'description': 'Work on interesting problems with a great team. ' * 4,
+            'work_type': 'Remote', 'internship_type': 'Full-time' if full else None,
+            'is_paid': True, 'stipend_type': 'Fixed' if full else None,
+            'stipend_min': 20000, 'stipend_max': 40000, 'duration': '3 months',
+            'location': 'Remote', 'category': 'Software Development',
+            'skills_required': 'Python, Flask, SQL', 'experience_level': 'Beginner' if full else None,
+            'tools_technologies': 'Git, Docker' if full else None,
+            'eligibility': 'Students' if full else None,
+            'responsibilities': 'Build features' if full else None,
+            'what_you_will_learn': 'Backend development' if full else None,
+            'application_deadline': now if full else None,
+            'apply_link': 'https://example.com/apply' if full else None,
+            'apply_through_platform': True, 'views_count': i, 'clicks_count': 0, 'applied_count': 0,
+            'status': 'approved', 'is_active': True, 'submitted_by': 1 if full else None,
+            'created_at': now, 'updated_at': now
+        })
+    return {'success': True, 'internships': rows}
+
+
+def best_of(fn):
+    best = float('inf')
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def report(label, encode, decode):
+    encode_time, body = best_of(encode)
+    decode_time, _ = best_of(lambda: decode(body))
+    print(f"  {label:<26} {len(body) / 1024:9.0f} KB  encode {encode_time * 1000:7.1f} ms  decode {decode_time * 1000:7.1f} ms")
+    return len(body)
+
+
+def run(count):
+    payload = make_payload(count)
+    compact = strip_nulls(payload)
+    print(f"🔬 Encoding a {count:,}-row internship listing (best of {REPEATS})\n")
+
+    baseline = report('json (stdlib, jsonify)', lambda: json.dumps(payload, separators=(',', ':')).encode(), json.loads)
+    if orjson is not None:
+        report('json (orjson)', lambda: orjson.dumps(payload), orjson.loads)
+        report('json compact (orjson)', lambda: orjson.dumps(strip_nulls(payload)), orjson.loads)
+
+    if msgpack is None:
+        print("\n⚠️  msgpack is not installed; skipping MessagePack")
+        return
+
+    report('msgpack', lambda: pack(payload), msgpack.unpackb)
+    smallest = report('msgpack compact', lambda: pack(strip_nulls(payload)), msgpack.unpackb)
+    print(f"\n✅ msgpack compact is {smallest / baseline:.0%} of the jsonify body ({len(compact['internships']):,} rows)")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,132 @@
+"""
+Load test: Werkzeug development server vs serve.py (Gunicorn, preforked)
+Starts each server on a scratch database, drives keep-alive requests at
+/api/health, /api/internships and /api/trending from concurrent clients, and
+reports throughput, latency percentiles and errors. Halfway through each
+Gunicorn run the master gets SIGHUP (graceful reload), so any request lost
+while old workers drain shows up as an error.
+
+Usage: python benchmarks/load_test.py [requests] [concurrency] [worker classes...]
+       (worker classes: sync gthread gevent; default: gthread)
+"""
+
+import sys
+import os
+import http.client
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATHS = ['/api/health', '/api/internships', '/api/trending']
+PORT = 5077
+
+
+def start_server(label, worker_class, scratch):
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(scratch, 'load.db')}",
+        EVENT_STORE_DIR=os.path.join(scratch, 'events'),
+        RATELIMIT_ENABLED='False',
+        BIND=f'127.0.0.1:{PORT}'
+    )
+    if worker_class is None:
+        command = [sys.executable, '-c', (
+            'from app import app, create_tables; create_tables(); '
+            f'app.run(host="127.0.0.1", port={PORT}, threaded=False)'
+        )]
+    else:
+        command = [sys.executable, 'serve.py', worker_class]
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', PORT, timeout=2)
+            connection.request('GET', '/api/health')
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f'{label} did not start')
+
+
+def fetch(connection, path):
+    connection.request('GET', path)
+    response = connection.getresponse()
+    response.read()
+    return response
+
+
+def client(requests, latencies, errors, retries):
+    connection = None
+    for index in range(requests):
+        path = PATHS[index % len(PATHS)]
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = http.client.HTTPConnection('127.0.0.1', PORT, timeout=30)
+            try:
+                response = fetch(connection, path)
+            except http.client.RemoteDisconnected:
+                # An idle keep-alive connection closed by a draining worker: like
+                # any HTTP client, retry the idempotent request on a new connection
+                retries.append(path)
+                connection = http.client.HTTPConnection('127.0.0.1', PORT, timeout=30)
+                response = fetch(connection, path)
+            if response.status != 200:
+                errors.append(response.status)
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            connection = None
+        latencies.append(time.perf_counter() - started)
+
+
+def run_load(label, worker_class, total, concurrency):
+    scratch = tempfile.mkdtemp()
+    server = start_server(label, worker_class, scratch)
+    latencies, errors, retries = [], [], []
+    try:
+        if worker_class is not None:
+            # Graceful reload halfway through: nothing in flight may fail
+            threading.Timer(1.0, server.send_signal, args=(signal.SIGHUP,)).start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            for _ in range(concurrency):
+                pool.submit(client, total // concurrency, latencies, errors, retries)
+        elapsed = time.perf_counter() - started
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    print(f"  {label:<20} {len(latencies) / elapsed:8.0f} req/s   p50 {percentile(0.50):6.1f} ms   "
+          f"p99 {percentile(0.99):7.1f} ms   errors {len(errors)}   keep-alive retries {len(retries)}")
+    return errors
+
+
+def run(total, concurrency, worker_classes):
+    print(f"🔬 {total:,} requests from {concurrency} keep-alive clients\n")
+    run_load('werkzeug dev server', None, total, concurrency)
+    failures = 0
+    for worker_class in worker_classes:
+        failures += len(run_load(f'gunicorn {worker_class} + HUP', worker_class, total, concurrency))
+    assert failures == 0, 'requests failed during graceful reload'
+    print("\n✅ No failed requests across graceful reloads")
+
+
+if __name__ == '__main__':
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 3000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 16,
+        sys.argv[3:] or ['gthread']
+    )
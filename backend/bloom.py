@@ -0,0 +1,88 @@
+"""
+Bloom filter for fast negative membership checks
+A fixed bit array probed at k positions per item: "not present" answers are
+always right, "present" answers are wrong with probability ~error_rate, so
+callers confirm positives against an exact structure.
+"""
+
+import hashlib
+import math
+
+
+def _positions(item, hashes, bits):
+    """k bit positions by double hashing one 128-bit digest"""
+    digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+    first = int.from_bytes(digest[:8], 'little')
+    second = int.from_bytes(digest[8:], 'little') | 1
+    return [(first + i * second) % bits for i in range(hashes)]
+
+
+class BloomFilter:
+    """Bit-array Bloom filter sized for `capacity` items at `error_rate`"""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.array = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def add(self, item):
+        for position in _positions(item, self.hashes, self.bits):
+            self.array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        array = self.array
+        return all(array[position >> 3] & (1 << (position & 7)) for position in _positions(item, self.hashes, self.bits))
+
+    def __len__(self):
+        return self.count
+
+
+class CountingBloomFilter:
+    """
+    Bloom filter with an 8-bit counter per slot, so items can also be removed
+
+    Counters saturate at 255 and then never decrement (the slot stays set),
+    which can only add false positives.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.slots = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.slots / capacity * math.log(2)))
+        self.counters = bytearray(self.slots)
+        self.count = 0
+
+    def add(self, item):
+        counters = self.counters
+        for position in _positions(item, self.hashes, self.slots):
+            if counters[position] < 255:
+                counters[position] += 1
+        self.count += 1
+
+    def remove(self, item):
+        """Remove an item previously added (removing anything else corrupts the filter)"""
+        counters = self.counters
+        for position in _positions(item, self.hashes, self.slots):
+            if 0 < counters[position] < 255:
+                counters[position] -= 1
+        self.count = max(0, self.count - 1)
+
+    def __contains__(self, item):
+        counters = self.counters
+        return all(counters[position] for position in _positions(item, self.hashes, self.slots))
+
+    def __len__(self):
+        return self.count
+
+    def false_positive_rate(self):
+        """Expected false positive rate at the current fill"""
+        return (1 - math.exp(-self.hashes * self.count / self.slots)) ** self.hashes
+
+    @property
+    def memory_bytes(self):
+        return len(self.counters)
@@ -0,0 +1,87 @@
+"""
+Response compression with Accept-Encoding negotiation
+Brotli is preferred when the optional `brotli` package is installed, gzip
+otherwise. Bodies served from the response cache are compressed once per
+cache entry and reused until the entry is refreshed.
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:  # Optional dependency, gzip only
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/msgpack',
+    'application/javascript',
+    'text/html',
+    'text/plain',
+    'text/css'
+}
+
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encodings):
+    """Pick the best supported content-coding from a parsed Accept-Encoding header"""
+    best, best_quality = None, 0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body, encoding, gzip_level=6, brotli_quality=5):
+    """Compress a body with the given content-coding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+def compress_response(response, accept_encodings, config, variants=None, variant_key=None):
+    """
+    Compress a Flask response in place when the client accepts it
+
+    variants: optional dict owned by a cache entry; compressed bodies are
+    stored there under (variant_key, encoding) and reused on later requests.
+    """
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES or response.direct_passthrough:
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    if (
+        'Content-Encoding' in response.headers
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+    ):
+        return response
+
+    encoding = negotiate_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if len(body) < config['COMPRESSION_MIN_SIZE']:
+        return response
+
+    compressed = None
+    if variants is not None:
+        compressed = variants.get((variant_key, encoding))
+
+    if compressed is None:
+        compressed = compress(
+            body,
+            encoding,
+            gzip_level=config['COMPRESSION_GZIP_LEVEL'],
+            brotli_quality=config['COMPRESSION_BROTLI_QUALITY']
+        )
+        if variants is not None:
+            variants[(variant_key, encoding)] = compressed
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,30 @@
+"""
+Batch job: precompute "More like this" neighbour lists
+Run after bulk imports or periodically (e.g. nightly cron) to rebuild similar_items
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db, rebuild_similar_items, SIMILARITY_FIELDS
+
+
+def compute_similar_items():
+    """Rebuild neighbour lists for every content type"""
+    with app.app_context():
+        db.create_all()
+        print("🔄 Computing similar items...")
+        
+        for content_type in SIMILARITY_FIELDS:
+            started = time.perf_counter()
+            count = rebuild_similar_items(content_type)
+            elapsed = time.perf_counter() - started
+            print(f"  ✅ {content_type}: {count} items in {elapsed:.2f}s")
+        
+        print("\n✅ Similar items computed successfully!")
+
+
+if __name__ == '__main__':
+    compute_similar_items()
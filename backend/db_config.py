@@ -0,0 +1,74 @@
+"""
+Database engine configuration: connection pool options (every database) and
+the SQLite performance profile for the SQLite engines (primary and replica).
+The profile is applied to every new connection, so pooled connections and
+connections opened by forked workers all get it:
+
+- journal_mode=WAL: readers never block the writer and vice versa
+- synchronous=NORMAL: fsync at checkpoints instead of every commit (safe in WAL)
+- busy_timeout: wait for the write lock instead of failing with
+  "database is locked"
+- cache_size / mmap_size / temp_store: keep hot pages and temp tables in memory
+
+Other databases (e.g. PostgreSQL) only get the pool options, and only they
+get a fixed pool size.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+def sqlite_pragmas(busy_timeout_ms=5000, cache_size_kb=65536, mmap_size_mb=256):
+    """PRAGMA statements in the order they are applied"""
+    return [
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f'PRAGMA busy_timeout={int(busy_timeout_ms)}',
+        f'PRAGMA cache_size=-{int(cache_size_kb)}',  # Negative = KiB rather than pages
+        f'PRAGMA mmap_size={int(mmap_size_mb) * 1024 * 1024}',
+        'PRAGMA temp_store=MEMORY'
+    ]
+
+
+def pool_options(url, pool_size=5, max_overflow=10, pool_timeout=30, pool_recycle=1800, pre_ping=True):
+    """
+    create_engine() pool arguments for url (SQLALCHEMY_ENGINE_OPTIONS / bind options)
+
+    pool_recycle replaces connections older than that many seconds (before a
+    server or proxy drops them); pre_ping tests each connection on checkout
+    and transparently reconnects a dead one. SQLite gets no pool_size /
+    max_overflow / pool_timeout: its :memory: pools (SingletonThreadPool /
+    StaticPool) reject them.
+    """
+    options = {
+        'pool_recycle': pool_recycle,
+        'pool_pre_ping': pre_ping
+    }
+    if make_url(url).get_backend_name() != 'sqlite':
+        options.update(pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout)
+    return options
+
+
+def apply_pragmas(engine, pragmas):
+    """Run pragmas on every new DBAPI connection of engine"""
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    event.listen(engine, 'connect', on_connect)
+
+
+def configure_engine(app, db):
+    """Apply the SQLite profile to the app's SQLite engines (others are skipped)"""
+    pragmas = sqlite_pragmas(
+        app.config.get('SQLITE_BUSY_TIMEOUT_MS', 5000),
+        app.config.get('SQLITE_CACHE_SIZE_KB', 65536),
+        app.config.get('SQLITE_MMAP_SIZE_MB', 256)
+    )
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        if engine.dialect.name == 'sqlite':
+            apply_pragmas(engine, pragmas)
@@ -0,0 +1,150 @@
+"""
+Read-replica routing for the SQLAlchemy session
+Views marked with @router.replica_reads send their SELECTs, for GET/HEAD
+requests, to the 'replica' bind (DATABASE_REPLICA_URL); flushes, DML and
+everything else go to the primary. A request falls back to the primary when:
+
+- the caller wrote something within the last `sticky_seconds`
+  (read-your-writes; tracked per user in a shared ephemeral store)
+- the replica lags by more than `max_lag` seconds, or could not be reached,
+  at the last lag check (every `lag_check_seconds`)
+
+With no replica configured every query goes to the primary.
+"""
+
+import threading
+import time
+from functools import wraps
+
+from flask import g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+
+REPLICA_BIND = 'replica'
+READ_METHODS = ('GET', 'HEAD')
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+# Seconds the replica is behind; 0 once it has replayed everything it received
+POSTGRES_LAG_SQL = '''
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+'''
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends plain SELECTs to the replica when the request allows it"""
+
+    def __init__(self, db, router=None, **kwargs):
+        super().__init__(db, **kwargs)
+        self.router = router
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and self.router is not None
+            and not self._flushing
+            and getattr(clause, 'is_select', False)
+        ):
+            replica = self.router.replica_for_request()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReplicaRouter:
+    """Decides per request whether reads may use the replica"""
+
+    def __init__(self, sticky_seconds=5, max_lag=2.0, lag_check_seconds=5):
+        self.sticky_seconds = sticky_seconds
+        self.max_lag = max_lag
+        self.lag_check_seconds = lag_check_seconds
+        self.engine = None
+        self.store = None
+        self.lag = None  # None = unknown or unreachable
+        self.checked_at = None
+        self.lock = threading.Lock()
+        self.counts = {'replica': 0, 'primary_sticky': 0, 'primary_lagging': 0}
+
+    def init_app(self, app, db, store):
+        """store: ephemeral store holding each user's stickiness window"""
+        with app.app_context():
+            self.engine = db.engines.get(REPLICA_BIND)
+        self.store = store
+        app.after_request(self._after_request)
+
+    # -------------------- Replica health --------------------
+
+    def _measure_lag(self, engine):
+        if engine.dialect.name != 'postgresql':
+            return 0.0  # Local SQLite/other replicas: no replication to measure
+        with engine.connect() as connection:
+            return float(connection.execute(text(POSTGRES_LAG_SQL)).scalar() or 0)
+
+    def replica_healthy(self):
+        """Whether the last lag check found the replica reachable and within max_lag"""
+        engine = self.engine
+        if engine is None:
+            return False
+        now = time.monotonic()
+        if self.checked_at is None or now - self.checked_at >= self.lag_check_seconds:
+            if self.lock.acquire(blocking=self.checked_at is None):
+                try:
+                    try:
+                        self.lag = self._measure_lag(engine)
+                    except Exception as e:
+                        self.lag = None
+                        print(f"⚠️  Replica lag check failed, reading from primary: {str(e)}")
+                    self.checked_at = time.monotonic()
+                finally:
+                    self.lock.release()
+        return self.lag is not None and self.lag <= self.max_lag
+
+    # -------------------- Per-request routing --------------------
+
+    def _user_id(self):
+        try:
+            verify_jwt_in_request(optional=True)
+            return get_jwt_identity()
+        except Exception:
+            return None  # Invalid tokens are rejected by the view itself
+
+    def replica_reads(self, view):
+        """Let a read-only view's GET/HEAD queries use the replica"""
+        @wraps(view)
+        def decorated(*args, **kwargs):
+            if request.method in READ_METHODS and self.engine is not None:
+                g.replica_engine = self._choose()
+            return view(*args, **kwargs)
+        return decorated
+
+    def _choose(self):
+        user_id = self._user_id()
+        if user_id is not None and self.store.get(f'replica_sticky:{user_id}'):
+            self.counts['primary_sticky'] += 1
+            return None
+        if not self.replica_healthy():
+            self.counts['primary_lagging'] += 1
+            return None
+        self.counts['replica'] += 1
+        return self.engine
+
+    def replica_for_request(self):
+        return g.get('replica_engine') if has_request_context() else None
+
+    def _after_request(self, response):
+        # A successful write pins the user's reads to the primary for a while
+        if request.method in WRITE_METHODS and response.status_code < 400 and self.engine is not None:
+            user_id = self._user_id()
+            if user_id is not None:
+                self.store.set(f'replica_sticky:{user_id}', True, self.sticky_seconds)
+        return response
+
+    def stats(self):
+        return {
+            'configured': self.engine is not None,
+            'lag_seconds': self.lag,
+            **self.counts
+        }
@@ -0,0 +1,118 @@
+"""
+In-memory filter of registered email addresses for the signup funnel
+A counting Bloom filter answers "definitely not registered" without a query;
+"maybe registered" is confirmed against the database. Each worker builds the
+filter from a scan of the users email index, adds users it creates at once,
+pulls users created by other workers (ids above the last one seen) at most
+once per `sync_seconds`, and rebuilds from scratch every `rebuild_seconds` to
+drop deleted addresses and resize.
+"""
+
+import threading
+import time
+
+from bloom import CountingBloomFilter
+
+MIN_CAPACITY = 1024
+
+
+class EmailFilter:
+    """
+    Registered-email filter kept in sync with the users table
+
+    load_all() returns (max_id, emails); load_since(last_id) returns
+    [(id, email)] for users created after last_id.
+    """
+
+    def __init__(self, load_all, load_since, sync_seconds=1.0, rebuild_seconds=3600, error_rate=0.01):
+        self.load_all = load_all
+        self.load_since = load_since
+        self.sync_seconds = sync_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self.error_rate = error_rate
+        self.bloom = None
+        self.last_id = 0
+        self.local_ids = set()  # Added by this worker, skipped by the next sync
+        self.synced_at = self.built_at = None
+        self.lock = threading.Lock()
+        self.lookups = self.definite_misses = self.false_positives = self.rebuilds = 0
+
+    def rebuild(self):
+        """Build a fresh filter from every registered email"""
+        max_id, emails = self.load_all()
+        emails = list(emails)
+        bloom = CountingBloomFilter(max(MIN_CAPACITY, len(emails) * 2), self.error_rate)
+        for email in emails:
+            bloom.add(email)
+        with self.lock:
+            self.bloom, self.last_id = bloom, max_id
+            self.local_ids.clear()
+            self.synced_at = self.built_at = time.monotonic()
+            self.rebuilds += 1
+
+    def _sync(self):
+        rows = self.load_since(self.last_id)
+        with self.lock:
+            for user_id, email in rows:
+                if user_id in self.local_ids:
+                    self.local_ids.discard(user_id)
+                else:
+                    self.bloom.add(email)
+                self.last_id = max(self.last_id, user_id)
+            self.synced_at = time.monotonic()
+        if len(self.bloom) > self.bloom.capacity:
+            self.rebuild()
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self.bloom is None or now - self.built_at >= self.rebuild_seconds:
+            self.rebuild()
+        elif now - self.synced_at >= self.sync_seconds:
+            self._sync()
+
+    def add(self, user_id, email):
+        """Record a user created by this worker"""
+        with self.lock:
+            if self.bloom is not None and user_id > self.last_id:
+                self.bloom.add(email)
+                self.local_ids.add(user_id)
+
+    def remove(self, email):
+        """Record a deleted user"""
+        with self.lock:
+            if self.bloom is not None and email in self.bloom:
+                self.bloom.remove(email)
+
+    def exists(self, email, lookup):
+        """
+        Whether email is registered
+
+        Definite misses return False without calling lookup(email); possible
+        hits are confirmed by it.
+        """
+        self._refresh()
+        self.lookups += 1
+        if email not in self.bloom:
+            self.definite_misses += 1
+            return False
+        if lookup(email):
+            return True
+        self.false_positives += 1
+        return False
+
+    def stats(self):
+        bloom = self.bloom
+        negatives = self.definite_misses + self.false_positives
+        return {
+            'emails': len(bloom) if bloom else 0,
+            'capacity': bloom.capacity if bloom else 0,
+            'hashes': bloom.hashes if bloom else 0,
+            'memory_bytes': bloom.memory_bytes if bloom else 0,
+            'expected_false_positive_rate': round(bloom.false_positive_rate(), 6) if bloom else 0,
+            'lookups': self.lookups,
+            'definite_misses': self.definite_misses,
+            'false_positives': self.false_positives,
+            'observed_false_positive_rate': round(self.false_positives / negatives, 6) if negatives else 0,
+            'database_lookups': self.lookups - self.definite_misses,
+            'rebuilds': self.rebuilds
+        }
@@ -0,0 +1,134 @@
+"""
+Ephemeral key-value store for short-lived auth state (OTPs, reset tokens)
+Every key carries a TTL and disappears on expiry, so nothing has to be cleaned
+up. Values are JSON-serializable. Two backends share one interface:
+- MemoryStore: this process only (single worker, tests)
+- SQLiteStore: a WAL-mode SQLite file shared by every worker on the host
+"""
+
+import json
+import threading
+import time
+
+from shared_sqlite import SharedSQLite
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS ephemeral (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+'''
+
+SWEEP_EVERY = 1000  # Writes between sweeps of expired keys
+
+
+class MemoryStore:
+    """TTL dictionary held in this process"""
+
+    def __init__(self):
+        self.items = {}  # {key: (value, expires_at)}
+        self.lock = threading.Lock()
+        self.writes = 0
+
+    def _live(self, key, now):
+        item = self.items.get(key)
+        if item is not None and item[1] <= now:
+            del self.items[key]
+            return None
+        return item
+
+    def _written(self, now):
+        self.writes += 1
+        if self.writes % SWEEP_EVERY == 0:
+            for key in [key for key, (_, expires_at) in self.items.items() if expires_at <= now]:
+                del self.items[key]
+
+    def set(self, key, value, ttl):
+        """Store value under key for ttl seconds"""
+        now = time.time()
+        with self.lock:
+            self._written(now)
+            self.items[key] = (value, now + ttl)
+
+    def get(self, key):
+        """Value stored under key, or None once expired"""
+        with self.lock:
+            item = self._live(key, time.time())
+            return item[0] if item else None
+
+    def delete(self, key):
+        """Remove key; returns True if it existed (so it can be consumed exactly once)"""
+        with self.lock:
+            return self._live(key, time.time()) is not None and self.items.pop(key, None) is not None
+
+    def incr(self, key, ttl):
+        """Atomically add 1 to a counter and return it (the TTL starts on first increment)"""
+        now = time.time()
+        with self.lock:
+            self._written(now)
+            item = self._live(key, now)
+            count, expires_at = (item[0] + 1, item[1]) if item else (1, now + ttl)
+            self.items[key] = (count, expires_at)
+            return count
+
+
+class SQLiteStore:
+    """TTL key-value table in a SQLite file shared by worker processes"""
+
+    def __init__(self, path):
+        self.db = SharedSQLite(path, SCHEMA)
+        self.writes = 0
+
+    def _written(self, connection, now):
+        self.writes += 1
+        if self.writes % SWEEP_EVERY == 0:
+            connection.execute('DELETE FROM ephemeral WHERE expires_at <= ?', (now,))
+
+    def set(self, key, value, ttl):
+        """Store value under key for ttl seconds"""
+        now = time.time()
+        connection = self.db.connection()
+        self._written(connection, now)
+        connection.execute(
+            'INSERT OR REPLACE INTO ephemeral (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, json.dumps(value), now + ttl)
+        )
+
+    def get(self, key):
+        """Value stored under key, or None once expired"""
+        row = self.db.execute(
+            'SELECT value FROM ephemeral WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, key):
+        """Remove key; returns True if it existed (so it can be consumed exactly once)"""
+        return self.db.execute(
+            'DELETE FROM ephemeral WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).rowcount > 0
+
+    def incr(self, key, ttl):
+        """Atomically add 1 to a counter and return it (the TTL starts on first increment)"""
+        now = time.time()
+        connection = self.db.connection()
+        self._written(connection, now)
+        return int(connection.execute(
+            '''
+            INSERT INTO ephemeral (key, value, expires_at) VALUES (?, '1', ?)
+            ON CONFLICT (key) DO UPDATE SET
+                value = CASE WHEN expires_at <= ? THEN '1' ELSE CAST(CAST(value AS INTEGER) + 1 AS TEXT) END,
+                expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END
+            RETURNING value
+            ''',
+            (key, now + ttl, now, now)
+        ).fetchone()[0])
+
+
+def store_from_url(url):
+    """Build an ephemeral store from a URL: memory:// or sqlite:///path"""
+    if url.startswith('memory://'):
+        return MemoryStore()
+    if url.startswith('sqlite:///'):
+        return SQLiteStore(url[len('sqlite:///'):])
+    raise ValueError(f'Unsupported ephemeral storage: {url}')
@@ -0,0 +1,326 @@
+"""
+Time-partitioned event store for views and logins
+Events go to one SQLite file per UTC month (<root>/events-YYYY-MM.db), apart
+from the transactional database, so they never wait on its write lock.
+Reads scan partitions newest first and stop as soon as they have enough rows.
+
+Dropping old months (drop_before, run by purge_logs.py) must not pull files
+from under another worker's open connections:
+1. the oldest kept month is written to <root>/dropped-before; every worker
+   re-reads it at most every CHECK_SECONDS, then stops writing to older months
+   and closes its cached connections to them
+2. after waiting out that interval, each old partition's files (.db, -wal,
+   -shm) are renamed into <root>/dropped/, so no connection opens them again
+   and a later partition can never pair with a stale -wal/-shm
+3. tombstones are deleted by a later drop_before once TOMBSTONE_SECONDS
+   have passed; a worker releases its connections to them on its first
+   event store access after the drop, and never reuses them
+The current month is never dropped.
+
+Per partition:
+- logins: one row per login (user, time, device, location, session token)
+- views: one row per (user, item) viewed that month, with first/last view and count
+"""
+
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+
+from shared_sqlite import SharedSQLite
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS logins (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    at REAL NOT NULL,
+    session_token TEXT UNIQUE,
+    ip_address TEXT,
+    device_model TEXT,
+    browser TEXT,
+    operating_system TEXT,
+    city TEXT,
+    country TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_logins_user_at ON logins (user_id, at);
+CREATE INDEX IF NOT EXISTS ix_logins_at ON logins (at);
+
+CREATE TABLE IF NOT EXISTS views (
+    user_id INTEGER NOT NULL,
+    opportunity_type TEXT NOT NULL,
+    opportunity_id INTEGER NOT NULL,
+    first_at REAL NOT NULL,
+    last_at REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (user_id, opportunity_type, opportunity_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_views_user_last ON views (user_id, last_at);
+CREATE INDEX IF NOT EXISTS ix_views_last ON views (last_at);
+'''
+
+LOGIN_FIELDS = ('session_token', 'ip_address', 'device_model', 'browser', 'operating_system', 'city', 'country')
+PARTITION_PATTERN = re.compile(r'^events-(\d{4}-\d{2})\.db$')
+WATERMARK = 'dropped-before'  # Oldest month still kept, shared by every process
+TOMBSTONES = 'dropped'
+CHECK_SECONDS = 1.0  # How stale a worker's view of the watermark may be
+TOMBSTONE_SECONDS = 86400  # Age before dropped partitions are deleted
+
+
+def month_of(at):
+    """Partition name (YYYY-MM, UTC) for a unix timestamp"""
+    return datetime.fromtimestamp(at, timezone.utc).strftime('%Y-%m')
+
+
+class EventStore:
+    """Month-partitioned SQLite files under one directory"""
+
+    def __init__(self, root):
+        self.root = root
+        self.partitions = {}
+        self.lock = threading.Lock()
+        self.kept_from = ''  # Months before this are dropped (see WATERMARK)
+        self.checked_at = 0.0
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, month):
+        return os.path.join(self.root, f'events-{month}.db')
+
+    def _partition(self, month):
+        """Partition for month, or None once it has been dropped"""
+        if time.monotonic() - self.checked_at >= CHECK_SECONDS:
+            self._check_dropped()
+        if month < self.kept_from:
+            return None
+        partition = self.partitions.get(month)
+        if partition is None:
+            with self.lock:
+                partition = self.partitions.get(month)
+                if partition is None:
+                    partition = self.partitions[month] = SharedSQLite(self._path(month), SCHEMA)
+        return partition
+
+    def _check_dropped(self):
+        # Pick up drops made by other processes and release their connections
+        self.checked_at = time.monotonic()
+        try:
+            with open(os.path.join(self.root, WATERMARK), encoding='utf-8') as f:
+                self.kept_from = f.read().strip()
+        except FileNotFoundError:
+            return
+        with self.lock:
+            for month in [month for month in self.partitions if month < self.kept_from]:
+                # Dropping the last reference closes its connections
+                del self.partitions[month]
+
+    def months(self):
+        """Existing partitions, newest first"""
+        names = (PARTITION_PATTERN.match(name) for name in os.listdir(self.root))
+        return sorted((match.group(1) for match in names if match), reverse=True)
+
+    def _partitions_between(self, start=None, end=None):
+        """Kept partitions overlapping [start, end], newest first"""
+        first = month_of(start) if start is not None else None
+        last = month_of(end) if end is not None else None
+        partitions = (
+            self._partition(month) for month in self.months()
+            if (first is None or month >= first) and (last is None or month <= last)
+        )
+        return [partition for partition in partitions if partition is not None]
+
+    # -------------------- Writes --------------------
+
+    def record_login(self, user_id, at=None, **fields):
+        """Append a login event (fields: see LOGIN_FIELDS)"""
+        at = time.time() if at is None else at
+        values = [fields.get(field) for field in LOGIN_FIELDS]
+        partition = self._partition(month_of(at))
+        if partition is None:
+            return
+        partition.execute(
+            f'INSERT OR IGNORE INTO logins (user_id, at, {", ".join(LOGIN_FIELDS)}) '
+            f'VALUES (?, ?, {", ".join("?" for _ in LOGIN_FIELDS)})',
+            (user_id, at, *values)
+        )
+
+    def set_login_location(self, session_token, at, city, country):
+        """Fill in the location of a login recorded before its IP was looked up"""
+        partition = self._partition(month_of(at))
+        if partition is None:
+            return
+        partition.execute(
+            'UPDATE logins SET city = ?, country = ? WHERE session_token = ?',
+            (city, country, session_token)
+        )
+
+    def record_view(self, user_id, opportunity_type, opportunity_id, at=None, count=1, first_at=None):
+        """Count views of an item by a user (one atomic upsert in the month's partition)"""
+        at = time.time() if at is None else at
+        partition = self._partition(month_of(at))
+        if partition is None:
+            return
+        partition.execute(
+            '''
+            INSERT INTO views (user_id, opportunity_type, opportunity_id, first_at, last_at, count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, opportunity_type, opportunity_id) DO UPDATE SET
+                first_at = MIN(first_at, excluded.first_at),
+                last_at = MAX(last_at, excluded.last_at),
+                count = count + excluded.count
+            ''',
+            (user_id, opportunity_type, opportunity_id, first_at or at, at, count)
+        )
+
+    # -------------------- Range scans --------------------
+
+    def logins(self, user_id, limit=10, start=None, end=None):
+        """
+        A user's logins in [start, end], newest first
+
+        Row ids are only unique within a partition, so each login's id is
+        returned as 'YYYY-MM-<rowid>'.
+        """
+        rows = []
+        for partition in self._partitions_between(start, end):
+            cursor = partition.execute(
+                f'SELECT id, at, {", ".join(LOGIN_FIELDS)} FROM logins '
+                'WHERE user_id = ? AND at >= ? AND at <= ? ORDER BY at DESC LIMIT ?',
+                (user_id, start or 0, end or float('inf'), limit - len(rows))
+            )
+            columns = [column[0] for column in cursor.description]
+            for row in cursor:
+                login = dict(zip(columns, row))
+                login['id'] = f"{month_of(login['at'])}-{login['id']}"
+                rows.append(login)
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def recent_views(self, user_id, limit=10):
+        """
+        A user's most recently viewed items, newest first
+
+        Each item appears once with its first/last view and total count over
+        all partitions.
+        """
+        items = {}
+        partitions = self._partitions_between()
+        for partition in partitions:
+            for row in partition.execute(
+                'SELECT opportunity_type, opportunity_id, last_at FROM views '
+                'WHERE user_id = ? ORDER BY last_at DESC LIMIT ?',
+                (user_id, limit)
+            ):
+                key = (row[0], row[1])
+                if key not in items:
+                    items[key] = {'opportunity_type': row[0], 'opportunity_id': row[1], 'last_viewed_at': row[2]}
+            if len(items) >= limit:
+                # Older partitions cannot hold a more recent view
+                break
+
+        recent = sorted(items.values(), key=lambda item: item['last_viewed_at'], reverse=True)[:limit]
+        if not recent:
+            return recent
+        by_key = {(item['opportunity_type'], item['opportunity_id']): item for item in recent}
+        for item in recent:
+            item['view_count'], item['viewed_at'] = 0, item['last_viewed_at']
+
+        # One query per partition for all selected items
+        keys = ', '.join('(?, ?)' for _ in by_key)
+        parameters = [value for key in by_key for value in key]
+        for partition in partitions:
+            for opportunity_type, opportunity_id, first_at, count in partition.execute(
+                'SELECT opportunity_type, opportunity_id, MIN(first_at), SUM(count) FROM views '
+                f'WHERE user_id = ? AND (opportunity_type, opportunity_id) IN (VALUES {keys}) '
+                'GROUP BY opportunity_type, opportunity_id',
+                (user_id, *parameters)
+            ):
+                item = by_key[(opportunity_type, opportunity_id)]
+                item['viewed_at'] = min(item['viewed_at'], first_at)
+                item['view_count'] += count
+        return recent
+
+    def scan_views(self, start=None, end=None, bucket_seconds=3600):
+        """
+        Yield (opportunity_type, opportunity_id, count, last_at) for views in [start, end]
+
+        Rows are summed in SQL per item and `bucket_seconds` slot of their
+        last view; last_at is the latest view in the slot.
+        """
+        for partition in self._partitions_between(start, end):
+            yield from partition.execute(
+                'SELECT opportunity_type, opportunity_id, SUM(count), MAX(last_at) FROM views '
+                'WHERE last_at >= ? AND last_at <= ? '
+                'GROUP BY opportunity_type, opportunity_id, CAST(last_at / ? AS INTEGER)',
+                (start or 0, end or float('inf'), bucket_seconds)
+            )
+
+    def count_logins(self, start=None, end=None):
+        """(logins, distinct users) in [start, end]"""
+        logins, users = 0, set()
+        for partition in self._partitions_between(start, end):
+            logins += partition.execute(
+                'SELECT COUNT(*) FROM logins WHERE at >= ? AND at <= ?', (start or 0, end or float('inf'))
+            ).fetchone()[0]
+            users.update(row[0] for row in partition.execute(
+                'SELECT DISTINCT user_id FROM logins WHERE at >= ? AND at <= ?', (start or 0, end or float('inf'))
+            ))
+        return logins, len(users)
+
+    def count_views(self, start=None, end=None):
+        """Total views whose latest view falls in [start, end]"""
+        return sum(
+            partition.execute(
+                'SELECT COALESCE(SUM(count), 0) FROM views WHERE last_at >= ? AND last_at <= ?',
+                (start or 0, end or float('inf'))
+            ).fetchone()[0]
+            for partition in self._partitions_between(start, end)
+        )
+
+    # -------------------- Partition management --------------------
+
+    def stats(self):
+        return {
+            month: os.path.getsize(self._path(month))
+            for month in self.months() if month >= self.kept_from
+        }
+
+    def drop_before(self, month, wait=2 * CHECK_SECONDS):
+        """
+        Drop every partition older than month (YYYY-MM, at most the current month)
+
+        Publishes the watermark, waits `wait` seconds for workers to stop using
+        the old partitions, then moves their files to tombstones. Returns the
+        dropped months.
+        """
+        month = min(month, month_of(time.time()))
+        self._delete_tombstones()
+        self._check_dropped()
+        if month > self.kept_from:
+            path = os.path.join(self.root, WATERMARK)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                f.write(month)
+            os.replace(path + '.tmp', path)
+            self._check_dropped()
+
+        dropped = [name for name in self.months() if name < self.kept_from]
+        if dropped:
+            time.sleep(wait)
+        for name in dropped:
+            tombstone = os.path.join(self.root, TOMBSTONES, f'{name}-{int(time.time())}')
+            os.makedirs(tombstone, exist_ok=True)
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(self._path(name) + suffix):
+                    os.replace(self._path(name) + suffix, os.path.join(tombstone, os.path.basename(self._path(name)) + suffix))
+        return dropped
+
+    def _delete_tombstones(self):
+        # No worker can reach these files any more (see the module docstring)
+        directory = os.path.join(self.root, TOMBSTONES)
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            dropped_at = name.rsplit('-', 1)[-1]
+            if dropped_at.isdigit() and time.time() - int(dropped_at) >= TOMBSTONE_SECONDS:
+                shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
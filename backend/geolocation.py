@@ -0,0 +1,93 @@
+"""
+Background IP geolocation
+Looking up an IP is an HTTP call (up to 3 s), so request handlers hand it to
+a Geolocator instead of waiting for it. A few worker threads per process run
+the lookups and then each job's callback (in an app context) with the
+result. Successful results are cached per IP for `cache_seconds`, so a burst
+of logins from one address costs one call. The threads start lazily and are
+restarted in forked worker processes. When the queue is full the lookup is
+skipped and the callback gets UNKNOWN_LOCATION.
+"""
+
+import os
+import queue
+import threading
+import time
+
+UNKNOWN_LOCATION = {'city': 'Unknown', 'country': 'Unknown'}
+MAX_CACHED = 10000  # Cached IPs per process before the cache is cleared
+
+
+class Geolocator:
+    """Queue of (ip, callback) jobs served by a few background threads"""
+
+    def __init__(self, app, lookup, workers=2, max_queued=1000, cache_seconds=3600):
+        self.app = app
+        self.lookup = lookup
+        self.workers = workers
+        self.max_queued = max_queued
+        self.cache_seconds = cache_seconds
+        self.lock = threading.Lock()
+        self.pid = None
+        self.queue = None
+        self.cache = {}  # {ip: (location, expires at)}
+        self.counts = {'lookups': 0, 'cached': 0, 'skipped': 0, 'failed': 0}
+
+    def _ensure_started(self):
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid != os.getpid():
+                # Threads do not survive fork; each worker owns its queue and threads
+                self.queue = queue.Queue(maxsize=self.max_queued)
+                self.cache = {}
+                for _ in range(self.workers):
+                    threading.Thread(target=self._run, args=(self.queue,), daemon=True).start()
+                self.pid = os.getpid()
+
+    def locate(self, ip_address, callback):
+        """Look up ip_address in the background, then call callback(location)"""
+        self._ensure_started()
+        try:
+            self.queue.put_nowait((ip_address, callback))
+        except queue.Full:
+            self.counts['skipped'] += 1
+            self._finish(callback, dict(UNKNOWN_LOCATION))
+
+    def _run(self, jobs):
+        while True:
+            ip_address, callback = jobs.get()
+            try:
+                self._finish(callback, self._location(ip_address))
+            finally:
+                jobs.task_done()
+
+    def _location(self, ip_address):
+        now = time.monotonic()
+        cached = self.cache.get(ip_address)
+        if cached is not None and cached[1] > now:
+            self.counts['cached'] += 1
+            return dict(cached[0])
+        self.counts['lookups'] += 1
+        location = self.lookup(ip_address)
+        if location != UNKNOWN_LOCATION:
+            if len(self.cache) >= MAX_CACHED:
+                self.cache.clear()
+            self.cache[ip_address] = (location, now + self.cache_seconds)
+        return dict(location)
+
+    def _finish(self, callback, location):
+        try:
+            with self.app.app_context():
+                callback(location)
+        except Exception as e:
+            self.counts['failed'] += 1
+            print(f"❌ Geolocation callback failed: {str(e)}")
+
+    def flush(self):
+        """Block until every queued lookup and its callback has finished"""
+        if self.pid == os.getpid() and self.queue is not None:
+            self.queue.join()
+
+    def stats(self):
+        return dict(self.counts, queued=self.queue.qsize() if self.pid == os.getpid() else 0)
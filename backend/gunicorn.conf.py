@@ -0,0 +1,96 @@
+"""
+Gunicorn settings for production (used by serve.py, or directly:
+`gunicorn -c gunicorn.conf.py app:app`)
+
+The app is imported once in the master (preload_app) and its in-memory state
+(registered-email filter, revocation set, trending scores) is built before
+forking, so workers start warm and share those pages copy-on-write. Each
+worker then drops the inherited database connections and keeps its own.
+
+Every setting can be tuned from the environment:
+
+    BIND                 host:port to listen on (default 0.0.0.0:5000)
+    WEB_CONCURRENCY      worker processes (default 2 x CPUs + 1)
+    WORKER_CLASS         sync | gthread | gevent (default gthread)
+    WORKER_THREADS       threads per gthread worker (default 4)
+    WORKER_CONNECTIONS   concurrent requests per gevent worker (default 100)
+    WORKER_TIMEOUT       seconds before a silent worker is killed and replaced (default 30)
+    GRACEFUL_TIMEOUT     seconds workers get to drain on reload/shutdown (default 30)
+    KEEPALIVE            seconds to hold idle keep-alive connections (default 5)
+    MAX_REQUESTS         recycle a worker after this many requests, 0 = never (default 0)
+    MAX_REQUESTS_JITTER  random extra requests so workers do not recycle together (default 0)
+    PROMETHEUS_MULTIPROC_DIR  directory where workers share /metrics values (default:
+                         hackifm-metrics in the temp directory, emptied at startup;
+                         empty a custom one before starting)
+"""
+
+import glob
+import multiprocessing
+import os
+import tempfile
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv('WORKER_CLASS', 'gthread')
+threads = int(os.getenv('WORKER_THREADS', 4))
+worker_connections = int(os.getenv('WORKER_CONNECTIONS', 100))
+timeout = int(os.getenv('WORKER_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('KEEPALIVE', 5))
+max_requests = int(os.getenv('MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('MAX_REQUESTS_JITTER', 0))
+
+preload_app = True
+accesslog = '-'
+errorlog = '-'
+
+# Must be set before the app (and prometheus_client) is imported. Only on the
+# first load: a HUP re-reads this file while workers still write their values
+if not os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+    metrics_dir = os.path.join(tempfile.gettempdir(), 'hackifm-metrics')
+    os.makedirs(metrics_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(metrics_dir, '*.db')):
+        os.remove(stale)  # Values left by a previous run
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = metrics_dir
+
+if worker_class == 'gevent':
+    # Patch before the preloaded app imports socket/threading
+    from gevent import monkey
+    monkey.patch_all()
+
+
+def when_ready(server):
+    """Master, before the first fork: create tables and build shared in-memory state"""
+    from app import warm_up
+    warm_up()
+    server.log.info("✅ App preloaded and warmed up")
+
+
+def post_fork(server, worker):
+    """Worker: never reuse the master's pooled database connections"""
+    from app import app, db
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    """Master: drop a dead worker's live gauges (in-flight requests, pool connections)"""
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def worker_exit(server, worker):
+    """Worker: finish queued geolocations, audit rows, similar-items rebuilds and metrics before exiting"""
+    from app import audit_log, geolocator, metrics, similar_items_rebuilds
+    geolocator.flush()
+    audit_log.flush()
+    similar_items_rebuilds.flush()
+    metrics.flush()
@@ -0,0 +1,119 @@
+"""
+Adaptive backoff for failed logins, checked before any password hashing
+Failures are counted per account (email) and per client subnet (IPv4 /24,
+IPv6 /64). Past a free allowance each further failure blocks the key for an
+exponentially growing delay, so a credential-stuffing run is turned away with
+two key lookups instead of a bcrypt verification per guess.
+
+State lives in an ephemeral store (see ephemeral.py): memory:// for one
+process, sqlite:/// to share the counters between workers.
+
+Pass the address of the TCP peer (request.remote_addr, corrected by ProxyFix
+for trusted proxies), never a raw X-Forwarded-For value: the client picks
+that header, so a fresh random value per guess would never hit the subnet
+limit. Addresses that do not parse are charged to the account only; pooling
+them under one key would let a few junk values lock everyone in it out.
+"""
+
+import ipaddress
+import threading
+import time
+from collections import deque
+
+
+class Backoff:
+    """`free` failures per window, then base * 2^(n - free) seconds up to `cap`"""
+
+    def __init__(self, free, base=1, cap=900, window=3600):
+        self.free = free
+        self.base = base
+        self.cap = cap
+        self.window = window
+
+    def delay(self, failures):
+        if failures <= self.free:
+            return 0
+        return min(self.cap, self.base * 2 ** min(failures - self.free - 1, 32))
+
+
+def subnet_of(ip_address):
+    """Client network a failure is charged to (/24 for IPv4, /64 for IPv6), None if not an IP"""
+    try:
+        address = ipaddress.ip_address(ip_address)
+    except (TypeError, ValueError):
+        return None
+    prefix = 24 if address.version == 4 else 64
+    return str(ipaddress.ip_network(f'{address}/{prefix}', strict=False))
+
+
+class LoginGuard:
+    """Per-account and per-subnet backoff with burst metrics for this worker"""
+
+    def __init__(self, store, account=None, subnet=None, burst_window=60):
+        self.store = store
+        self.policies = {
+            'account': account or Backoff(free=5),
+            'subnet': subnet or Backoff(free=20)
+        }
+        self.burst_window = burst_window
+        self.recent_rejections = deque()
+        self.lock = threading.Lock()
+        self.counts = {'checks': 0, 'failures': 0, 'lockouts': 0, 'rejected_account': 0, 'rejected_subnet': 0}
+        self.peak_burst = 0
+
+    def _keys(self, email, ip_address):
+        subnet = subnet_of(ip_address)
+        return {'account': email, 'subnet': subnet} if subnet else {'account': email}
+
+    def check(self, email, ip_address):
+        """Seconds until this login may be attempted (0 = go ahead and verify the password)"""
+        now = time.time()
+        self.counts['checks'] += 1
+        for scope, key in self._keys(email, ip_address).items():
+            blocked_until = self.store.get(f'login_block:{scope}:{key}')
+            if blocked_until and blocked_until > now:
+                self._rejected(scope, now)
+                return blocked_until - now
+        return 0
+
+    def failure(self, email, ip_address):
+        """Record a failed attempt; returns the resulting block in seconds (0 if none)"""
+        now = time.time()
+        self.counts['failures'] += 1
+        longest = 0
+        for scope, key in self._keys(email, ip_address).items():
+            policy = self.policies[scope]
+            failures = self.store.incr(f'login_failures:{scope}:{key}', policy.window)
+            delay = policy.delay(failures)
+            if delay:
+                self.store.set(f'login_block:{scope}:{key}', now + delay, delay)
+                self.counts['lockouts'] += 1
+                longest = max(longest, delay)
+        return longest
+
+    def success(self, email):
+        """Clear the account's failures after a correct password"""
+        self.store.delete(f'login_failures:account:{email}')
+        self.store.delete(f'login_block:account:{email}')
+
+    def _rejected(self, scope, now):
+        with self.lock:
+            self.counts[f'rejected_{scope}'] += 1
+            recent = self.recent_rejections
+            recent.append(now)
+            while recent and recent[0] <= now - self.burst_window:
+                recent.popleft()
+            self.peak_burst = max(self.peak_burst, len(recent))
+
+    def stats(self):
+        now = time.time()
+        with self.lock:
+            recent = self.recent_rejections
+            while recent and recent[0] <= now - self.burst_window:
+                recent.popleft()
+            return {
+                **self.counts,
+                'hashes_skipped': self.counts['rejected_account'] + self.counts['rejected_subnet'],
+                f'rejections_last_{self.burst_window}s': len(recent),
+                f'peak_rejections_per_{self.burst_window}s': self.peak_burst
+            }
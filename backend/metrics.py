@@ -0,0 +1,198 @@
+"""
+Prometheus metrics for GET /metrics (optional `prometheus_client` package)
+Request metrics per route template (never the raw path, so ids do not
+explode the label space):
+
+- hackifm_http_requests_total{method, route, status}
+- hackifm_http_request_duration_seconds{method, route} (histogram)
+- hackifm_http_requests_in_flight
+
+and domain metrics: OTP emails sent/failed, bcrypt time, response cache
+lookups by result, and database pool connections checked out.
+
+Requests are timed by a WSGI middleware and only add to plain per-worker
+totals (no werkzeug context-local lookups on that path); a background thread
+per worker moves them into the Prometheus collectors every `flush_seconds`,
+and export() flushes first. Under a preforking server set
+PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py does) before the app is imported:
+every worker then writes its values to files in that directory and export()
+aggregates all workers. Without it the metrics cover this process only.
+Without prometheus_client every recording method is a no-op.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import request
+from sqlalchemy import event
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+    )
+except ImportError:  # Optional dependency, metrics disabled
+    Counter = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BCRYPT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.2, 0.35, 0.5, 1, 2)
+UNMATCHED_ROUTE = '<unmatched>'  # 404s and other requests without a URL rule
+ROUTE_KEY = 'hackifm.url_rule'  # WSGI environ key set by the before_request hook
+
+
+class Metrics:
+    """Prometheus collectors plus the middleware recording every request"""
+
+    def __init__(self, flush_seconds=1.0):
+        self.enabled = Counter is not None
+        self.multiprocess = self.enabled and bool(os.getenv('PROMETHEUS_MULTIPROC_DIR'))
+        self.flush_seconds = flush_seconds
+        self.lock = threading.Lock()
+        self.pid = None
+        self.pending = {}  # {(method, route, status): [count, seconds, bucket counts]}
+        self.active = 0
+        if not self.enabled:
+            return
+
+        self.requests = Counter(
+            'hackifm_http_requests_total', 'HTTP requests', ['method', 'route', 'status']
+        )
+        self.latency = Histogram(
+            'hackifm_http_request_duration_seconds', 'HTTP request latency', ['method', 'route'],
+            buckets=LATENCY_BUCKETS
+        )
+        self.in_flight = Gauge(
+            'hackifm_http_requests_in_flight', 'HTTP requests being handled', multiprocess_mode='livesum'
+        )
+        self.otp_emails = Counter('hackifm_otp_emails_total', 'OTP emails by purpose and result', ['purpose', 'result'])
+        self.bcrypt = Histogram(
+            'hackifm_bcrypt_seconds', 'Time spent in bcrypt', ['operation'], buckets=BCRYPT_BUCKETS
+        )
+        self.cache_lookups = Counter('hackifm_response_cache_lookups_total', 'Response cache lookups', ['result'])
+        self.pool_checked_out = Gauge(
+            'hackifm_db_pool_checked_out', 'Database connections in use', ['bind'], multiprocess_mode='livesum'
+        )
+        self._cache_results = {result: self.cache_lookups.labels(result) for result in ('hit', 'stale_hit', 'miss')}
+
+    def init_app(self, app, db):
+        """Record every request and the pools of db's engines"""
+        if not self.enabled:
+            return
+        with app.app_context():
+            engines = dict(db.engines)
+        for bind, engine in engines.items():
+            self._watch_pool(engine, bind or 'primary')
+        app.before_request(self._remember_route)
+        app.wsgi_app = self.middleware(app.wsgi_app)
+
+    # -------------------- Requests --------------------
+
+    def _remember_route(self):
+        # One context-local lookup; everything else reads the WSGI environ
+        current = request._get_current_object()
+        current.environ[ROUTE_KEY] = current.url_rule
+
+    def middleware(self, wsgi_app):
+        """Wrap a WSGI app: time each request and count it by method, route and status"""
+        def timed_app(environ, start_response):
+            if self.pid != os.getpid():
+                self._start_flusher()
+            status = []
+
+            def capture_status(status_line, headers, exc_info=None):
+                status.append(status_line)
+                return start_response(status_line, headers, exc_info)
+
+            with self.lock:
+                self.active += 1
+            started = time.perf_counter()
+            try:
+                return wsgi_app(environ, capture_status)
+            finally:
+                elapsed = time.perf_counter() - started
+                rule = environ.get(ROUTE_KEY)
+                key = (
+                    environ['REQUEST_METHOD'],
+                    rule.rule if rule is not None else UNMATCHED_ROUTE,
+                    int(status[-1][:3]) if status else 500
+                )
+                bucket = bisect_left(LATENCY_BUCKETS, elapsed)  # Prometheus buckets are "<= bound"; last = +Inf
+                with self.lock:
+                    self.active -= 1
+                    totals = self.pending.get(key)
+                    if totals is None:
+                        totals = self.pending[key] = [0, 0.0, [0] * (len(LATENCY_BUCKETS) + 1)]
+                    totals[0] += 1
+                    totals[1] += elapsed
+                    totals[2][bucket] += 1
+        return timed_app
+
+    # -------------------- Flushing --------------------
+
+    def _start_flusher(self):
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            # Threads do not survive fork; each worker flushes its own totals
+            self.pid = os.getpid()
+            self.pending = {}
+            self.active = 0
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Metrics flush failed: {str(e)}")
+
+    def flush(self):
+        """Move the request totals gathered since the last flush into the collectors"""
+        if not self.enabled:
+            return
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            active = self.active
+        self.in_flight.set(active)
+        for (method, route, status), (count, seconds, buckets) in pending.items():
+            self.requests.labels(method, route, str(status)).inc(count)
+            histogram = self.latency.labels(method, route)
+            # Bulk form of Histogram.observe(): its per-bucket (non-cumulative) values and sum
+            histogram._sum.inc(seconds)
+            for value, bucket_count in zip(histogram._buckets, buckets):
+                if bucket_count:
+                    value.inc(bucket_count)
+
+    # -------------------- Domain metrics --------------------
+
+    def otp_email(self, purpose, sent):
+        if self.enabled:
+            self.otp_emails.labels(purpose, 'sent' if sent else 'failed').inc()
+
+    def bcrypt_time(self, operation, seconds):
+        if self.enabled:
+            self.bcrypt.labels(operation).observe(seconds)
+
+    def cache_lookup(self, result):
+        """SWRCache on_lookup hook: result is 'hit', 'stale_hit' or 'miss'"""
+        if self.enabled:
+            self._cache_results[result].inc()
+
+    def _watch_pool(self, engine, bind):
+        gauge = self.pool_checked_out.labels(bind)
+        event.listen(engine, 'checkout', lambda *args: gauge.inc())
+        event.listen(engine, 'checkin', lambda *args: gauge.dec())
+
+    # -------------------- Exposition --------------------
+
+    def export(self):
+        """(body, content type) in the Prometheus text format, all workers in multiprocess mode"""
+        self.flush()
+        if self.multiprocess:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -1,5 +1,5 @@
 from app import app, db
-from app import (User, Internship, Course, Event, Notification, ViewHistory, 
+from app import (User, Internship, Course, Event, Notification,
                  ReportedContent, UserPreferences, Application, SavedItem, 
                  LoginActivity)
 
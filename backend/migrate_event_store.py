@@ -0,0 +1,81 @@
+"""
+Database Migration Script for the event store
+Copies view history and login history out of the main database into the
+month-partitioned event store (EVENT_STORE_DIR), then drops view_history.
+login_activities is kept: it still tracks sessions.
+"""
+
+import sys
+import os
+from datetime import datetime, timezone
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, db, event_store
+from sqlalchemy import inspect, text
+
+
+def _timestamp(value):
+    """SQLite returns DATETIME columns as text; PostgreSQL as datetime"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def migrate_event_store():
+    """Move view_history and login history into the event store"""
+
+    with app.app_context():
+        print(f"🔄 Migrating events to {event_store.root}...")
+        db.create_all()
+        tables = inspect(db.engine).get_table_names()
+
+        if 'view_history' in tables:
+            columns = [column['name'] for column in inspect(db.engine).get_columns('view_history')]
+            # Before aggregation each row is one view; afterwards rows carry their counts
+            if 'view_count' in columns:
+                select = ('SELECT user_id, opportunity_type, opportunity_id, viewed_at, last_viewed_at, view_count '
+                          'FROM view_history')
+            else:
+                select = ('SELECT user_id, opportunity_type, opportunity_id, viewed_at, viewed_at, 1 '
+                          'FROM view_history')
+
+            views = 0
+            for user_id, item_type, item_id, first_at, last_at, count in db.session.execute(text(select)):
+                last_at = _timestamp(last_at)
+                if last_at is None:
+                    continue
+                event_store.record_view(user_id, item_type, item_id, at=last_at, count=count,
+                                        first_at=_timestamp(first_at) or last_at)
+                views += 1
+
+            db.session.execute(text('DROP TABLE view_history'))
+            db.session.commit()
+            print(f"  ✅ view_history: {views} rows moved, table dropped")
+        else:
+            print("  ⏭️  view_history already migrated")
+
+        logins = 0
+        rows = db.session.execute(text(
+            'SELECT user_id, login_time, session_token, ip_address, device_model, browser, '
+            'operating_system, city, country FROM login_activities'
+        ))
+        for row in rows:
+            at = _timestamp(row.login_time)
+            if at is None:
+                continue
+            # session_token is unique per partition, so re-running does not duplicate logins
+            event_store.record_login(
+                row.user_id, at=at, session_token=row.session_token, ip_address=row.ip_address,
+                device_model=row.device_model, browser=row.browser,
+                operating_system=row.operating_system, city=row.city, country=row.country
+            )
+            logins += 1
+        print(f"  ✅ login_activities: {logins} logins copied")
+
+        print("\n✅ Event store migration completed!")
+
+
+if __name__ == '__main__':
+    migrate_event_store()
@@ -0,0 +1,57 @@
+"""
+Batch job: apply data retention policies to append-only tables
+Run periodically (e.g. nightly cron). Deletes in small batches so the API
+keeps serving while it runs. Policies are configured via RETENTION_* settings.
+
+Usage: python purge_logs.py [--dry-run]
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime
+
+from app import app, db, retention_policies, event_store
+from retention import run_retention
+
+
+def _months_ago(count):
+    """YYYY-MM of the month `count` months before the current one"""
+    now = datetime.utcnow()
+    index = now.year * 12 + now.month - 1 - count
+    return f'{index // 12:04d}-{index % 12 + 1:02d}'
+
+
+def purge_logs(dry_run=False):
+    """Purge rows outside each table's retention policy"""
+    with app.app_context():
+        db.create_all()
+        policies = retention_policies()
+        oldest_month = _months_ago(app.config['EVENT_RETENTION_MONTHS'])
+        
+        # Tables created before the user_id indexes existed need them for per-user cutoffs
+        for policy in policies:
+            for index in policy.model.__table__.indexes:
+                index.create(db.engine, checkfirst=True)
+        
+        if dry_run:
+            print("📋 Retention policies (dry run, nothing deleted):")
+            for policy in policies:
+                print(f"  • {policy.name}: {policy.describe()}")
+            print(f"  • events: partitions before {oldest_month}")
+            return
+        
+        print("🧹 Purging expired rows...")
+        for report in run_retention(db.session, policies):
+            print(f"  ✅ {report['table']}: {report['deleted']} rows in {report['seconds']:.2f}s ({report['policy']})")
+        
+        # Event partitions are whole files: expiring a month moves them to a tombstone (deleted on a later run)
+        dropped = event_store.drop_before(oldest_month)
+        print(f"  ✅ events: dropped {len(dropped)} partitions before {oldest_month}")
+        
+        print("\n✅ Retention complete!")
+
+
+if __name__ == '__main__':
+    purge_logs(dry_run='--dry-run' in sys.argv)
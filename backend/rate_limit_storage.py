@@ -0,0 +1,125 @@
+"""
+Rate limit storage shared by all worker processes on one host
+Registers the `sqlite://` scheme with the limits library, so Flask-Limiter
+can use `storage_uri="sqlite:////path/to/ratelimit.db"`. Supports the
+fixed-window and sliding-window-counter strategies.
+"""
+
+import sqlite3
+import time
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+
+from shared_sqlite import SharedSQLite
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+'''
+
+PRUNE_EVERY = 1000  # Writes between sweeps of expired counters
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Counters in a WAL-mode SQLite file, one row per window"""
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri, wrap_exceptions=False, **options):
+        # sqlite:///relative/path.db or sqlite:////absolute/path.db
+        path = uri[len('sqlite:///'):] or 'ratelimit.db'
+        self.db = SharedSQLite(path, SCHEMA)
+        self.writes = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _incr(self, connection, key, expiry, amount, now):
+        self.writes += 1
+        if self.writes % PRUNE_EVERY == 0:
+            connection.execute('DELETE FROM rate_limits WHERE expires_at <= ?', (now,))
+        # One statement, so concurrent workers never lose an increment
+        return connection.execute(
+            '''
+            INSERT INTO rate_limits (key, value, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                value = CASE WHEN expires_at <= ? THEN excluded.value ELSE value + excluded.value END,
+                expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END
+            RETURNING value
+            ''',
+            (key, amount, now + expiry, now, now)
+        ).fetchone()[0]
+
+    def _get(self, connection, key, now):
+        row = connection.execute(
+            'SELECT value FROM rate_limits WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def incr(self, key, expiry, amount=1):
+        return self._incr(self.db.connection(), key, expiry, amount, time.time())
+
+    def get(self, key):
+        return self._get(self.db.connection(), key, time.time())
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self.db.execute(
+            'SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def check(self):
+        try:
+            self.db.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self.db.execute('DELETE FROM rate_limits').rowcount
+
+    def clear(self, key):
+        self.db.execute('DELETE FROM rate_limits WHERE key = ?', (key,))
+
+    def acquire_sliding_window_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        # Check and increment under the write lock, so no hit has to be rolled back
+        with self.db.transaction() as connection:
+            previous_count, previous_ttl, current_count, _ = self._sliding_window_info(
+                connection, previous_key, current_key, expiry, now
+            )
+            weighted_count = previous_count * previous_ttl / expiry + current_count
+            if int(weighted_count) + amount > limit:
+                return False
+            self._incr(connection, current_key, 2 * expiry, amount, now)
+            return True
+
+    def _sliding_window_info(self, connection, previous_key, current_key, expiry, now):
+        counts = dict(connection.execute(
+            'SELECT key, value FROM rate_limits WHERE key IN (?, ?) AND expires_at > ?',
+            (previous_key, current_key, now)
+        ).fetchall())
+        previous_count = counts.get(previous_key, 0)
+        current_count = counts.get(current_key, 0)
+        previous_ttl = 0.0 if previous_count == 0 else (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def get_sliding_window(self, key, expiry):
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        return self._sliding_window_info(self.db.connection(), previous_key, current_key, expiry, now)
+
+    def clear_sliding_window(self, key, expiry):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.db.execute('DELETE FROM rate_limits WHERE key IN (?, ?)', (previous_key, current_key))
@@ -0,0 +1,205 @@
+"""
+Shared response cache with request coalescing
+- SingleFlight: concurrent callers asking for the same key share one execution
+- SWRCache: TTL cache that serves stale entries while one background refresh runs
+"""
+
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+
+def cache_key(namespace, args=None, ignore=()):
+    """Build a cache key from a namespace and normalized query args"""
+    if not args:
+        return namespace
+    items = args.items(multi=True) if hasattr(args, 'getlist') else args.items()
+    params = sorted((key, str(value)) for key, value in items if key not in ignore)
+    return f'{namespace}?{urlencode(params)}' if params else namespace
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Deduplicate concurrent executions of the same keyed computation"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """Run fn once for all concurrent callers of key and share its result"""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.event.set()
+
+
+class CacheEntry:
+    __slots__ = ('value', 'created_at', 'fresh_until', 'stale_until', 'variants')
+
+    def __init__(self, value, ttl, stale_ttl):
+        now = time.monotonic()
+        self.value = value
+        self.created_at = now
+        self.fresh_until = now + ttl
+        self.stale_until = now + ttl + stale_ttl
+        self.variants = {}  # Encoded bodies derived from value (e.g. compressed responses)
+
+
+class SWRCache:
+    """
+    In-process cache with stale-while-revalidate semantics
+
+    Fresh entries are returned directly. Stale entries (past ttl but within
+    stale_ttl) are returned immediately while a single background refresh runs.
+    Misses are computed through SingleFlight so a thundering herd runs the
+    computation once.
+
+    invalidate(prefix) bumps a generation counter for the prefix. A compute
+    or background refresh that started before the bump still answers its own
+    callers but is not stored, so a write is never undone by a read that
+    raced it. Entries live in this process only: invalidation does not reach
+    other workers, which serve their copies until their ttl runs out.
+    """
+
+    def __init__(self, app=None, max_entries=1024, on_lookup=None):
+        self.app = app
+        self.max_entries = max_entries
+        self.on_lookup = on_lookup  # Called with 'hit', 'stale_hit' or 'miss' (e.g. metrics)
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.refreshing = set()
+        self.generations = {}  # {invalidated prefix: times invalidated}
+        self.flight = SingleFlight()
+        self.counters = Counter()
+
+    def get_or_compute(self, key, compute, ttl, stale_ttl=0):
+        """Return the cached value for key, computing it if needed"""
+        return self.get_entry(key, compute, ttl, stale_ttl).value
+
+    def get_entry(self, key, compute, ttl, stale_ttl=0):
+        """Like get_or_compute, but return the CacheEntry itself"""
+        now = time.monotonic()
+        entry = self.entries.get(key)
+
+        if entry is not None and now < entry.fresh_until:
+            self.counters['hits'] += 1
+            if self.on_lookup is not None:
+                self.on_lookup('hit')
+            return entry
+
+        if entry is not None and now < entry.stale_until:
+            self.counters['stale_hits'] += 1
+            if self.on_lookup is not None:
+                self.on_lookup('stale_hit')
+            self._refresh_in_background(key, compute, ttl, stale_ttl)
+            return entry
+
+        self.counters['misses'] += 1
+        if self.on_lookup is not None:
+            self.on_lookup('miss')
+        return self._compute_once(key, compute, ttl, stale_ttl)
+
+    def _generation(self, key):
+        # Changes whenever a prefix of key is invalidated
+        return sum(count for prefix, count in list(self.generations.items()) if key.startswith(prefix))
+
+    def _compute_once(self, key, compute, ttl, stale_ttl):
+        # Callers only share a computation started in the same generation
+        generation = self._generation(key)
+        return self.flight.do(
+            (key, generation), lambda: self._compute(key, compute, ttl, stale_ttl, generation)
+        )
+
+    def _compute(self, key, compute, ttl, stale_ttl, generation):
+        entry = CacheEntry(compute(), ttl, stale_ttl)
+        with self.lock:
+            if self._generation(key) != generation:
+                # Invalidated while computing: the value may predate the write
+                self.counters['discarded'] += 1
+                return entry
+            if key not in self.entries and len(self.entries) >= self.max_entries:
+                # Evict the oldest entry
+                oldest = min(self.entries, key=lambda k: self.entries[k].created_at)
+                del self.entries[oldest]
+            self.entries[key] = entry
+        return entry
+
+    def _refresh_in_background(self, key, compute, ttl, stale_ttl):
+        with self.lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+
+        def run():
+            try:
+                self.counters['refreshes'] += 1
+                if self.app is not None:
+                    with self.app.app_context():
+                        self._compute_once(key, compute, ttl, stale_ttl)
+                else:
+                    self._compute_once(key, compute, ttl, stale_ttl)
+            except Exception as e:
+                self.counters['refresh_errors'] += 1
+                print(f"❌ Background refresh failed for {key}: {str(e)}")
+            finally:
+                with self.lock:
+                    self.refreshing.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def invalidate(self, prefix=''):
+        """Drop every entry whose key starts with prefix (in this process only)"""
+        with self.lock:
+            self.generations[prefix] = self.generations.get(prefix, 0) + 1
+            keys = [key for key in self.entries if key.startswith(prefix)]
+            for key in keys:
+                del self.entries[key]
+        self.counters['invalidations'] += len(keys)
+        return len(keys)
+
+    def stats(self):
+        """Cache and coalescing counters for monitoring"""
+        lookups = self.counters['hits'] + self.counters['stale_hits'] + self.counters['misses']
+        return {
+            'entries': len(self.entries),
+            'hits': self.counters['hits'],
+            'stale_hits': self.counters['stale_hits'],
+            'misses': self.counters['misses'],
+            'hit_rate': round((self.counters['hits'] + self.counters['stale_hits']) / lookups, 4) if lookups else 0.0,
+            'coalesced': self.flight.coalesced,
+            'background_refreshes': self.counters['refreshes'],
+            'refresh_errors': self.counters['refresh_errors'],
+            'invalidations': self.counters['invalidations'],
+            'discarded_after_invalidation': self.counters['discarded']
+        }
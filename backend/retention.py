@@ -0,0 +1,120 @@
+"""
+Retention policies for append-only tables
+Rows are deleted in small batches selected by primary key, each batch in its
+own short transaction, so a purge never holds SQLite's write lock for long.
+- AgePolicy: rows whose timestamp is older than max_age (optionally filtered)
+- KeepLastPolicy: everything but the newest N rows per owner (e.g. per user)
+"""
+
+import time
+from datetime import datetime
+
+from sqlalchemy import delete, func, select
+
+BATCH_SIZE = 500
+PAUSE_SECONDS = 0.01  # Yield the write lock to request handlers between batches
+
+
+def _delete_ids(session, model, ids):
+    session.execute(delete(model).where(model.id.in_(ids)))
+    session.commit()
+    return len(ids)
+
+
+class AgePolicy:
+    """Delete rows whose `column` is older than max_age"""
+
+    def __init__(self, model, column, max_age, where=None):
+        self.model = model
+        self.column = column
+        self.max_age = max_age
+        self.where = where
+
+    @property
+    def name(self):
+        return self.model.__tablename__
+
+    def describe(self):
+        condition = f' and {self.where}' if self.where is not None else ''
+        return f'{self.column.key} older than {self.max_age.days} days{condition}'
+
+    def purge(self, session, batch_size=BATCH_SIZE, pause=PAUSE_SECONDS):
+        model = self.model
+        cutoff = datetime.utcnow() - self.max_age
+        conditions = [self.column < cutoff]
+        if self.where is not None:
+            conditions.append(self.where)
+
+        deleted, last_id = 0, 0
+        while True:
+            # Walk the primary key forward so each batch is an indexed range
+            ids = session.scalars(
+                select(model.id).where(model.id > last_id, *conditions).order_by(model.id).limit(batch_size)
+            ).all()
+            if not ids:
+                return deleted
+            last_id = ids[-1]
+            deleted += _delete_ids(session, model, ids)
+            time.sleep(pause)
+
+
+class KeepLastPolicy:
+    """Keep the newest `keep` rows per owner (by order_column, default id), deleting older ones"""
+
+    def __init__(self, model, owner_column, keep, where=None, order_column=None):
+        self.model = model
+        self.owner_column = owner_column
+        self.keep = keep
+        self.where = where
+        self.order_column = order_column if order_column is not None else model.id
+
+    @property
+    def name(self):
+        return self.model.__tablename__
+
+    def describe(self):
+        condition = f' (only where {self.where})' if self.where is not None else ''
+        return f'newest {self.keep} by {self.order_column.key} per {self.owner_column.key}{condition}'
+
+    def purge(self, session, batch_size=BATCH_SIZE, pause=PAUSE_SECONDS):
+        model, owner_column = self.model, self.owner_column
+        conditions = [] if self.where is None else [self.where]
+
+        # Only owners with more than `keep` rows have anything to purge
+        owners = session.scalars(
+            select(owner_column).where(*conditions).group_by(owner_column).having(func.count() > self.keep)
+        ).all()
+
+        deleted = 0
+        for owner in owners:
+            while True:
+                # Rows past the newest `keep`, oldest first, one batch at a time
+                ids = session.scalars(
+                    select(model.id).where(owner_column == owner, *conditions)
+                    .order_by(self.order_column.desc(), model.id.desc())
+                    .offset(self.keep).limit(batch_size)
+                ).all()
+                if not ids:
+                    break
+                deleted += _delete_ids(session, model, ids)
+                time.sleep(pause)
+        return deleted
+
+
+def run_retention(session, policies, batch_size=BATCH_SIZE, pause=PAUSE_SECONDS):
+    """
+    Apply every policy in turn
+
+    Returns one report per policy: {'table', 'policy', 'deleted', 'seconds'}.
+    """
+    reports = []
+    for policy in policies:
+        started = time.perf_counter()
+        deleted = policy.purge(session, batch_size=batch_size, pause=pause)
+        reports.append({
+            'table': policy.name,
+            'policy': policy.describe(),
+            'deleted': deleted,
+            'seconds': round(time.perf_counter() - started, 3)
+        })
+    return reports
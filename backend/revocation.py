@@ -0,0 +1,89 @@
+"""
+In-memory set of revoked session tokens, checked on every authenticated request
+The database keeps an append-only revocation log whose ids act as a version
+counter. Each process holds the unexpired tokens in an exact dict fronted by a
+Bloom filter, and pulls log rows newer than the last id it saw at most once
+per `sync_seconds`, so a check is a few hash probes and, for most tokens, no
+query at all. Revocations made in this process apply immediately.
+"""
+
+import threading
+import time
+
+from bloom import BloomFilter
+
+MIN_CAPACITY = 1024
+
+
+class RevocationSet:
+    """
+    Revoked tokens synced from a versioned log
+
+    fetch(since) returns [(version, token, expires_at)] for log entries newer
+    than `since` (0 on the first sync), expires_at being a unix timestamp.
+    """
+
+    def __init__(self, fetch, sync_seconds=1.0, error_rate=0.001):
+        self.fetch = fetch
+        self.sync_seconds = sync_seconds
+        self.error_rate = error_rate
+        self.tokens = {}  # {token: expires_at}
+        self.bloom = BloomFilter(MIN_CAPACITY, error_rate)
+        self.version = 0
+        self.synced_at = None
+        self.lock = threading.Lock()
+        self.checks = self.bloom_negatives = self.syncs = 0
+
+    def _insert(self, token, expires_at):
+        if token in self.tokens:
+            return
+        self.tokens[token] = expires_at
+        if len(self.tokens) > self.bloom.capacity:
+            self._rebuild()
+        else:
+            self.bloom.add(token)
+
+    def _rebuild(self):
+        """Drop expired tokens and size a fresh filter for the rest"""
+        now = time.time()
+        self.tokens = {token: expires_at for token, expires_at in self.tokens.items() if expires_at > now}
+        bloom = BloomFilter(max(MIN_CAPACITY, len(self.tokens) * 2), self.error_rate)
+        for token in self.tokens:
+            bloom.add(token)
+        self.bloom = bloom
+
+    def sync(self):
+        """Pull log entries newer than the last seen version"""
+        with self.lock:
+            for version, token, expires_at in self.fetch(self.version):
+                self._insert(token, expires_at)
+                self.version = max(self.version, version)
+            self.synced_at = time.monotonic()
+            self.syncs += 1
+
+    def add(self, token, expires_at):
+        """Record a revocation made by this process (already written to the log)"""
+        with self.lock:
+            self._insert(token, expires_at)
+
+    def is_revoked(self, token):
+        now = time.monotonic()
+        if self.synced_at is None or now - self.synced_at >= self.sync_seconds:
+            # One thread refreshes; the others keep answering from the current set
+            if self.synced_at is None or not self.lock.locked():
+                self.sync()
+        self.checks += 1
+        if token not in self.bloom:
+            self.bloom_negatives += 1
+            return False
+        return token in self.tokens
+
+    def stats(self):
+        return {
+            'revoked_tokens': len(self.tokens),
+            'version': self.version,
+            'checks': self.checks,
+            'bloom_negatives': self.bloom_negatives,
+            'bloom_bytes': len(self.bloom.array),
+            'syncs': self.syncs
+        }
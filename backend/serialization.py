@@ -0,0 +1,168 @@
+"""
+Fast JSON responses and generated model serializers
+- OrjsonProvider: Flask JSON provider backed by orjson (native datetime support)
+- Content negotiation: `Accept: application/msgpack` returns MessagePack, and
+  `X-Compact-Response: 1` omits null fields, for any jsonify() response
+- compile_serializer: builds a model's to_dict() once from its column metadata
+- compile_row_serializer: same wire format from plain row tuples (no ORM objects)
+"""
+
+from datetime import date, datetime
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+from sqlalchemy import DateTime, inspect
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, fall back to the standard library encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency, responses stay JSON only
+    msgpack = None
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+COMPACT_HEADER = 'X-Compact-Response'
+
+
+def strip_nulls(value):
+    """Recursively drop dict entries whose value is None"""
+    if isinstance(value, dict):
+        return {key: strip_nulls(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [strip_nulls(item) for item in value]
+    return value
+
+
+def _msgpack_default(value):
+    # Match the JSON wire format: ISO 8601 datetimes, everything else like jsonify
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return DefaultJSONProvider.default(value)
+
+
+def pack(obj):
+    """Encode a payload as MessagePack"""
+    return msgpack.packb(obj, default=_msgpack_default, use_bin_type=True)
+
+
+class NegotiatingProvider:
+    """
+    Mixin choosing the wire format of jsonify() responses per request
+
+    Subclasses implement json_response(obj).
+    """
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if not has_request_context() or not request.path.startswith('/api/'):
+            return self.json_response(obj)
+
+        if request.headers.get(COMPACT_HEADER, '').lower() in ('1', 'true'):
+            obj = strip_nulls(obj)
+
+        if msgpack is not None and request.accept_mimetypes.best_match(
+            ['application/json', MSGPACK_MIMETYPE]
+        ) == MSGPACK_MIMETYPE:
+            response = self._app.response_class(pack(obj), mimetype=MSGPACK_MIMETYPE)
+        else:
+            response = self.json_response(obj)
+
+        response.vary.update(('Accept', COMPACT_HEADER))
+        return response
+
+
+class StdlibProvider(NegotiatingProvider, DefaultJSONProvider):
+    """Flask's default JSON provider with content negotiation"""
+
+    def json_response(self, obj):
+        return DefaultJSONProvider.response(self, obj)
+
+
+class OrjsonProvider(NegotiatingProvider, JSONProvider):
+    """JSON provider using orjson for encoding and decoding"""
+
+    mimetype = 'application/json'
+    options = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    @staticmethod
+    def default(value):
+        # Types orjson does not handle natively (Decimal, objects with __html__, ...)
+        return DefaultJSONProvider.default(value)
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.options).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def json_response(self, obj):
+        body = orjson.dumps(obj, default=self.default, option=self.options | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def install_json_provider(app):
+    """
+    Install the negotiating provider, backed by orjson when it is installed
+
+    Returns True when the active provider serializes datetimes natively.
+    """
+    if orjson is None:
+        app.json = StdlibProvider(app)
+        return False
+    app.json = OrjsonProvider(app)
+    return True
+
+
+def compile_serializer(model, exclude=(), native_datetimes=False):
+    """
+    Generate a to_dict() method for a model from its column metadata
+
+    DateTime columns are emitted as ISO 8601 strings, or left as datetime
+    objects when the JSON provider encodes them natively.
+    """
+    fields = []
+    for attribute in inspect(model).column_attrs:
+        if attribute.key in exclude:
+            continue
+        column = attribute.columns[0]
+        value = f'self.{attribute.key}'
+        if isinstance(column.type, DateTime) and not native_datetimes:
+            value = f'(self.{attribute.key}.isoformat() if self.{attribute.key} is not None else None)'
+        fields.append(f'        {attribute.key!r}: {value},')
+
+    source = '\n'.join(['def to_dict(self):', '    return {', *fields, '    }'])
+    namespace = {}
+    exec(compile(source, f'<serializer {model.__name__}>', 'exec'), namespace)
+    to_dict = namespace['to_dict']
+    to_dict.__doc__ = f'Serialize {model.__name__} (generated from column metadata)'
+    return to_dict
+
+
+def compile_row_serializer(model, exclude=(), native_datetimes=False):
+    """
+    Generate a mapper from plain row tuples to the model's wire format
+
+    Returns (columns, row_to_dict). Select the columns with
+    query.with_entities(*columns) to skip ORM hydration entirely; the
+    resulting dicts match the model's generated to_dict().
+    """
+    columns = []
+    fields = []
+    for attribute in inspect(model).column_attrs:
+        if attribute.key in exclude:
+            continue
+        column = attribute.columns[0]
+        index = len(columns)
+        value = f'row[{index}]'
+        if isinstance(column.type, DateTime) and not native_datetimes:
+            value = f'(row[{index}].isoformat() if row[{index}] is not None else None)'
+        columns.append(getattr(model, attribute.key))
+        fields.append(f'        {attribute.key!r}: {value},')
+
+    source = '\n'.join(['def row_to_dict(row):', '    return {', *fields, '    }'])
+    namespace = {}
+    exec(compile(source, f'<row serializer {model.__name__}>', 'exec'), namespace)
+    return columns, namespace['row_to_dict']
@@ -0,0 +1,44 @@
+"""
+Production server: preforked Gunicorn workers with the app preloaded
+Settings live in gunicorn.conf.py and are tuned through environment variables
+(WEB_CONCURRENCY, WORKER_THREADS, WORKER_TIMEOUT, ...). `python app.py`
+remains the development server.
+
+Usage: python serve.py [sync|gthread|gevent]
+
+Signals (sent to the master process):
+    HUP         graceful reload: new workers start, old ones drain and exit
+    TTIN/TTOU   add/remove one worker
+    TERM        graceful shutdown (workers drain for GRACEFUL_TIMEOUT seconds)
+    USR2        start a new master on new code (then WINCH + QUIT the old one)
+"""
+
+import sys
+import os
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+WORKER_CLASSES = ('sync', 'gthread', 'gevent')
+
+
+def serve(worker_class=None):
+    """Run the app under Gunicorn with gunicorn.conf.py"""
+    try:
+        from gunicorn.app.wsgiapp import run
+    except ImportError:
+        print("❌ Gunicorn is not installed (pip install -r requirements.txt; Linux/macOS only)")
+        sys.exit(1)
+
+    if worker_class:
+        if worker_class not in WORKER_CLASSES:
+            print(f"❌ Unknown worker class '{worker_class}' (choose from {', '.join(WORKER_CLASSES)})")
+            sys.exit(1)
+        os.environ['WORKER_CLASS'] = worker_class
+
+    os.chdir(BACKEND_DIR)
+    sys.path.insert(0, BACKEND_DIR)
+    sys.argv = ['gunicorn', '--config', os.path.join(BACKEND_DIR, 'gunicorn.conf.py'), 'app:app']
+    run()
+
+
+if __name__ == '__main__':
+    serve(sys.argv[1] if len(sys.argv) > 1 else None)
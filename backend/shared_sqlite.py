@@ -0,0 +1,63 @@
+"""
+SQLite file shared by every worker process on one host
+WAL mode lets readers run alongside the single writer, and connections are
+kept per thread and per process so the handle survives forking servers.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+BUSY_TIMEOUT_MS = 5000
+
+
+class SharedSQLite:
+    """Thread-local, fork-aware connections to one SQLite file"""
+
+    def __init__(self, path, schema=''):
+        self.path = path
+        self.schema = schema
+        self.local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def connection(self):
+        """Connection for the calling thread (reopened after a fork)"""
+        local = self.local
+        if getattr(local, 'pid', None) != os.getpid():
+            # Never reuse a handle inherited from the parent process
+            local.connection = self._connect()
+            local.pid = os.getpid()
+        return local.connection
+
+    def _connect(self):
+        # Autocommit mode; writes take the lock explicitly via transaction()
+        connection = sqlite3.connect(
+            self.path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+        if self.schema:
+            connection.executescript(self.schema)
+        return connection
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction holding the database lock from the first statement"""
+        connection = self.connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def execute(self, sql, params=()):
+        """Run a single autocommitted statement"""
+        return self.connection().execute(sql, params)
@@ -0,0 +1,192 @@
+"""
+Content similarity for "More like this" recommendations
+Builds sparse TF-IDF vectors over the catalogue and ranks neighbours by cosine
+similarity. Scores are only comparable within one build (the vocabulary and
+IDF weights change with the catalogue), so neighbour lists are always
+recomputed together: RebuildQueue runs the rebuilds in the background.
+"""
+
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9+#.]+')
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into',
+    'is', 'it', 'of', 'on', 'or', 'our', 'that', 'the', 'this', 'to', 'with',
+    'will', 'you', 'your', 'we', 'work', 'team'
+}
+
+MAX_FEATURES = 4096  # Vocabulary cap (most frequent terms)
+BLOCK_SIZE = 512  # Rows scored per matrix product
+
+
+def tokenize(text):
+    """Split text into lowercase tokens, dropping stop words"""
+    if not text:
+        return []
+    tokens = (token.strip('.') for token in TOKEN_PATTERN.findall(text.lower()))
+    return [token for token in tokens if len(token) > 1 and token not in STOP_WORDS]
+
+
+def weighted_terms(fields):
+    """
+    Count terms across weighted fields
+
+    fields: iterable of (text, weight) pairs, e.g. [(title, 3), (description, 1)]
+    """
+    counts = Counter()
+    for text, weight in fields:
+        for token in tokenize(text):
+            counts[token] += weight
+    return counts
+
+
+def build_matrix(documents, max_features=MAX_FEATURES):
+    """
+    Build an L2-normalised sparse (CSR) TF-IDF matrix with one row per document
+
+    documents: list of term Counters (see weighted_terms)
+    """
+    document_frequency = Counter()
+    for terms in documents:
+        document_frequency.update(terms.keys())
+
+    vocabulary = [term for term, _ in document_frequency.most_common(max_features)]
+    columns = {term: index for index, term in enumerate(vocabulary)}
+    n = len(documents)
+    idf = [math.log((1 + n) / (1 + document_frequency[term])) + 1.0 for term in vocabulary]
+
+    indptr, indices, values = [0], [], []
+    for terms in documents:
+        row = {}
+        for term, count in terms.items():
+            column = columns.get(term)
+            if column is not None:
+                # Sublinear TF dampens long descriptions repeating a keyword
+                row[column] = (1.0 + math.log(count)) * idf[column]
+        norm = math.sqrt(sum(value * value for value in row.values())) or 1.0
+        indices.extend(row)
+        values.extend(value / norm for value in row.values())
+        indptr.append(len(indices))
+
+    return sparse.csr_matrix(
+        (np.array(values, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+        shape=(n, len(vocabulary))
+    )
+
+
+def _top_k(scores, k):
+    """Indices of the k highest positive scores, best first"""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return []
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    candidates = candidates[np.argsort(-scores[candidates])]
+    return [index for index in candidates if scores[index] > 0]
+
+
+def neighbours_for_rows(ids, matrix, rows, k):
+    """
+    Compute the k nearest neighbours of the given row indices
+
+    Returns {id: [[neighbour_id, score], ...]} ordered by descending similarity.
+    Rows are scored in blocks so memory stays bounded on large catalogues.
+    """
+    result = {}
+    rows = list(rows)
+    transposed = matrix.T.tocsr()
+    for start in range(0, len(rows), BLOCK_SIZE):
+        block = rows[start:start + BLOCK_SIZE]
+        scores = (matrix[block] @ transposed).toarray()
+        for offset, row in enumerate(block):
+            row_scores = scores[offset]
+            row_scores[row] = -1.0  # Never recommend the item itself
+            result[ids[row]] = [
+                [ids[index], round(float(row_scores[index]), 4)]
+                for index in _top_k(row_scores, k)
+            ]
+    return result
+
+
+def compute_neighbours(ids, matrix, k):
+    """Compute neighbour lists for the whole catalogue"""
+    return neighbours_for_rows(ids, matrix, range(len(ids)), k)
+
+
+class RebuildQueue:
+    """
+    Per-worker background rebuilds of neighbour lists, coalesced per content type
+
+    request(content_type) returns at once; a thread started lazily in each
+    worker waits `delay` seconds so a burst of edits costs one rebuild, then
+    calls rebuild(content_type) in an app context.
+    """
+
+    def __init__(self, app, rebuild, delay=2.0):
+        self.app = app
+        self.rebuild = rebuild
+        self.delay = delay
+        self.condition = threading.Condition()
+        self.pid = None
+        self.dirty = set()
+        self.running = False
+        self.counts = {'requested': 0, 'rebuilds': 0, 'failed': 0}
+
+    def _ensure_started(self):
+        if self.pid == os.getpid():
+            return
+        with self.condition:
+            if self.pid != os.getpid():
+                # Threads do not survive fork; each worker rebuilds for its own writes
+                self.dirty = set()
+                self.running = False
+                threading.Thread(target=self._run, daemon=True).start()
+                self.pid = os.getpid()
+
+    def request(self, content_type):
+        """Schedule a rebuild of content_type's neighbour lists"""
+        self._ensure_started()
+        with self.condition:
+            self.counts['requested'] += 1
+            self.dirty.add(content_type)
+            self.condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.dirty:
+                    self.condition.wait()
+            time.sleep(self.delay)
+            with self.condition:
+                content_types, self.dirty = self.dirty, set()
+                self.running = True
+            for content_type in sorted(content_types):
+                try:
+                    with self.app.app_context():
+                        self.rebuild(content_type)
+                    self.counts['rebuilds'] += 1
+                except Exception as e:
+                    self.counts['failed'] += 1
+                    print(f"❌ Similar items rebuild failed for {content_type}: {str(e)}")
+            with self.condition:
+                self.running = False
+                self.condition.notify_all()
+
+    def flush(self):
+        """Block until every requested rebuild has run"""
+        if self.pid != os.getpid():
+            return
+        with self.condition:
+            while self.dirty or self.running:
+                self.condition.wait()
+
+    def stats(self):
+        return dict(self.counts, pending=sorted(self.dirty))
@@ -0,0 +1,147 @@
+"""
+Per-request SQL instrumentation
+Cursor events on every engine count the statements a request runs, their
+total time and the slowest one. Each response gets a Server-Timing header:
+
+    Server-Timing: db;dur=12.4;desc="queries: 7", app;dur=31.0
+
+and requests whose SQL time reaches `log_ms` print one JSON log line. Totals
+per route are kept in one-minute buckets for the last `window_seconds`, so
+top() can rank routes by SQL time. Statements run outside a request (audit
+writer, background cache refreshes) are not counted. Stats are per worker.
+"""
+
+import json
+import threading
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+BUCKET_SECONDS = 60
+STATEMENT_CHARS = 300  # Slowest statements are kept truncated, without parameters
+
+
+class SQLTimer:
+    """Query count / SQL time per request, and a rolling per-route summary"""
+
+    def __init__(self, window_seconds=900, log_ms=0):
+        self.window_seconds = window_seconds
+        self.log_ms = log_ms
+        self.lock = threading.Lock()
+        self.buckets = {}  # {bucket start: {route: totals}}
+
+    def init_app(self, app, db):
+        with app.app_context():
+            engines = list(db.engines.values())
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    # -------------------- Cursor events --------------------
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info['query_started'] = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not has_request_context():
+            return
+        elapsed = time.perf_counter() - conn.info.pop('query_started', time.perf_counter())
+        timing = g.get('sql_timing')
+        if timing is None:
+            return
+        timing['queries'] += 1
+        timing['sql'] += elapsed
+        if elapsed > timing['slowest']:
+            timing['slowest'] = elapsed
+            timing['slowest_statement'] = statement
+
+    # -------------------- Request hooks --------------------
+
+    def _before_request(self):
+        g.sql_timing = {
+            'started': time.perf_counter(),
+            'queries': 0,
+            'sql': 0.0,
+            'slowest': 0.0,
+            'slowest_statement': None
+        }
+
+    def _after_request(self, response):
+        timing = g.pop('sql_timing', None)
+        if timing is None:
+            return response
+        total_ms = (time.perf_counter() - timing['started']) * 1000
+        sql_ms = timing['sql'] * 1000
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={sql_ms:.1f};desc="queries: {timing["queries"]}", app;dur={total_ms:.1f}'
+        )
+
+        route = f"{request.method} {request.url_rule.rule if request.url_rule else request.path}"
+        statement = ' '.join(timing['slowest_statement'].split())[:STATEMENT_CHARS] if timing['slowest_statement'] else None
+        self._record(route, timing['queries'], sql_ms, timing['slowest'] * 1000, statement)
+
+        if sql_ms >= self.log_ms:
+            print(json.dumps({
+                'event': 'request_sql',
+                'route': route,
+                'status': response.status_code,
+                'duration_ms': round(total_ms, 1),
+                'queries': timing['queries'],
+                'sql_ms': round(sql_ms, 1),
+                'slowest_ms': round(timing['slowest'] * 1000, 1),
+                'slowest_statement': statement
+            }))
+        return response
+
+    # -------------------- Rolling window --------------------
+
+    def _record(self, route, queries, sql_ms, slowest_ms, statement):
+        bucket = int(time.time() // BUCKET_SECONDS) * BUCKET_SECONDS
+        with self.lock:
+            routes = self.buckets.get(bucket)
+            if routes is None:
+                routes = self.buckets[bucket] = {}
+                oldest = bucket - self.window_seconds
+                for start in [start for start in self.buckets if start < oldest]:
+                    del self.buckets[start]
+            totals = routes.setdefault(route, {
+                'requests': 0, 'queries': 0, 'sql_ms': 0.0, 'slowest_ms': 0.0, 'slowest_statement': None
+            })
+            totals['requests'] += 1
+            totals['queries'] += queries
+            totals['sql_ms'] += sql_ms
+            if slowest_ms > totals['slowest_ms']:
+                totals['slowest_ms'] = slowest_ms
+                totals['slowest_statement'] = statement
+
+    def top(self, limit=10):
+        """Routes by total SQL time over the window, slowest first"""
+        cutoff = time.time() - self.window_seconds
+        merged = {}
+        with self.lock:
+            for start, routes in self.buckets.items():
+                if start + BUCKET_SECONDS <= cutoff:
+                    continue
+                for route, totals in routes.items():
+                    summary = merged.setdefault(route, {
+                        'route': route, 'requests': 0, 'queries': 0, 'sql_ms': 0.0,
+                        'slowest_ms': 0.0, 'slowest_statement': None
+                    })
+                    summary['requests'] += totals['requests']
+                    summary['queries'] += totals['queries']
+                    summary['sql_ms'] += totals['sql_ms']
+                    if totals['slowest_ms'] > summary['slowest_ms']:
+                        summary['slowest_ms'] = totals['slowest_ms']
+                        summary['slowest_statement'] = totals['slowest_statement']
+
+        ranked = sorted(merged.values(), key=lambda summary: summary['sql_ms'], reverse=True)[:limit]
+        for summary in ranked:
+            summary['queries_per_request'] = round(summary['queries'] / summary['requests'], 2)
+            summary['sql_ms_per_request'] = round(summary['sql_ms'] / summary['requests'], 2)
+            summary['sql_ms'] = round(summary['sql_ms'], 1)
+            summary['slowest_ms'] = round(summary['slowest_ms'], 1)
+        return ranked
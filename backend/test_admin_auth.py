@@ -0,0 +1,126 @@
+"""
+Tests for claim-based admin authorization
+Runs in-process against a temporary SQLite database (no server needed):
+
+    python -m pytest test_admin_auth.py
+
+Every test creates the users it needs, so tests pass alone or in any order.
+"""
+
+import importlib
+import os
+import re
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+USER_QUERY = re.compile(r'\bFROM users\b')
+PASSWORD = 'TestPass123!'
+
+
+@pytest.fixture(scope='module')
+def backend(tmp_path_factory):
+    """The app module, configured for a temporary database and stores"""
+    tmp = tmp_path_factory.mktemp('admin_auth')
+    os.environ['DATABASE_URL'] = f"sqlite:///{tmp / 'test.db'}"
+    os.environ['EVENT_STORE_DIR'] = str(tmp / 'events')
+    os.environ['TRENDING_DB'] = str(tmp / 'trending.db')
+    for setting in ('RATE_LIMIT_STORAGE_URL', 'THROTTLE_STORAGE_URL', 'EPHEMERAL_STORAGE_URL'):
+        os.environ[setting] = 'memory://'
+
+    backend = importlib.import_module('app')
+    backend.app.config['TESTING'] = True
+    backend.limiter.enabled = False
+    backend.create_tables()
+    return backend
+
+
+@pytest.fixture
+def client(backend):
+    return backend.app.test_client()
+
+
+@pytest.fixture
+def make_user(backend, client):
+    """Create a user with a unique email and return (user id, auth headers)"""
+    def make_user(role='user'):
+        email = f'{role}-{uuid.uuid4().hex}@example.com'
+        with backend.app.app_context():
+            user = backend.User(
+                name='Test User',
+                email=email,
+                password_hash=backend.bcrypt.generate_password_hash(PASSWORD).decode('utf-8'),
+                role=role,
+                verified=True
+            )
+            backend.db.session.add(user)
+            backend.db.session.commit()
+            user_id = user.id
+
+        response = client.post('/api/auth/login', json={'email': email, 'password': PASSWORD})
+        assert response.status_code == 200, response.get_json()
+        return user_id, {'Authorization': f"Bearer {response.get_json()['token']}"}
+    return make_user
+
+
+@contextmanager
+def count_user_queries(backend):
+    """Collect SQL statements that read the users table"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if USER_QUERY.search(statement):
+            statements.append(statement)
+
+    with backend.app.app_context():
+        engine = backend.db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def set_role(backend, user_id, role):
+    with backend.app.app_context():
+        backend.db.session.get(backend.User, user_id).role = role
+        backend.db.session.commit()
+
+
+def test_admin_fast_path_runs_no_user_queries(backend, client, make_user):
+    _, headers = make_user('admin')
+    assert client.get('/api/admin/performance', headers=headers).status_code == 200
+
+    with count_user_queries(backend) as statements:
+        for _ in range(5):
+            assert client.get('/api/admin/performance', headers=headers).status_code == 200
+    assert statements == []
+
+
+def test_non_admin_claim_rejected_without_user_query(backend, client, make_user):
+    _, headers = make_user()
+
+    with count_user_queries(backend) as statements:
+        response = client.get('/api/admin/performance', headers=headers)
+    assert response.status_code == 403
+    assert statements == []
+
+
+def test_demoted_admin_rejected_before_token_expires(backend, client, make_user):
+    user_id, headers = make_user('admin')
+    assert client.get('/api/admin/performance', headers=headers).status_code == 200
+
+    set_role(backend, user_id, 'user')
+    assert client.get('/api/admin/performance', headers=headers).status_code == 403
+
+
+def test_banned_admin_rejected(client, make_user):
+    user_id, headers = make_user('admin')
+    _, admin_headers = make_user('admin')
+    assert client.get('/api/admin/performance', headers=headers).status_code == 200
+
+    response = client.post(f'/api/admin/users/{user_id}/ban', json={'ban': True}, headers=admin_headers)
+    assert response.status_code == 200
+    assert client.get('/api/admin/performance', headers=headers).status_code == 403
@@ -0,0 +1,109 @@
+"""
+Sliding-window throttle for per-account actions (OTP sends, password resets)
+Each key keeps a ring buffer of its last `limit` timestamps; a hit is allowed
+when the oldest of them has left the window. Keys expire once their newest
+timestamp is older than the window, so the store never grows unbounded.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+
+from shared_sqlite import SharedSQLite
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS throttle (
+    key TEXT PRIMARY KEY,
+    stamps TEXT NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+'''
+
+SWEEP_EVERY = 1000  # Hits between sweeps of expired keys
+
+
+def _check(stamps, limit, window, now):
+    """Drop timestamps outside the window; return seconds until the next hit is allowed"""
+    while stamps and stamps[0] <= now - window:
+        stamps.popleft()
+    if len(stamps) >= limit:
+        return stamps[0] + window - now
+    return 0
+
+
+class MemoryThrottle:
+    """Ring buffers held in this process"""
+
+    def __init__(self):
+        self.buffers = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+
+    def hit(self, key, limit, window, now=None):
+        """Record a hit for key unless throttled; return 0 or seconds to wait"""
+        now = time.time() if now is None else now
+        with self.lock:
+            self.hits += 1
+            if self.hits % SWEEP_EVERY == 0:
+                self._sweep(now)
+            stamps = self.buffers.get(key)
+            if stamps is None or stamps.maxlen != limit:
+                stamps = self.buffers[key] = deque(stamps or (), maxlen=limit)
+            retry_after = _check(stamps, limit, window, now)
+            if not retry_after:
+                stamps.append(now)
+                self.expires[key] = now + window
+            return retry_after
+
+    def _sweep(self, now):
+        for key in [key for key, expires_at in self.expires.items() if expires_at <= now]:
+            del self.buffers[key]
+            del self.expires[key]
+
+    def reset(self, key):
+        with self.lock:
+            self.buffers.pop(key, None)
+            self.expires.pop(key, None)
+
+
+class SQLiteThrottle:
+    """Ring buffers persisted in a shared SQLite file (survive restarts, shared by workers)"""
+
+    def __init__(self, path):
+        self.db = SharedSQLite(path, SCHEMA)
+        self.hits = 0
+
+    def hit(self, key, limit, window, now=None):
+        """Record a hit for key unless throttled; return 0 or seconds to wait"""
+        now = time.time() if now is None else now
+        self.hits += 1
+        with self.db.transaction() as connection:
+            if self.hits % SWEEP_EVERY == 0:
+                connection.execute('DELETE FROM throttle WHERE expires_at <= ?', (now,))
+            row = connection.execute(
+                'SELECT stamps FROM throttle WHERE key = ? AND expires_at > ?', (key, now)
+            ).fetchone()
+            stamps = deque(json.loads(row[0]) if row else (), maxlen=limit)
+            retry_after = _check(stamps, limit, window, now)
+            if retry_after:
+                return retry_after
+            stamps.append(now)
+            connection.execute(
+                'INSERT OR REPLACE INTO throttle (key, stamps, expires_at) VALUES (?, ?, ?)',
+                (key, json.dumps(list(stamps)), now + window)
+            )
+            return 0
+
+    def reset(self, key):
+        self.db.execute('DELETE FROM throttle WHERE key = ?', (key,))
+
+
+def throttle_from_url(url):
+    """Build a throttle store from a URL: memory:// or sqlite:///path"""
+    if url.startswith('memory://'):
+        return MemoryThrottle()
+    if url.startswith('sqlite:///'):
+        return SQLiteThrottle(url[len('sqlite:///'):])
+    raise ValueError(f'Unsupported throttle storage: {url}')
@@ -0,0 +1,139 @@
+"""
+Time-decayed trending scores shared by every worker
+Each engagement event adds weight * e^(-lambda * age) to an item's score in
+every period (e.g. daily/weekly half-lives). Scores are kept relative to a
+per-period reference epoch, so an event is one upsert per period and ranking
+never has to re-decay the whole table.
+
+Scores live in one SQLite file (see shared_sqlite.py), so all worker
+processes rank from the same totals whichever worker saw the event.
+"""
+
+import math
+import time
+
+from shared_sqlite import SharedSQLite
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS trending_periods (
+    period TEXT PRIMARY KEY,
+    epoch REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS trending_scores (
+    period TEXT NOT NULL,
+    item_type TEXT NOT NULL,
+    item_id INTEGER NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (period, item_type, item_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_trending_rank ON trending_scores (period, item_type, score);
+CREATE TABLE IF NOT EXISTS trending_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+'''
+
+REBASE_EXPONENT = 50.0  # Rebase before e^x grows past ~5e21
+PRUNE_BELOW = 1e-3  # Scores this small (in current units) are dropped on rebase
+
+
+class TrendingEngine:
+    """Exponentially decayed engagement scores for several half-lives, in a shared SQLite file"""
+
+    def __init__(self, path, half_lives, top_k=10):
+        self.db = SharedSQLite(path, SCHEMA)
+        self.decay = {period: math.log(2) / seconds for period, seconds in half_lives.items()}
+        self.top_k = top_k
+
+    @property
+    def periods(self):
+        return list(self.decay)
+
+    def _epochs(self, connection, at):
+        epochs = dict(connection.execute('SELECT period, epoch FROM trending_periods'))
+        for period in self.decay:
+            if period not in epochs:
+                connection.execute('INSERT INTO trending_periods (period, epoch) VALUES (?, ?)', (period, at))
+                epochs[period] = at
+        return epochs
+
+    def record(self, item_type, item_id, weight=1.0, at=None):
+        """Add an engagement event (at: unix timestamp, defaults to now)"""
+        self.record_many([(item_type, item_id, weight, time.time() if at is None else at)])
+
+    def record_many(self, events):
+        """Add (item_type, item_id, weight, at) events in one transaction"""
+        events = list(events)
+        if events:
+            with self.db.transaction() as connection:
+                self._record(connection, events)
+
+    def _record(self, connection, events):
+        epochs = self._epochs(connection, min(event[3] for event in events))
+        latest = max(event[3] for event in events)
+        totals = {}
+        for period, decay in self.decay.items():
+            if decay * (latest - epochs[period]) > REBASE_EXPONENT:
+                epochs[period] = self._rebase(connection, period, epochs[period], latest)
+            for item_type, item_id, weight, at in events:
+                key = (period, item_type, item_id)
+                totals[key] = totals.get(key, 0.0) + weight * math.exp(decay * (at - epochs[period]))
+        connection.executemany(
+            'INSERT INTO trending_scores (period, item_type, item_id, score) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (period, item_type, item_id) DO UPDATE SET score = score + excluded.score',
+            [(*key, score) for key, score in totals.items()]
+        )
+
+    def remove(self, item_type, item_id):
+        """Forget an item in every period (e.g. deleted or unapproved)"""
+        self.db.execute('DELETE FROM trending_scores WHERE item_type = ? AND item_id = ?', (item_type, item_id))
+
+    def _rebase(self, connection, period, epoch, now):
+        """Move a period's epoch to now, scaling and pruning its scores"""
+        factor = math.exp(-self.decay[period] * (now - epoch))
+        connection.execute('UPDATE trending_scores SET score = score * ? WHERE period = ?', (factor, period))
+        connection.execute('DELETE FROM trending_scores WHERE period = ? AND score < ?', (period, PRUNE_BELOW))
+        connection.execute('UPDATE trending_periods SET epoch = ? WHERE period = ?', (now, period))
+        return now
+
+    def snapshot(self, period, limit=None, now=None):
+        """
+        Top items per type for a period with their current decayed scores
+
+        Returns {item_type: [(item_id, score), ...]} best first.
+        """
+        limit = limit or self.top_k
+        now = time.time() if now is None else now
+        row = self.db.execute('SELECT epoch FROM trending_periods WHERE period = ?', (period,)).fetchone()
+        if row is None:
+            return {}
+        factor = math.exp(-self.decay[period] * (now - row[0]))
+        top = {}
+        for item_type, item_id, score in self.db.execute(
+            '''
+            SELECT item_type, item_id, score FROM (
+                SELECT item_type, item_id, score,
+                       ROW_NUMBER() OVER (PARTITION BY item_type ORDER BY score DESC) AS position
+                FROM trending_scores WHERE period = ?
+            ) WHERE position <= ? ORDER BY item_type, score DESC
+            ''',
+            (period, limit)
+        ):
+            top.setdefault(item_type, []).append((item_id, score * factor))
+        return top
+
+    def bootstrap(self, events):
+        """
+        Load past events once for the shared store (no-op if already done)
+
+        events: callable returning an iterable of (item_type, item_id, weight, at);
+        it runs under the store's write lock, so only one process loads them
+        """
+        with self.db.transaction() as connection:
+            if connection.execute("SELECT 1 FROM trending_meta WHERE key = 'bootstrapped'").fetchone():
+                return False
+            loaded = list(events())
+            if loaded:
+                self._record(connection, loaded)
+            connection.execute("INSERT INTO trending_meta (key, value) VALUES ('bootstrapped', ?)", (str(time.time()),))
+        return True
@@ -0,0 +1,67 @@
+"""
+One database transaction per request
+Views decorated with @unit_of_work.transactional stage their changes on
+db.session (flush() when they need generated ids) and never commit: the
+decorator commits once after a successful (< 400) response and rolls back
+otherwise. Side effects registered with after_commit() - cache invalidation,
+derived data, notifications - run only once that commit has succeeded, so a
+failed request leaves no trace of them.
+"""
+
+from functools import wraps
+
+from flask import current_app, g, has_request_context, jsonify
+
+
+class UnitOfWork:
+    """Per-request transaction boundary plus deferred after-commit callbacks"""
+
+    def __init__(self, db):
+        self.db = db
+        self.counts = {'committed': 0, 'rolled_back': 0, 'deferred': 0, 'callback_errors': 0}
+
+    def after_commit(self, callback, *args, **kwargs):
+        """Run callback after the current request commits (immediately outside a unit of work)"""
+        pending = g.get('after_commit') if has_request_context() else None
+        if pending is None:
+            callback(*args, **kwargs)
+            return
+        pending.append((callback, args, kwargs))
+        self.counts['deferred'] += 1
+
+    def transactional(self, view):
+        """Commit a view's changes once, then run its after-commit callbacks"""
+        @wraps(view)
+        def decorated(*args, **kwargs):
+            g.after_commit = []
+            try:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code >= 400:
+                    self.db.session.rollback()
+                    self.counts['rolled_back'] += 1
+                    return response
+                try:
+                    self.db.session.commit()
+                except Exception as e:
+                    self.db.session.rollback()
+                    self.counts['rolled_back'] += 1
+                    return jsonify({'success': False, 'message': str(e)}), 500
+                self.counts['committed'] += 1
+                self._run_callbacks(g.after_commit)
+                return response
+            finally:
+                g.pop('after_commit', None)
+        return decorated
+
+    def _run_callbacks(self, callbacks):
+        # The response is already decided; a failing side effect is logged, not raised
+        for callback, args, kwargs in callbacks:
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                self.db.session.rollback()
+                self.counts['callback_errors'] += 1
+                print(f"❌ After-commit {getattr(callback, '__name__', callback)} failed: {str(e)}")
+
+    def stats(self):
+        return dict(self.counts)